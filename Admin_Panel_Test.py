@@ -30,7 +30,8 @@ import time
 import random
 import string
 import os
-from datetime import datetime
+from report_stream import StreamingReporter
+from user_pool import lease_user, leased_user_id
 
 # ============================================================================
 # Constants and Configuration
@@ -38,7 +39,10 @@ from datetime import datetime
 
 class Constants:
     # User IDs
-    USER_ID = 10715  # Consistent user ID for all tests
+    USER_ID = 10715  # Fallback user when no lease is held (see user_pool.py)
+    
+    # Admin test users leased one per worker, override with SHENLONG_ADMIN_USER_IDS="10715,10614"
+    USER_POOL = [int(user_id) for user_id in os.environ.get("SHENLONG_ADMIN_USER_IDS", "10715,10614").split(",")]
     
     # URLs
     LOGIN_URL = "https://sso.xiaoxitech.com/login?project=fztpumkh&cb=https%3A%2F%2Ftest-admin-shenlong.cd.xiaoxigroup.net%2Flogin"
@@ -55,126 +59,23 @@ class Constants:
         "//*[contains(@class, 'success')]"         # Generic success fallback
     ]
 
+def current_user_id():
+    """Admin test user for this process: the leased user, or Constants.USER_ID"""
+    return leased_user_id(default=Constants.USER_ID)
+
+def user_detail_url():
+    """User detail page of the current (leased) admin test user"""
+    return Constants.USER_DETAIL_URL.format(user_id=current_user_id())
+
 # ============================================================================
 # Test Reporting System
 # ============================================================================
 
-class TestReporter:
-    """Class to handle test reporting functionality"""
-    
-    def __init__(self):
-        self.test_results = []
-        self.start_time = datetime.now()
-        
-        # Create reports directory if it doesn't exist
-        if not os.path.exists("reports"):
-            os.makedirs("reports")
-    
-    def add_step(self, step_name, status, message=""):
-        """Add a test step to the report"""
-        step_data = {
-            "step_name": step_name,
-            "status": status,  # "PASS", "FAIL", "INFO"
-            "message": message,
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-        self.test_results.append(step_data)
-        
-        # Print to console
-        status_text = "PASS" if status == "PASS" else "FAIL" if status == "FAIL" else "INFO"
-        print(f"[{status_text}] {step_name}: {message}")
+class TestReporter(StreamingReporter):
+    """Class to handle test reporting functionality (steps stream to a JSONL file, see report_stream.py)"""
     
-    def generate_html_report(self):
-        """Generate HTML report with all test results"""
-        end_time = datetime.now()
-        duration = end_time - self.start_time
-        
-        # Count results
-        passed = len([r for r in self.test_results if r["status"] == "PASS"])
-        failed = len([r for r in self.test_results if r["status"] == "FAIL"])
-        total = len([r for r in self.test_results if r["status"] in ["PASS", "FAIL"]])
-        
-        html_content = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>ShenLong Admin Panel Test Report</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }}
-        .header {{ background-color: #2c3e50; color: white; padding: 20px; border-radius: 5px; }}
-        .summary {{ background-color: white; padding: 20px; margin: 20px 0; border-radius: 5px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-        .test-step {{ background-color: white; margin: 10px 0; padding: 15px; border-radius: 5px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-        .pass {{ border-left: 5px solid #27ae60; }}
-        .fail {{ border-left: 5px solid #e74c3c; }}
-        .info {{ border-left: 5px solid #3498db; }}
-        .stats {{ display: flex; justify-content: space-around; }}
-        .stat-box {{ text-align: center; padding: 15px; }}
-        .stat-number {{ font-size: 2em; font-weight: bold; }}
-        .pass-color {{ color: #27ae60; }}
-        .fail-color {{ color: #e74c3c; }}
-        .info-color {{ color: #3498db; }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>ShenLong Admin Panel Test Report</h1>
-        <p>Generated on: {end_time.strftime("%Y-%m-%d %H:%M:%S")}</p>
-        <p>Test Duration: {str(duration).split('.')[0]}</p>
-    </div>
-    
-    <div class="summary">
-        <h2>Test Summary</h2>
-        <div class="stats">
-            <div class="stat-box">
-                <div class="stat-number pass-color">{passed}</div>
-                <div>Passed</div>
-            </div>
-            <div class="stat-box">
-                <div class="stat-number fail-color">{failed}</div>
-                <div>Failed</div>
-            </div>
-            <div class="stat-box">
-                <div class="stat-number">{total}</div>
-                <div>Total Tests</div>
-            </div>
-        </div>
-    </div>
-    
-    <div class="summary">
-        <h2>Test Steps</h2>
-"""
-        
-        for result in self.test_results:
-            status_class = result["status"].lower()
-            status_text = "[PASS]" if result["status"] == "PASS" else "[FAIL]" if result["status"] == "FAIL" else "[INFO]"
-            
-            html_content += f"""
-        <div class="test-step {status_class}">
-            <h3>{status_text} {result["step_name"]}</h3>
-            <p><strong>Time:</strong> {result["timestamp"]}</p>
-            <p><strong>Status:</strong> {result["status"]}</p>
-            <p><strong>Message:</strong> {result["message"]}</p>
-        </div>
-"""
-        
-        html_content += """
-    </div>
-</body>
-</html>
-"""
-        
-        # Save HTML report
-        timestamp = self.start_time.strftime("%Y%m%d_%H%M%S")
-        report_filename = f"admin_panel_test_{timestamp}.html"
-        report_path = os.path.join("reports", report_filename)
-        
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
-        print(f"HTML Report generated: {report_path}")
-        return report_path
-
-
+    TITLE = "ShenLong Admin Panel Test Report"
+    REPORT_PREFIX = "admin_panel_test"
 
 # ============================================================================
 # All test classes and logic will be added below in the correct order.
@@ -208,10 +109,10 @@ def admin_login(driver, wait):
         if "sellerIndex" in driver.current_url or "userDetail" in driver.current_url:
             print("⚠️ WARNING: Already logged in! Got redirected to:", driver.current_url)
             print("Proceeding to user detail page...")
-            user_detail_url = Constants.USER_DETAIL_URL.format(user_id=Constants.USER_ID)
-            driver.get(user_detail_url)
+            url = user_detail_url()
+            driver.get(url)
             time.sleep(3)
-            print(f"Navigated to user detail page: {user_detail_url}")
+            print(f"Navigated to user detail page: {url}")
             return
         
         # Step 5: Click on username/password login button (用户名密码登录)
@@ -266,10 +167,10 @@ def admin_login(driver, wait):
         
         # Step 11: Navigate to user detail page
         print("Navigating to user detail page...")
-        user_detail_url = Constants.USER_DETAIL_URL.format(user_id=Constants.USER_ID)
-        driver.get(user_detail_url)
+        url = user_detail_url()
+        driver.get(url)
         time.sleep(3)
-        print(f"Navigated to user detail page: {user_detail_url}")
+        print(f"Navigated to user detail page: {url}")
         print(f"Current URL: {driver.current_url}")
         
     except Exception as e:
@@ -307,8 +208,8 @@ class AdminPanelActivateDynamicPremiumPlanTest:
 
     def navigate_to_user_detail(self):
         print("Navigating to user detail page...")
-        user_detail_url = Constants.USER_DETAIL_URL.format(user_id=Constants.USER_ID)
-        self.driver.get(user_detail_url)
+        url = user_detail_url()
+        self.driver.get(url)
         time.sleep(3)
         try:
             self.wait_for_element("//body", timeout=30)
@@ -596,7 +497,7 @@ class AdminPanelActivateDynamicPremiumPlanWithBalancePaymentTest:
 
     def navigate_to_user_detail(self):
         print("Navigating to user detail page...")
-        self.driver.get("https://test-admin-shenlong.cd.xiaoxigroup.net/client/userDetail?userId=10614")
+        self.driver.get(user_detail_url())
         time.sleep(3)
         try:
             self.wait_for_element("//body", timeout=30)
@@ -858,7 +759,7 @@ class AdminPanelActivateDynamicDedicatedPlanPendingOrderTest:
     def navigate_to_user_detail(self):
         """Navigate to user detail page"""
         print("Navigating to user detail page...")
-        self.driver.get("https://test-admin-shenlong.cd.xiaoxigroup.net/client/userDetail?userId=10614")
+        self.driver.get(user_detail_url())
         time.sleep(3)
         try:
             self.wait_for_element("//body", timeout=30)
@@ -1107,7 +1008,7 @@ class AdminPanelActivateDynamicDedicatedPlanTest:
     def navigate_to_user_detail(self):
         """Navigate to user detail page"""
         print("Navigating to user detail page...")
-        self.driver.get("https://test-admin-shenlong.cd.xiaoxigroup.net/client/userDetail?userId=10614")
+        self.driver.get(user_detail_url())
         
         # Wait for page to load
         time.sleep(3)
@@ -1408,7 +1309,7 @@ class AdminPanelPurchaseStaticPremiumPlanTest:
 
     def navigate_to_user_detail(self):
         print("Navigating to user detail page...")
-        self.driver.get("https://test-admin-shenlong.cd.xiaoxigroup.net/client/userDetail?userId=10614")
+        self.driver.get(user_detail_url())
         time.sleep(3)
         try:
             self.wait_for_element("//body", timeout=30)
@@ -1751,7 +1652,7 @@ class AdminPanelPurchaseFixedLongTermPlanActivateFixedLongTermPlanInAdminPanelWi
 
     def navigate_to_user_detail(self):
         print("Navigating to user detail page...")
-        self.driver.get("https://test-admin-shenlong.cd.xiaoxigroup.net/client/userDetail?userId=10614")
+        self.driver.get(user_detail_url())
         time.sleep(2)
         try:
             self.wait_for_element("//body", timeout=20, clickable=False)
@@ -2129,7 +2030,7 @@ class ActivateFixedLongTermPlanInAdminPanelWithBalancePaymentTest:
     def navigate_to_user_detail(self):
         """Navigate to user detail page"""
         print("Navigating to user detail page...")
-        self.driver.get("https://test-admin-shenlong.cd.xiaoxigroup.net/client/userDetail?userId=10614")
+        self.driver.get(user_detail_url())
         
         try:
             self.wait_for_element("//body", timeout=15)
@@ -2768,6 +2669,66 @@ def run_fixed_long_term_balance_payment_test(driver, reporter):
         reporter.add_step("Fixed Long-Term Plan - Balance Payment", "FAIL", f"Test failed: {str(e)}")
         return False
 
+# ============================================================================
+# Scenario Registry - used by parallel_runner.py --suite admin
+# ============================================================================
+
+def login_admin(driver, reporter=None):
+    """Login to the admin panel, returning True on success"""
+    try:
+        admin_login(driver, WebDriverWait(driver, 20))
+        if reporter:
+            reporter.add_step("Admin Login", "PASS", f"Logged in, working on user {current_user_id()}")
+        return True
+    except Exception as e:
+        if reporter:
+            reporter.add_step("Admin Login", "FAIL", f"Admin login failed: {str(e)}")
+        return False
+
+ACCOUNT_LOGINS = {
+    "admin": login_admin,
+}
+
+# Landing pages probed by the runner's circuit breaker (see circuit_breaker.py): admin site and SSO
+ENVIRONMENT_URLS = [
+    "https://test-admin-shenlong.cd.xiaoxigroup.net",
+    Constants.LOGIN_URL,
+]
+
+# (scenario key, account, test function) in main() execution order
+SCENARIOS = [
+    ("dynamic_advanced.pending_order", "admin", run_dynamic_advanced_pending_order_test),
+    ("dynamic_advanced.balance_payment", "admin", run_dynamic_advanced_balance_payment_test),
+    ("dynamic_dedicated.pending_order", "admin", run_dynamic_dedicated_pending_order_test),
+    ("dynamic_dedicated.balance_payment", "admin", run_dynamic_dedicated_balance_payment_test),
+    ("static_premium.pending_order", "admin", run_static_premium_pending_order_test),
+    ("static_premium.balance_payment", "admin", run_static_premium_balance_payment_test),
+    ("fixed_long_term.pending_order", "admin", run_fixed_long_term_pending_order_test),
+    ("fixed_long_term.balance_payment", "admin", run_fixed_long_term_balance_payment_test),
+]
+
+# Dependencies and resources used by parallel_runner.py (see scenario_graph.py).
+# Every scenario pays or activates the first row of the user's history orders table, and
+# both fixed long-term flows then toggle the switch on row 1 of the fixed long-term history
+# table (turn_off_switch). The tables belong to the user each worker leases (worker_session),
+# so they are worker resources: scenarios of different workers still run in parallel, and
+# the switch of one flow can never be toggled by the other while it runs.
+SCENARIO_RULES = {
+    key: {"worker_resources": ["history_orders"] + (["fixed_long_term_history"]
+                                                     if key.startswith("fixed_long_term.") else [])}
+    for key, _, _ in SCENARIOS
+}
+
+# One worker per pooled user - extra workers would only wait for a lease
+MAX_WORKERS = len(Constants.USER_POOL)
+
+# Tabs of one worker share its leased user and its history table, so no multi-tab runs
+MAX_TABS = 1
+
+def worker_session():
+    """Per-worker context held for the worker's lifetime: an exclusive admin test user"""
+    return lease_user(Constants.USER_POOL)
+
 # ============================================================================
 # Main Test Execution Function
 # ============================================================================
@@ -2836,89 +2797,98 @@ def main():
     reporter = TestReporter()
     print("Chrome driver initialized successfully")
     
-    try:
-        # Test results storage
-        results = {}
-        
-        # Section 1: Dynamic Advanced Package
-        print("\n" + "=" * 60)
-        print("1. Dynamic Advanced Package (动态高级套餐)")
-        print("=" * 60)
-        
-        results['dynamic_advanced'] = {
-            'pending_order': run_dynamic_advanced_pending_order_test(driver, reporter),
-            'balance_payment': run_dynamic_advanced_balance_payment_test(driver, reporter)
-        }
-        
-        # Section 2: Dynamic Dedicated Plan
-        print("\n" + "=" * 60)
-        print("2. Dynamic Dedicated Plan (动态独享套餐)")
-        print("=" * 60)
-        
-        results['dynamic_dedicated'] = {
-            'pending_order': run_dynamic_dedicated_pending_order_test(driver, reporter),
-            'balance_payment': run_dynamic_dedicated_balance_payment_test(driver, reporter)
-        }
-        
-        # Section 3: Static Premium Plan
-        print("\n" + "=" * 60)
-        print("3. Static Premium Plan (静态高级套餐)")
-        print("=" * 60)
-        
-        results['static_premium'] = {
-            'pending_order': run_static_premium_pending_order_test(driver, reporter),
-            'balance_payment': run_static_premium_balance_payment_test(driver, reporter)
-        }
-        
-        # Section 4: Fixed Long-Term Plan
-        print("\n" + "=" * 60)
-        print("4. Fixed Long-Term Plan (固定长效套餐)")
-        print("=" * 60)
-        
-        results['fixed_long_term'] = {
-            'pending_order': run_fixed_long_term_pending_order_test(driver, reporter),
-            'balance_payment': run_fixed_long_term_balance_payment_test(driver, reporter)
-        }
-        
-        # Generate HTML report
-        report_path = reporter.generate_html_report()
-        
-        # Print comprehensive summary
-        print("\n" + "=" * 100)
-        print("ADMIN PANEL TEST SUMMARY")
-        print("=" * 100)
-        
-        print(f"\n1. 动态高级套餐 (Dynamic Advanced Package):")
-        print(f"  1.1 Pending Order Payment: {'PASS' if results['dynamic_advanced']['pending_order'] else 'FAIL'}")
-        print(f"  1.2 Balance Payment: {'PASS' if results['dynamic_advanced']['balance_payment'] else 'FAIL'}")
-        
-        print(f"\n2. 动态独享套餐 (Dynamic Dedicated Package):")
-        print(f"  2.1 Pending Order Payment: {'PASS' if results['dynamic_dedicated']['pending_order'] else 'FAIL'}")
-        print(f"  2.2 Balance Payment: {'PASS' if results['dynamic_dedicated']['balance_payment'] else 'FAIL'}")
-        
-        print(f"\n3. 静态高级套餐 (Static Premium Package):")
-        print(f"  3.1 Pending Order Payment: {'PASS' if results['static_premium']['pending_order'] else 'FAIL'}")
-        print(f"  3.2 Balance Payment: {'PASS' if results['static_premium']['balance_payment'] else 'FAIL'}")
-        
-        print(f"\n4. 固定长效套餐 (Fixed Long-Term Package):")
-        print(f"  4.1 Pending Order Payment: {'PASS' if results['fixed_long_term']['pending_order'] else 'FAIL'}")
-        print(f"  4.2 Balance Payment: {'PASS' if results['fixed_long_term']['balance_payment'] else 'FAIL'}")
-        
-        print("=" * 100)
-        print(f"Detailed HTML Report: {report_path}")
-        print("=" * 100)
-        
-        print("\n🎉 ALL TESTS COMPLETED! 🎉")
-        print("Browser will close in 10 seconds...")
-        time.sleep(10)
+    # Lease an admin test user so parallel runs never share a history table
+    with lease_user(Constants.USER_POOL) as user_id:
+        print(f"Using admin test user: {user_id}")
+        try:
+            # Test results storage
+            results = {}
+        
+            # Section 1: Dynamic Advanced Package
+            print("\n" + "=" * 60)
+            print("1. Dynamic Advanced Package (动态高级套餐)")
+            print("=" * 60)
+        
+            results['dynamic_advanced'] = {
+                'pending_order': reporter.run_scenario("dynamic_advanced.pending_order", run_dynamic_advanced_pending_order_test, driver),
+                'balance_payment': reporter.run_scenario("dynamic_advanced.balance_payment", run_dynamic_advanced_balance_payment_test, driver)
+            }
+        
+            # Section 2: Dynamic Dedicated Plan
+            print("\n" + "=" * 60)
+            print("2. Dynamic Dedicated Plan (动态独享套餐)")
+            print("=" * 60)
+        
+            results['dynamic_dedicated'] = {
+                'pending_order': reporter.run_scenario("dynamic_dedicated.pending_order", run_dynamic_dedicated_pending_order_test, driver),
+                'balance_payment': reporter.run_scenario("dynamic_dedicated.balance_payment", run_dynamic_dedicated_balance_payment_test, driver)
+            }
+        
+            # Section 3: Static Premium Plan
+            print("\n" + "=" * 60)
+            print("3. Static Premium Plan (静态高级套餐)")
+            print("=" * 60)
+        
+            results['static_premium'] = {
+                'pending_order': reporter.run_scenario("static_premium.pending_order", run_static_premium_pending_order_test, driver),
+                'balance_payment': reporter.run_scenario("static_premium.balance_payment", run_static_premium_balance_payment_test, driver)
+            }
+        
+            # Section 4: Fixed Long-Term Plan
+            print("\n" + "=" * 60)
+            print("4. Fixed Long-Term Plan (固定长效套餐)")
+            print("=" * 60)
+        
+            results['fixed_long_term'] = {
+                'pending_order': reporter.run_scenario("fixed_long_term.pending_order", run_fixed_long_term_pending_order_test, driver),
+                'balance_payment': reporter.run_scenario("fixed_long_term.balance_payment", run_fixed_long_term_balance_payment_test, driver)
+            }
+        
+            # Generate HTML report
+            report_path = reporter.generate_html_report()
+        
+            # Print comprehensive summary
+            print("\n" + "=" * 100)
+            print("ADMIN PANEL TEST SUMMARY")
+            print("=" * 100)
+        
+            print(f"\n1. 动态高级套餐 (Dynamic Advanced Package):")
+            print(f"  1.1 Pending Order Payment: {'PASS' if results['dynamic_advanced']['pending_order'] else 'FAIL'}")
+            print(f"  1.2 Balance Payment: {'PASS' if results['dynamic_advanced']['balance_payment'] else 'FAIL'}")
+        
+            print(f"\n2. 动态独享套餐 (Dynamic Dedicated Package):")
+            print(f"  2.1 Pending Order Payment: {'PASS' if results['dynamic_dedicated']['pending_order'] else 'FAIL'}")
+            print(f"  2.2 Balance Payment: {'PASS' if results['dynamic_dedicated']['balance_payment'] else 'FAIL'}")
+        
+            print(f"\n3. 静态高级套餐 (Static Premium Package):")
+            print(f"  3.1 Pending Order Payment: {'PASS' if results['static_premium']['pending_order'] else 'FAIL'}")
+            print(f"  3.2 Balance Payment: {'PASS' if results['static_premium']['balance_payment'] else 'FAIL'}")
+        
+            print(f"\n4. 固定长效套餐 (Fixed Long-Term Package):")
+            print(f"  4.1 Pending Order Payment: {'PASS' if results['fixed_long_term']['pending_order'] else 'FAIL'}")
+            print(f"  4.2 Balance Payment: {'PASS' if results['fixed_long_term']['balance_payment'] else 'FAIL'}")
+        
+            print("=" * 100)
+            print(f"Detailed HTML Report: {report_path}")
+            print("=" * 100)
+        
+            outcomes = [success for section in results.values() for success in section.values()]
+            passed = sum(1 for success in outcomes if success)
+            if passed == len(outcomes):
+                print("\n🎉 ALL TESTS COMPLETED! 🎉")
+            else:
+                print(f"\n{len(outcomes) - passed} of {len(outcomes)} tests FAILED")
+            print("Browser will close in 10 seconds...")
+            time.sleep(10)
         
-    except Exception as e:
-        print(f"Test suite error: {str(e)}")
-        reporter.add_step("Test Suite Error", "FAIL", f"Error: {str(e)}")
+        except Exception as e:
+            print(f"Test suite error: {str(e)}")
+            reporter.add_step("Test Suite Error", "FAIL", f"Error: {str(e)}")
         
-    finally:
-        driver.quit()
-        print("Browser closed successfully")
+        finally:
+            reporter.close()
+            driver.quit()
+            print("Browser closed successfully")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
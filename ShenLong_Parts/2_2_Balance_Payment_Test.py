@@ -4,9 +4,15 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import Select
 from selenium.webdriver.chrome.options import Options
+import os
 import time
 import random
 import string
+import sys
+
+# Shared helpers live in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from failure_artifacts import save_page_source
 
 class AdminPanelActivateDynamicDedicatedPlanTest:
     def __init__(self):
@@ -348,9 +354,7 @@ class AdminPanelActivateDynamicDedicatedPlanTest:
             print(f"Found {len(buttons)} button elements")
             
             # Save page source for inspection
-            with open("page_source.html", "w", encoding="utf-8") as f:
-                f.write(self.driver.page_source)
-            print("Page source saved to page_source.html")
+            save_page_source(self.driver, os.path.splitext(os.path.basename(__file__))[0])
             
         except Exception as e:
             print(f"Error in debug: {e}")
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+
+"""
+Asyncio Chrome DevTools Driver
+异步浏览器驱动 - 基于 Chrome DevTools Protocol (CDP) 的 asyncio 接口
+
+A small awaitable automation layer over one CDP websocket. Unlike Selenium,
+waiting does not block a thread, so many pages (tabs) of one browser - or
+several browsers - can be driven from a single event loop:
+
+    browser = await AsyncBrowser.from_selenium(driver)   # reuse the logged-in session
+    page = await browser.new_page()
+    await page.navigate("https://test-ip-shenlong.cd.xiaoxigroup.net/meal/ip?ipType=0")
+    await page.click("//button[contains(text(), '立即购买')]")
+    await page.wait_for_url("https://test-ip-shenlong.cd.xiaoxigroup.net/recharge")
+
+Pages are addressed with the same XPath selectors the Selenium suites use.
+Requires the `websockets` package (pip install websockets).
+"""
+
+import asyncio
+import itertools
+import json
+import urllib.request
+
+try:
+    import websockets
+except ImportError:  # Optional dependency - only the async scenarios need it
+    websockets = None
+
+DEFAULT_TIMEOUT = 15
+POLL_INTERVAL = 0.25
+
+
+class CDPError(Exception):
+    """Error response returned by the browser for a CDP command"""
+
+
+def is_available():
+    """True if the websocket client needed by this module is installed"""
+    return websockets is not None
+
+
+def debugger_address(driver):
+    """DevTools address ("host:port") of a Selenium Chrome driver's browser, or None"""
+    return driver.capabilities.get("goog:chromeOptions", {}).get("debuggerAddress")
+
+
+def is_reachable(address, timeout=3):
+    """
+    True if a DevTools endpoint answers at address
+
+    Remote (Grid) sessions report an address that is only valid on their node.
+    """
+    try:
+        _get_json(f"http://{address}/json/version", timeout)
+        return True
+    except Exception:
+        return False
+
+
+def _get_json(url, timeout=10):
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read().decode('utf-8'))
+
+
+class CDPConnection:
+    """One websocket to the browser, multiplexing all attached page sessions"""
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._waiters = []
+        self._reader = asyncio.ensure_future(self._read_loop())
+
+    @classmethod
+    async def connect(cls, debugger_address):
+        """Connect to the browser endpoint of a Chrome started with --remote-debugging-port"""
+        if websockets is None:
+            raise RuntimeError("The async driver requires the 'websockets' package (pip install websockets)")
+        loop = asyncio.get_event_loop()
+        version = await loop.run_in_executor(None, _get_json, f"http://{debugger_address}/json/version")
+        websocket = await websockets.connect(version["webSocketDebuggerUrl"], max_size=None)
+        return cls(websocket)
+
+    async def send(self, method, params=None, session_id=None):
+        """Send a CDP command and await its result"""
+        message = {"id": next(self._ids), "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        future = asyncio.get_event_loop().create_future()
+        self._pending[message["id"]] = future
+        await self.websocket.send(json.dumps(message))
+        return await future
+
+    def expect(self, method, session_id=None):
+        """
+        Register interest in the next event named method
+
+        Call before sending the command that triggers the event, then await the
+        returned future so the event cannot be missed.
+        """
+        future = asyncio.get_event_loop().create_future()
+        self._waiters.append((method, session_id, future))
+        return future
+
+    async def _read_loop(self):
+        try:
+            async for raw in self.websocket:
+                message = json.loads(raw)
+                if "id" in message:
+                    future = self._pending.pop(message["id"], None)
+                    if future is None or future.done():
+                        continue
+                    if "error" in message:
+                        future.set_exception(CDPError(message["error"].get("message", str(message["error"]))))
+                    else:
+                        future.set_result(message.get("result", {}))
+                else:
+                    self._dispatch(message)
+        except Exception as e:
+            error = e
+        else:
+            error = ConnectionError("CDP connection closed")
+        for future in list(self._pending.values()) + [waiter[2] for waiter in self._waiters]:
+            if not future.done():
+                future.set_exception(error)
+
+    def _dispatch(self, event):
+        remaining = []
+        for method, session_id, future in self._waiters:
+            if future.done():
+                continue
+            if method == event.get("method") and session_id in (None, event.get("sessionId")):
+                future.set_result(event.get("params", {}))
+            else:
+                remaining.append((method, session_id, future))
+        self._waiters = remaining
+
+    async def close(self):
+        await self.websocket.close()
+        self._reader.cancel()
+
+
+class AsyncBrowser:
+    """A Chrome browser controlled over CDP; hands out AsyncPage tabs"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.pages = []
+
+    @classmethod
+    async def connect(cls, debugger_address):
+        """Attach to a Chrome listening on debugger_address ("host:port")"""
+        return cls(await CDPConnection.connect(debugger_address))
+
+    @classmethod
+    async def from_selenium(cls, driver):
+        """
+        Attach to the browser of a Selenium Chrome driver
+
+        New pages share the driver's cookies, so they are already logged in.
+        """
+        address = debugger_address(driver)
+        if not address:
+            raise RuntimeError("Chrome driver does not expose a debuggerAddress")
+        return await cls.connect(address)
+
+    async def new_page(self, url="about:blank"):
+        """Open a new tab and return an AsyncPage attached to it"""
+        target = await self.connection.send("Target.createTarget", {"url": url})
+        attached = await self.connection.send("Target.attachToTarget",
+                                              {"targetId": target["targetId"], "flatten": True})
+        page = AsyncPage(self.connection, target["targetId"], attached["sessionId"])
+        await page.send("Page.enable")
+        await page.send("Runtime.enable")
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        """Close the pages opened by this object and disconnect (the browser keeps running)"""
+        for page in list(self.pages):
+            await page.close()
+        await self.connection.close()
+
+
+class AsyncPage:
+    """One tab; every operation is a coroutine"""
+
+    def __init__(self, connection, target_id, session_id):
+        self.connection = connection
+        self.target_id = target_id
+        self.session_id = session_id
+
+    async def send(self, method, params=None):
+        return await self.connection.send(method, params, session_id=self.session_id)
+
+    async def navigate(self, url, timeout=60):
+        """Navigate to url and wait for the load event"""
+        loaded = self.connection.expect("Page.loadEventFired", self.session_id)
+        result = await self.send("Page.navigate", {"url": url})
+        if result.get("errorText"):
+            loaded.cancel()
+            raise CDPError(f"Navigation to {url} failed: {result['errorText']}")
+        await asyncio.wait_for(loaded, timeout)
+
+    async def evaluate(self, expression):
+        """Evaluate a JavaScript expression in the page and return its value"""
+        result = await self.send("Runtime.evaluate", {
+            "expression": expression,
+            "returnByValue": True,
+            "awaitPromise": True,
+        })
+        if "exceptionDetails" in result:
+            raise CDPError(result["exceptionDetails"].get("text", "JavaScript error"))
+        return result.get("result", {}).get("value")
+
+    async def current_url(self):
+        return await self.evaluate("location.href")
+
+    async def wait_for(self, condition, timeout=DEFAULT_TIMEOUT, message=""):
+        """
+        Await an async condition until it returns a truthy value
+
+        Args:
+            condition: Coroutine function returning a truthy value when done
+            timeout: Seconds before raising asyncio.TimeoutError
+            message: Text included in the timeout error
+
+        Returns:
+            The first truthy value returned by condition
+        """
+        deadline = asyncio.get_event_loop().time() + timeout
+        while True:
+            try:
+                value = await condition()
+                if value:
+                    return value
+            except CDPError:
+                pass  # Page is navigating - evaluate again on the next poll
+            if asyncio.get_event_loop().time() > deadline:
+                raise asyncio.TimeoutError(message or f"Condition not met within {timeout}s")
+            await asyncio.sleep(POLL_INTERVAL)
+
+    async def find(self, xpath, timeout=DEFAULT_TIMEOUT):
+        """Wait until the element at xpath is visible and enabled (like EC.element_to_be_clickable)"""
+        script = f"""(() => {{
+            const el = document.evaluate({json.dumps(xpath)}, document, null,
+                                         XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+            if (!el || el.disabled) return false;
+            const rect = el.getBoundingClientRect();
+            return rect.width > 0 && rect.height > 0;
+        }})()"""
+        await self.wait_for(lambda: self.evaluate(script), timeout, f"Element not clickable: {xpath}")
+        return xpath
+
+    async def click(self, xpath, timeout=DEFAULT_TIMEOUT):
+        """Wait for the element at xpath, scroll it into view and click its centre with real mouse events"""
+        await self.find(xpath, timeout)
+        box = await self.evaluate(f"""(() => {{
+            const el = document.evaluate({json.dumps(xpath)}, document, null,
+                                         XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+            el.scrollIntoView({{block: 'center'}});
+            const rect = el.getBoundingClientRect();
+            return {{x: rect.left + rect.width / 2, y: rect.top + rect.height / 2}};
+        }})()""")
+        for event_type in ("mousePressed", "mouseReleased"):
+            await self.send("Input.dispatchMouseEvent", {
+                "type": event_type, "x": box["x"], "y": box["y"], "button": "left", "clickCount": 1,
+            })
+
+    async def click_first(self, xpaths, timeout=DEFAULT_TIMEOUT):
+        """Click the first of several fallback selectors that becomes clickable"""
+        for index, xpath in enumerate(xpaths):
+            try:
+                await self.click(xpath, timeout if index == 0 else min(timeout, 10))
+                return xpath
+            except asyncio.TimeoutError:
+                if index == len(xpaths) - 1:
+                    raise
+
+    async def wait_for_url(self, url, timeout=DEFAULT_TIMEOUT):
+        """Wait until the page URL equals url"""
+        async def at_url():
+            return await self.current_url() == url
+        await self.wait_for(at_url, timeout, f"URL did not become {url}")
+
+    async def close(self):
+        try:
+            await self.connection.send("Target.closeTarget", {"targetId": self.target_id})
+        except (CDPError, ConnectionError):
+            pass
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+"""
+Browser Console Capture
+浏览器控制台 - 按场景收集控制台消息与 JS 异常, 按签名去重后写入报告
+
+By default configure_driver() (driver_utils.py) silences console.warn and
+console.error and swallows unhandled promise rejections, so frontend errors
+that slow down or break a purchase flow never show up. With --console
+(run_all_tests.py, parallel_runner.py) the browsers are started with Chrome's
+"browser" log (goog:loggingPrefs), which chromedriver fills from the CDP
+Runtime and Log domains, and the suppression script is left out:
+
+    source "console-api"   console.log / info / warn / error calls
+    source "javascript"    uncaught exceptions and unhandled rejections
+    source "network"       failed resource loads (404, blocked, CORS)
+
+At the end of every scenario the log is read and folded into a bounded ring
+buffer: messages with the same signature (level, source and text with
+numbers, line:column and query strings masked) are counted once, and when a
+scenario logs more than MAX_SIGNATURES distinct messages the least severe,
+least recently logged ones are dropped, so console.log noise never pushes out
+an exception. The messages travel with the scenario_end event ("console"); the
+report lists them per scenario with the step that was running when each was
+first logged and that step's duration, so slow steps can be matched to
+frontend errors.
+
+The browser log is shared by all tabs of a browser, so capture needs --tabs 1.
+"""
+
+import re
+from collections import OrderedDict
+
+# Distinct messages kept per scenario; the least severe and oldest are dropped beyond this
+MAX_SIGNATURES = 100
+
+# Characters of a message kept in the report
+MAX_MESSAGE_LENGTH = 500
+
+# Messages listed for the whole suite, most severe and frequent first
+TOP_MESSAGES = 30
+
+# Report order of chromedriver's log levels
+LEVELS = ("SEVERE", "WARNING", "INFO", "DEBUG")
+
+_MASKS = (
+    (re.compile(r"\?[^\s\"')]*"), "?Q"),         # query strings (cache busters, tokens)
+    (re.compile(r"\b\d+:\d+\b"), "L:C"),        # line:column of a script location
+    (re.compile(r"\b[0-9a-f]{8,}\b", re.I), "H"),  # hashes and ids
+    (re.compile(r"\d+"), "N"),
+)
+
+
+def enable_browser_log(chrome_options):
+    """Ask chromedriver for the browser (console) log, keeping other log types already requested"""
+    prefs = dict(chrome_options.to_capabilities().get("goog:loggingPrefs") or {})
+    prefs["browser"] = "ALL"
+    chrome_options.set_capability("goog:loggingPrefs", prefs)
+
+
+def _level_rank(level):
+    return LEVELS.index(level) if level in LEVELS else len(LEVELS)
+
+
+def signature(level, source, message):
+    """Deduplication key of a console message, e.g. "SEVERE|javascript|app.js L:C Uncaught TypeError: ..." """
+    text = message
+    for pattern, replacement in _MASKS:
+        text = pattern.sub(replacement, text)
+    return f"{level}|{source}|{text}"
+
+
+class ConsoleRecorder:
+    """Collects one scenario at a time of a driver's browser log"""
+
+    def __init__(self, driver, max_signatures=MAX_SIGNATURES):
+        """
+        Args:
+            driver: WebDriver started with enable_browser_log()
+            max_signatures: Distinct messages kept per scenario
+        """
+        self.driver = driver
+        self.max_signatures = max_signatures
+        self.messages = OrderedDict()   # signature -> record, least recently logged first
+        self.total = 0
+        self.dropped = 0
+
+    def _read_log(self):
+        try:
+            return self.driver.get_log("browser")
+        except Exception as e:
+            print(f"Could not read the browser log: {str(e)}")
+            return []
+
+    def begin(self):
+        """Start a new scenario: messages logged before now are dropped"""
+        self._read_log()
+        self.messages = OrderedDict()
+        self.total = 0
+        self.dropped = 0
+
+    def add(self, level, source, message, at):
+        """Fold one log entry into the ring buffer (at: epoch seconds)"""
+        self.total += 1
+        key = signature(level, source, message)
+        record = self.messages.get(key)
+        if record is not None:
+            record["count"] += 1
+            record["last_at"] = at
+            self.messages.move_to_end(key)
+            return
+        if len(self.messages) >= self.max_signatures:
+            self.dropped += 1
+            # Oldest message of the least severe level present, unless the new one is even less severe
+            victim = max(self.messages.values(), key=lambda old: _level_rank(old["level"]))
+            if _level_rank(level) > _level_rank(victim["level"]):
+                return
+            del self.messages[victim["signature"]]
+        self.messages[key] = {"signature": key, "level": level, "source": source,
+                              "message": message[:MAX_MESSAGE_LENGTH], "count": 1, "first_at": at, "last_at": at}
+
+    def end(self):
+        """
+        Read the rest of the scenario's log
+
+        Returns:
+            dict: {"total": entries logged, "dropped": distinct messages not kept,
+                   "messages": [record, ...] in order of first appearance};
+                  None when nothing was logged
+        """
+        for entry in self._read_log():
+            self.add(entry.get("level", "INFO"), entry.get("source", ""), str(entry.get("message", "")),
+                     entry.get("timestamp", 0) / 1000.0)
+        if not self.total:
+            return None
+        messages = sorted(self.messages.values(), key=lambda record: record["first_at"])
+        result = {"total": self.total, "dropped": self.dropped, "messages": messages}
+        self.messages = OrderedDict()
+        self.total = 0
+        self.dropped = 0
+        return result
+
+
+def attribute(console, steps):
+    """
+    Set "step" and "step_duration" of every message to the step running when it was first logged
+
+    Args:
+        console: ConsoleRecorder.end() of a scenario
+        steps: [(end epoch seconds, step name, duration), ...] of the scenario in order
+    """
+    for record in console["messages"]:
+        record["step"] = record["step_duration"] = None
+        for at, name, duration in steps:
+            if at is not None and at >= record["first_at"]:
+                record["step"], record["step_duration"] = name, duration
+                break
+
+
+def suite_console(scenarios):
+    """
+    Console messages of a suite from its scenario summaries (see report_stream.summarize_events)
+
+    Returns:
+        dict: {"total", "levels": {level: count}, "distinct",
+               "messages": [[level, source, message, count, [scenario keys]], ...] TOP_MESSAGES,
+               most severe then most frequent first}
+        None when no scenario logged anything
+    """
+    logged = [entry for entry in scenarios if entry.get("console")]
+    if not logged:
+        return None
+    levels = {}
+    messages = {}
+    for entry in logged:
+        for record in entry["console"]["messages"]:
+            levels[record["level"]] = levels.get(record["level"], 0) + record["count"]
+            row = messages.setdefault(record["signature"],
+                                      [record["level"], record["source"], record["message"], 0, []])
+            row[3] += record["count"]
+            if entry["key"] not in row[4]:
+                row[4].append(entry["key"])
+    ordered = sorted(messages.values(), key=lambda row: (_level_rank(row[0]), -row[3]))
+    return {"total": sum(entry["console"]["total"] for entry in logged),
+            "levels": dict(sorted(levels.items(), key=lambda item: _level_rank(item[0]))),
+            "distinct": len(messages), "messages": ordered[:TOP_MESSAGES]}
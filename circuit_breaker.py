@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+"""
+Environment Circuit Breaker
+环境熔断器 - 测试环境不可用时快速停止剩余场景
+
+When the test site or SSO is down every scenario would still run into its
+full timeout ladder. The parallel runner feeds the breaker every failed step,
+failed login and scenario result; the breaker trips on environment-level
+failures:
+
+    - the landing pages (a suite's ENVIRONMENT_URLS) answer 5xx or not at all
+    - a browser reports a DNS / connection error
+    - logins fail LOGIN_FAILURE_THRESHOLD times in a row
+    - REPEATED_FAILURE_THRESHOLD scenarios in a row fail their first step with the
+      same timeout or connection error (a product regression failing later steps,
+      or failing with an assertion, is left to the report)
+
+Once tripped, the runner stops its workers and reports every remaining
+scenario as "skipped: environment down".
+
+Suite modules declare the pages to probe next to SCENARIOS:
+
+    ENVIRONMENT_URLS = ["https://test-ip-shenlong.cd.xiaoxigroup.net"]
+"""
+
+import re
+import urllib.error
+import urllib.request
+
+PROBE_TIMEOUT = 5
+
+LOGIN_FAILURE_THRESHOLD = 2
+REPEATED_FAILURE_THRESHOLD = 3
+
+SKIP_REASON = "skipped: environment down"
+
+# Chrome net errors and Python / urllib3 messages meaning the host could not be reached
+CONNECTION_ERROR_PATTERNS = (
+    "ERR_NAME_NOT_RESOLVED",
+    "ERR_NAME_RESOLUTION_FAILED",
+    "ERR_CONNECTION_REFUSED",
+    "ERR_CONNECTION_RESET",
+    "ERR_CONNECTION_CLOSED",
+    "ERR_CONNECTION_TIMED_OUT",
+    "ERR_ADDRESS_UNREACHABLE",
+    "ERR_INTERNET_DISCONNECTED",
+    "ERR_PROXY_CONNECTION_FAILED",
+    "ERR_TUNNEL_CONNECTION_FAILED",
+    "Name or service not known",
+    "nodename nor servname provided",
+    "getaddrinfo failed",
+    "Connection refused",
+    "Max retries exceeded",
+)
+
+
+# Selenium / Chrome messages of a page or element that never came
+TIMEOUT_PATTERNS = (
+    "TimeoutException",
+    "timed out",
+    "Timed out",
+    "timeout",
+)
+
+
+def is_connection_error(message):
+    """True if an error message says the host could not be resolved or connected to"""
+    return any(pattern in message for pattern in CONNECTION_ERROR_PATTERNS)
+
+
+def is_timeout(message):
+    """True if an error message says a page load, script or wait timed out"""
+    return any(pattern in message for pattern in TIMEOUT_PATTERNS)
+
+
+def probe_url(url, timeout=PROBE_TIMEOUT):
+    """
+    Request a landing page the way a browser would see it
+
+    Returns:
+        tuple: (healthy bool, message str) - 5xx and connection errors are unhealthy,
+               any other HTTP answer means the server is up
+    """
+    request = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0 (ShenLong test probe)"})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return True, f"{url} answered HTTP {response.status}"
+    except urllib.error.HTTPError as e:
+        if e.code >= 500:
+            return False, f"{url} answered HTTP {e.code}"
+        return True, f"{url} answered HTTP {e.code}"
+    except Exception as e:
+        reason = getattr(e, "reason", None) or e
+        return False, f"{url} unreachable: {reason}"
+
+
+def probe_environment(urls, timeout=PROBE_TIMEOUT):
+    """
+    Probe every landing page
+
+    Returns:
+        tuple: (healthy bool, message of the first unhealthy page or "")
+    """
+    for url in urls:
+        healthy, message = probe_url(url, timeout)
+        if not healthy:
+            return False, message
+    return True, ""
+
+
+def failure_signature(message):
+    """First line of an error message with numbers removed, so repeats of one error compare equal"""
+    first_line = message.strip().splitlines()[0] if message.strip() else ""
+    return re.sub(r"\d+", "#", first_line)[:200]
+
+
+class CircuitBreaker:
+    """Decides from a run's events whether the test environment itself is down"""
+
+    def __init__(self, urls=None):
+        """
+        Args:
+            urls: Landing pages probed to confirm an outage (a suite's ENVIRONMENT_URLS)
+        """
+        self.urls = list(urls or [])
+        self.reason = None
+        self.login_failures = 0
+        self.started = set()          # scenario keys that reported a step
+        self.first_failures = {}      # scenario key -> signature of its first step's timeout / connection error
+        self.repeated_signature = None
+        self.repeated_count = 0
+
+    @property
+    def tripped(self):
+        return self.reason is not None
+
+    def trip(self, reason):
+        if not self.tripped:
+            self.reason = reason
+            print(f"[circuit-breaker] Environment down - {reason}")
+
+    def check(self):
+        """
+        Probe the landing pages and trip if one of them is down
+
+        Returns:
+            bool: True while the environment looks healthy
+        """
+        if not self.tripped and self.urls:
+            healthy, message = probe_environment(self.urls)
+            if not healthy:
+                self.trip(message)
+        return not self.tripped
+
+    def record_step(self, scenario, status, message):
+        """Feed one reported step; connection errors are confirmed with a probe"""
+        first_step = scenario is not None and scenario not in self.started
+        if scenario is not None:
+            self.started.add(scenario)
+        if status != "FAIL" or self.tripped:
+            return
+        if first_step and (is_timeout(message) or is_connection_error(message)):
+            self.first_failures[scenario] = failure_signature(message)
+        if is_connection_error(message) and self.check():
+            if not self.urls:
+                self.trip(f"browser could not connect: {failure_signature(message)}")
+
+    def record_login_failure(self, account):
+        """Feed a failed login; repeated failures mean the login service is down"""
+        self.login_failures += 1
+        if self.check() and self.login_failures >= LOGIN_FAILURE_THRESHOLD:
+            self.trip(f"login failed {self.login_failures} times in a row (account '{account}')")
+
+    def record_result(self, scenario, success):
+        """Feed a finished scenario; the same first-step timeout on several scenarios in a row trips"""
+        self.started.discard(scenario)
+        signature = self.first_failures.pop(scenario, None)
+        if success:
+            self.login_failures = 0
+            self.repeated_signature, self.repeated_count = None, 0
+            return
+        if signature is None:
+            return
+        if signature == self.repeated_signature:
+            self.repeated_count += 1
+        else:
+            self.repeated_signature, self.repeated_count = signature, 1
+        if self.repeated_count >= REPEATED_FAILURE_THRESHOLD and self.check():
+            self.trip(f"{self.repeated_count} scenarios in a row failed their first step with '{signature}'")
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+
+"""
+WebDriver Command Profiler
+WebDriver 命令分析 - 按命令类型和调用位置统计往返次数与延迟
+
+Every find_element, is_displayed, execute_script or current_url read is one
+HTTP round trip to chromedriver, and polling helpers can send hundreds of them
+per check. When enabled (--profile-commands on run_all_tests.py or
+parallel_runner.py), WebDriver.execute is wrapped and every command sent
+during a scenario is counted:
+
+    - by command type ("findElement", "isElementDisplayed", "executeScript", ...)
+      with its total time, its slowest call and a latency histogram
+      (HISTOGRAM_BUCKETS, in milliseconds)
+    - by call site: the first file:line outside Selenium and the wrappers in
+      this repo, i.e. the line of the test or helper that issued it
+
+Commands inside a WebDriverWait count too - they are round trips like any
+other. The profile of each scenario travels with its scenario_end event, and
+the HTML report summarizes the suite (see report_stream.commands_html).
+"""
+
+import functools
+import os
+import sys
+import threading
+import time
+
+# Upper bounds of the latency histogram buckets in ms; the last bucket holds everything slower
+HISTOGRAM_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Call sites listed in the report, most round trips first
+TOP_CALL_SITES = 20
+
+# Frames skipped when looking for a command's call site
+WRAPPER_FILES = {"command_profiler.py", "idle_accounting.py", "tab_executor.py", "trace_spans.py"}
+
+_state = threading.local()
+_enable_lock = threading.Lock()
+_enabled = False
+
+
+def _bucket(ms):
+    for index, bound in enumerate(HISTOGRAM_BUCKETS):
+        if ms <= bound:
+            return index
+    return len(HISTOGRAM_BUCKETS)
+
+
+def _new_stats():
+    return {"count": 0, "seconds": 0.0, "max_ms": 0.0, "histogram": [0] * (len(HISTOGRAM_BUCKETS) + 1)}
+
+
+def _add_stats(stats, count, seconds, max_ms, histogram):
+    stats["count"] += count
+    stats["seconds"] += seconds
+    stats["max_ms"] = max(stats["max_ms"], max_ms)
+    for index, value in enumerate(histogram):
+        stats["histogram"][index] += value
+
+
+class ScenarioProfile:
+    """Commands sent while one scenario runs"""
+
+    def __init__(self, key):
+        self.key = key
+        self.commands = {}   # command -> stats
+        self.sites = {}      # "file:line" -> {"count", "seconds", "commands": {command: count}}
+
+    def add(self, command, seconds, site):
+        ms = seconds * 1000.0
+        histogram = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+        histogram[_bucket(ms)] = 1
+        _add_stats(self.commands.setdefault(command, _new_stats()), 1, seconds, ms, histogram)
+        entry = self.sites.setdefault(site, {"count": 0, "seconds": 0.0, "commands": {}})
+        entry["count"] += 1
+        entry["seconds"] += seconds
+        entry["commands"][command] = entry["commands"].get(command, 0) + 1
+
+    def as_dict(self):
+        commands = {command: dict(stats, seconds=round(stats["seconds"], 4), max_ms=round(stats["max_ms"], 1))
+                    for command, stats in self.commands.items()}
+        sites = {site: dict(entry, seconds=round(entry["seconds"], 4)) for site, entry in self.sites.items()}
+        return {"commands": commands, "sites": sites}
+
+
+def _call_site():
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if "/selenium/" not in filename.replace("\\", "/") and os.path.basename(filename) not in WRAPPER_FILES:
+            return f"{os.path.basename(filename)}:{frame.f_lineno}"
+        frame = frame.f_back
+    return "unknown"
+
+
+def _profiled(execute):
+    @functools.wraps(execute)
+    def wrapper(self, driver_command, params=None):
+        profile = getattr(_state, "profile", None)
+        if profile is None:
+            return execute(self, driver_command, params)
+        site = _call_site()
+        start = time.perf_counter()
+        try:
+            return execute(self, driver_command, params)
+        finally:
+            profile.add(driver_command, time.perf_counter() - start, site)
+
+    return wrapper
+
+
+def enable():
+    """Start profiling the commands of every scenario run in this process"""
+    global _enabled
+    with _enable_lock:
+        if _enabled:
+            return
+        try:
+            from selenium.webdriver.remote.webdriver import WebDriver
+        except ImportError:
+            print("Selenium is not installed - WebDriver commands are not profiled")
+            return
+        WebDriver.execute = _profiled(WebDriver.execute)
+        _enabled = True
+
+
+def is_enabled():
+    return _enabled
+
+
+def begin(key):
+    """Profile the calling thread's commands as scenario key (no-op unless enabled)"""
+    _state.profile = ScenarioProfile(key) if _enabled else None
+
+
+def end():
+    """
+    Stop profiling the calling thread's scenario
+
+    Returns:
+        dict: {"commands": {command: stats}, "sites": {"file:line": {...}}}; None when not profiling
+    """
+    profile = getattr(_state, "profile", None)
+    _state.profile = None
+    return profile.as_dict() if profile else None
+
+
+def histogram_percentile(histogram, pct):
+    """
+    Upper bound (ms) of the bucket holding the pct-th percentile
+
+    Returns:
+        float: inf when it falls in the overflow bucket, None for an empty histogram
+    """
+    total = sum(histogram)
+    if not total:
+        return None
+    rank = pct / 100.0 * total
+    seen = 0
+    for index, count in enumerate(histogram):
+        seen += count
+        if seen >= rank:
+            return float(HISTOGRAM_BUCKETS[index]) if index < len(HISTOGRAM_BUCKETS) else float("inf")
+    return float("inf")
+
+
+def suite_profile(scenarios):
+    """
+    Command profile of a suite from its scenario summaries (see report_stream.summarize_events)
+
+    Returns:
+        dict: {"count", "seconds", "commands": {command: stats} busiest first,
+               "scenarios": [[key, count, seconds], ...],
+               "sites": [[site, count, seconds, {command: count}], ...] TOP_CALL_SITES busiest}
+        None when no scenario was profiled
+    """
+    profiled = [entry for entry in scenarios if entry.get("commands")]
+    if not profiled:
+        return None
+    commands = {}
+    sites = {}
+    per_scenario = []
+    for entry in profiled:
+        count = seconds = 0
+        for command, stats in entry["commands"]["commands"].items():
+            _add_stats(commands.setdefault(command, _new_stats()), stats["count"], stats["seconds"],
+                       stats["max_ms"], stats["histogram"])
+            count += stats["count"]
+            seconds += stats["seconds"]
+        per_scenario.append([entry["key"], count, round(seconds, 3)])
+        for site, site_stats in entry["commands"]["sites"].items():
+            total = sites.setdefault(site, {"count": 0, "seconds": 0.0, "commands": {}})
+            total["count"] += site_stats["count"]
+            total["seconds"] += site_stats["seconds"]
+            for command, count in site_stats["commands"].items():
+                total["commands"][command] = total["commands"].get(command, 0) + count
+    top_sites = sorted(sites.items(), key=lambda item: -item[1]["count"])[:TOP_CALL_SITES]
+    return {
+        "count": sum(stats["count"] for stats in commands.values()),
+        "seconds": round(sum(stats["seconds"] for stats in commands.values()), 3),
+        "commands": {command: dict(stats, seconds=round(stats["seconds"], 3))
+                     for command, stats in sorted(commands.items(), key=lambda item: -item[1]["count"])},
+        "scenarios": sorted(per_scenario, key=lambda row: -row[1]),
+        "sites": [[site, stats["count"], round(stats["seconds"], 3), stats["commands"]] for site, stats in top_sites],
+    }
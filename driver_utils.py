@@ -9,96 +9,217 @@ import os
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def setup_chrome_driver():
+def build_chrome_options(page_load_strategy=None, performance_log=False, console_log=False):
     """
-    Set up and return a Chrome WebDriver instance with optimized settings
-    and comprehensive error handling for browser console warnings
+    Build the Chrome options shared by local and remote drivers
+    
+    Args:
+        page_load_strategy: Optional Selenium page load strategy ("normal", "eager", "none").
+            Multi-tab runs use "eager" so a navigation in one tab does not hold
+            the shared browser until every image has loaded.
+        performance_log: Log the CDP Network events for HAR capture (see har_recorder.py)
+        console_log: Log console messages and JS exceptions (see browser_console.py)
     
     Returns:
-        WebDriver instance or None if setup fails
+        Options instance
+    """
+    # Enhanced Chrome options for better performance and error suppression
+    chrome_options = Options()
+    
+    # ============================================================================
+    # STABILITY & PERFORMANCE OPTIONS
+    # ============================================================================
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-web-security')
+    chrome_options.add_argument('--disable-extensions')
+    chrome_options.add_argument('--disable-plugins')
+    # Remove or comment out the line that disables images
+    # chrome_options.add_argument('--disable-images')
+    
+    # Enable images and media
+    chrome_options.add_argument('--enable-images')
+    chrome_options.add_argument('--enable-media-stream')
+    chrome_options.add_argument('--disable-logging')
+    chrome_options.add_argument('--disable-default-apps')
+    chrome_options.add_argument('--disable-sync')
+    chrome_options.add_argument('--disable-translate')
+    chrome_options.add_argument('--disable-notifications')
+    chrome_options.add_argument('--disable-background-timer-throttling')
+    chrome_options.add_argument('--disable-backgrounding-occluded-windows')
+    chrome_options.add_argument('--disable-renderer-backgrounding')
+    chrome_options.add_argument('--disable-features=TranslateUI')
+    chrome_options.add_argument('--disable-ipc-flooding-protection')
+    
+    # Remove or comment out all GPU/hardware acceleration disabling options
+    # chrome_options.add_argument('--disable-gpu')
+    # chrome_options.add_argument('--disable-gpu-sandbox')
+    # chrome_options.add_argument('--disable-software-rasterizer')
+    # chrome_options.add_argument('--disable-accelerated-2d-canvas')
+    # chrome_options.add_argument('--disable-accelerated-jpeg-decoding')
+    # chrome_options.add_argument('--disable-accelerated-mjpeg-decode')
+    # chrome_options.add_argument('--disable-accelerated-video-decode')
+    # chrome_options.add_argument('--disable-accelerated-video-encode')
+    
+    # ============================================================================
+    # NETWORK & SSL FIXES
+    # ============================================================================
+    chrome_options.add_argument('--ignore-certificate-errors')
+    chrome_options.add_argument('--ignore-ssl-errors')
+    chrome_options.add_argument('--ignore-certificate-errors-spki-list')
+    chrome_options.add_argument('--allow-running-insecure-content')
+    chrome_options.add_argument('--disable-web-security')
+    chrome_options.add_argument('--allow-cross-origin-auth-prompt')
+    chrome_options.add_argument('--disable-features=VizDisplayCompositor')
+    
+    # ============================================================================
+    # CONSOLE WARNING SUPPRESSION
+    # ============================================================================
+    chrome_options.add_argument('--disable-logging')
+    chrome_options.add_argument('--log-level=3')
+    chrome_options.add_argument('--silent')
+    chrome_options.add_argument('--disable-console-logging')
+    chrome_options.add_argument('--disable-logging-redirect')
+    
+    # ============================================================================
+    # AUTOMATION DETECTION PREVENTION
+    # ============================================================================
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    # In the experimental options, set images to 1 (allow)
+    chrome_options.add_experimental_option("prefs", {
+        "profile.default_content_setting_values.notifications": 2,
+        "profile.default_content_settings.popups": 0,
+        "profile.managed_default_content_settings.images": 1,  # 1=allow images
+        "profile.default_content_setting_values.images": 1,  # 1=allow images
+        "profile.default_content_setting_values.media_stream": 2,
+        "profile.managed_default_content_settings.javascript": 1,  # 1=allow javascript
+        "profile.default_content_setting_values.javascript": 1,  # 1=allow javascript
+    })
+    
+    # ============================================================================
+    # USER AGENT & WINDOW SETTINGS
+    # ============================================================================
+    chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+    chrome_options.add_argument('--start-maximized')
+    chrome_options.add_argument('--window-size=1920,1080')
+    
+    if page_load_strategy:
+        chrome_options.page_load_strategy = page_load_strategy
+    
+    if performance_log:
+        from har_recorder import enable_performance_log
+        enable_performance_log(chrome_options)
+    
+    if console_log:
+        from browser_console import enable_browser_log
+        enable_browser_log(chrome_options)
+    
+    return chrome_options
+
+def configure_driver(driver, console_log=False):
     """
+    Apply timeouts, anti-detection and console suppression scripts to a new driver
+    
+    Args:
+        console_log: Keep console.warn/error and unhandled rejections, for browser_console.py
+    
+    Returns:
+        The same driver (also when part of the configuration fails)
+    """
+    # ============================================================================
+    # POST-INITIALIZATION CONFIGURATION
+    # ============================================================================
     try:
-        # Enhanced Chrome options for better performance and error suppression
-        chrome_options = Options()
+        # Set timeouts
+        driver.set_page_load_timeout(60)
+        driver.implicitly_wait(10)
         
-        # ============================================================================
-        # STABILITY & PERFORMANCE OPTIONS
-        # ============================================================================
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-web-security')
-        chrome_options.add_argument('--disable-extensions')
-        chrome_options.add_argument('--disable-plugins')
-        # Remove or comment out the line that disables images
-        # chrome_options.add_argument('--disable-images')
+        # Execute anti-detection scripts
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        driver.execute_script("Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]})")
+        driver.execute_script("Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']})")
         
-        # Enable images and media
-        chrome_options.add_argument('--enable-images')
-        chrome_options.add_argument('--enable-media-stream')
-        chrome_options.add_argument('--disable-logging')
-        chrome_options.add_argument('--disable-default-apps')
-        chrome_options.add_argument('--disable-sync')
-        chrome_options.add_argument('--disable-translate')
-        chrome_options.add_argument('--disable-notifications')
-        chrome_options.add_argument('--disable-background-timer-throttling')
-        chrome_options.add_argument('--disable-backgrounding-occluded-windows')
-        chrome_options.add_argument('--disable-renderer-backgrounding')
-        chrome_options.add_argument('--disable-features=TranslateUI')
-        chrome_options.add_argument('--disable-ipc-flooding-protection')
-        
-        # Remove or comment out all GPU/hardware acceleration disabling options
-        # chrome_options.add_argument('--disable-gpu')
-        # chrome_options.add_argument('--disable-gpu-sandbox')
-        # chrome_options.add_argument('--disable-software-rasterizer')
-        # chrome_options.add_argument('--disable-accelerated-2d-canvas')
-        # chrome_options.add_argument('--disable-accelerated-jpeg-decoding')
-        # chrome_options.add_argument('--disable-accelerated-mjpeg-decode')
-        # chrome_options.add_argument('--disable-accelerated-video-decode')
-        # chrome_options.add_argument('--disable-accelerated-video-encode')
+        # Ensure images are enabled
+        driver.execute_script("""
+            // Enable images if they were disabled
+            if (typeof chrome !== 'undefined' && chrome.contentSettings) {
+                chrome.contentSettings.images.set({
+                    'pattern': '<all_urls>',
+                    'setting': 'allow'
+                });
+            }
+            
+            // Force image loading
+            const images = document.querySelectorAll('img');
+            images.forEach(img => {
+                if (img.style.display === 'none') {
+                    img.style.display = 'block';
+                }
+                if (img.style.visibility === 'hidden') {
+                    img.style.visibility = 'visible';
+                }
+            });
+        """)
         
-        # ============================================================================
-        # NETWORK & SSL FIXES
-        # ============================================================================
-        chrome_options.add_argument('--ignore-certificate-errors')
-        chrome_options.add_argument('--ignore-ssl-errors')
-        chrome_options.add_argument('--ignore-certificate-errors-spki-list')
-        chrome_options.add_argument('--allow-running-insecure-content')
-        chrome_options.add_argument('--disable-web-security')
-        chrome_options.add_argument('--allow-cross-origin-auth-prompt')
-        chrome_options.add_argument('--disable-features=VizDisplayCompositor')
+        # Suppress console errors and warnings (unless they are being captured)
+        if not console_log:
+            driver.execute_script("""
+                // Override console methods to suppress warnings
+                const originalConsole = {
+                    log: console.log,
+                    warn: console.warn,
+                    error: console.error
+                };
+            
+                console.warn = function() {};
+                console.error = function() {};
+            
+                // Suppress specific warnings
+                window.addEventListener('error', function(e) {
+                    if (e.message.includes('GPU') || 
+                        e.message.includes('WebGL') || 
+                        e.message.includes('network') ||
+                        e.message.includes('SSL') ||
+                        e.message.includes('certificate')) {
+                        e.preventDefault();
+                        return false;
+                    }
+                });
+            
+                // Suppress unhandled promise rejections
+                window.addEventListener('unhandledrejection', function(e) {
+                    e.preventDefault();
+                });
+            """)
         
-        # ============================================================================
-        # CONSOLE WARNING SUPPRESSION
-        # ============================================================================
-        chrome_options.add_argument('--disable-logging')
-        chrome_options.add_argument('--log-level=3')
-        chrome_options.add_argument('--silent')
-        chrome_options.add_argument('--disable-console-logging')
-        chrome_options.add_argument('--disable-logging-redirect')
+        # Maximize window
+        driver.maximize_window()
         
-        # ============================================================================
-        # AUTOMATION DETECTION PREVENTION
-        # ============================================================================
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        # In the experimental options, set images to 1 (allow)
-        chrome_options.add_experimental_option("prefs", {
-            "profile.default_content_setting_values.notifications": 2,
-            "profile.default_content_settings.popups": 0,
-            "profile.managed_default_content_settings.images": 1,  # 1=allow images
-            "profile.default_content_setting_values.images": 1,  # 1=allow images
-            "profile.default_content_setting_values.media_stream": 2,
-            "profile.managed_default_content_settings.javascript": 1,  # 1=allow javascript
-            "profile.default_content_setting_values.javascript": 1,  # 1=allow javascript
-        })
+        logger.info("✅ WebDriver setup completed successfully with all optimizations")
+        return driver
         
-        # ============================================================================
-        # USER AGENT & WINDOW SETTINGS
-        # ============================================================================
-        chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-        chrome_options.add_argument('--start-maximized')
-        chrome_options.add_argument('--window-size=1920,1080')
+    except Exception as e:
+        logger.warning(f"⚠️ Post-initialization configuration failed: {e}")
+        # Return driver even if post-config fails
+        return driver
+
+def setup_chrome_driver(page_load_strategy=None, performance_log=False, console_log=False):
+    """
+    Set up and return a Chrome WebDriver instance with optimized settings
+    and comprehensive error handling for browser console warnings
+    
+    Args:
+        page_load_strategy: Optional Selenium page load strategy, see build_chrome_options()
+        performance_log: Log the CDP Network events, see build_chrome_options()
+        console_log: Capture console messages and JS exceptions, see build_chrome_options()
+    
+    Returns:
+        WebDriver instance or None if setup fails
+    """
+    try:
+        chrome_options = build_chrome_options(page_load_strategy, performance_log, console_log)
         
         # ============================================================================
         # DRIVER INITIALIZATION WITH MULTIPLE FALLBACK METHODS
@@ -149,83 +270,32 @@ def setup_chrome_driver():
         if driver is None:
             logger.error("❌ All driver initialization methods failed")
             return None
-            
-        # ============================================================================
-        # POST-INITIALIZATION CONFIGURATION
-        # ============================================================================
-        try:
-            # Set timeouts
-            driver.set_page_load_timeout(60)
-            driver.implicitly_wait(10)
-            
-            # Execute anti-detection scripts
-            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            driver.execute_script("Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]})")
-            driver.execute_script("Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']})")
-            
-            # Ensure images are enabled
-            driver.execute_script("""
-                // Enable images if they were disabled
-                if (typeof chrome !== 'undefined' && chrome.contentSettings) {
-                    chrome.contentSettings.images.set({
-                        'pattern': '<all_urls>',
-                        'setting': 'allow'
-                    });
-                }
-                
-                // Force image loading
-                const images = document.querySelectorAll('img');
-                images.forEach(img => {
-                    if (img.style.display === 'none') {
-                        img.style.display = 'block';
-                    }
-                    if (img.style.visibility === 'hidden') {
-                        img.style.visibility = 'visible';
-                    }
-                });
-            """)
-            
-            # Suppress console errors and warnings
-            driver.execute_script("""
-                // Override console methods to suppress warnings
-                const originalConsole = {
-                    log: console.log,
-                    warn: console.warn,
-                    error: console.error
-                };
-                
-                console.warn = function() {};
-                console.error = function() {};
-                
-                // Suppress specific warnings
-                window.addEventListener('error', function(e) {
-                    if (e.message.includes('GPU') || 
-                        e.message.includes('WebGL') || 
-                        e.message.includes('network') ||
-                        e.message.includes('SSL') ||
-                        e.message.includes('certificate')) {
-                        e.preventDefault();
-                        return false;
-                    }
-                });
-                
-                // Suppress unhandled promise rejections
-                window.addEventListener('unhandledrejection', function(e) {
-                    e.preventDefault();
-                });
-            """)
-            
-            # Maximize window
-            driver.maximize_window()
-            
-            logger.info("✅ WebDriver setup completed successfully with all optimizations")
-            return driver
-            
-        except Exception as e:
-            logger.warning(f"⚠️ Post-initialization configuration failed: {e}")
-            # Return driver even if post-config fails
-            return driver
+        
+        return configure_driver(driver, console_log)
         
     except Exception as e:
         logger.error(f"❌ Failed to initialize WebDriver: {e}")
-        return None 
\ No newline at end of file
+        return None
+
+def setup_remote_driver(command_executor, page_load_strategy=None, performance_log=False, console_log=False):
+    """
+    Set up a Chrome session on a remote WebDriver endpoint (Selenium Grid hub or standalone node)
+    
+    Args:
+        command_executor: Node URL, e.g. "http://localhost:4444" (or ".../wd/hub" for Grid 3)
+        page_load_strategy: Optional Selenium page load strategy, see build_chrome_options()
+        performance_log: Log the CDP Network events, see build_chrome_options()
+        console_log: Capture console messages and JS exceptions, see build_chrome_options()
+    
+    Returns:
+        WebDriver instance or None if setup fails
+    """
+    try:
+        logger.info(f"Attempting to start remote session on {command_executor}...")
+        driver = webdriver.Remote(command_executor=command_executor,
+                                  options=build_chrome_options(page_load_strategy, performance_log, console_log))
+        logger.info(f"✅ Remote driver initialized on {command_executor}")
+    except Exception as e:
+        logger.error(f"❌ Failed to start remote session on {command_executor}: {e}")
+        return None
+    return configure_driver(driver, console_log)
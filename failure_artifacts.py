@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+
+"""
+Failure Artifacts
+失败现场 - 失败步骤自动保存截图、压缩 DOM 快照与当前 URL (后台线程写盘)
+
+Every FAIL step of a scenario captures the browser state at that moment:
+
+    reports/<report>_artifacts/<scenario>/<NN>_<step>.png       screenshot
+    reports/<report>_artifacts/<scenario>/<NN>_<step>.html.gz   page source
+    reports/<report>_artifacts/<scenario>/<NN>_<step>.json      step, message, URL, title, time, files
+
+Only the browser calls (screenshot as base64, page source, URL, title) run
+on the scenario's thread. Decoding the screenshot, compressing the DOM and
+writing the files happen on one background writer thread per process, so
+the next step or scenario is not delayed; drain() waits for the queue before
+the process exits or the report is rendered.
+
+A screenshot identical to the scenario's previous one (same SHA-1 of its
+base64 data, e.g. a retry failing on the same screen) is not written again;
+its record points to the earlier file. At most MAX_CAPTURES per scenario are
+taken. The records of each scenario travel with its scenario_end event
+("artifacts") and are listed in the HTML report.
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import os
+import queue
+import re
+import threading
+from datetime import datetime
+
+# Failure captures per scenario; later FAIL steps are only reported
+MAX_CAPTURES = 10
+
+# Page sources saved by the ShenLong_Parts scripts' debug_page_structure()
+PAGE_SOURCE_DIR = os.path.join("reports", "page_sources")
+
+_queue = queue.Queue()
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def _write_loop():
+    while True:
+        job = _queue.get()
+        try:
+            job()
+        except Exception as e:
+            print(f"Could not write failure artifact: {e}")
+        finally:
+            _queue.task_done()
+
+
+def _submit(job):
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_write_loop, name="failure-artifacts", daemon=True)
+            _writer.start()
+    _queue.put(job)
+
+
+def drain():
+    """Wait until every queued artifact is on disk"""
+    if _writer is not None:
+        _queue.join()
+
+
+def _slug(text, limit=60):
+    return re.sub(r"[^\w.-]+", "_", str(text)).strip("_")[:limit] or "step"
+
+
+def _write_files(record, screenshot_b64, page_source):
+    os.makedirs(os.path.dirname(record["meta"]), exist_ok=True)
+    if screenshot_b64 is not None and record["screenshot_new"]:
+        with open(record["screenshot"], 'wb') as f:
+            f.write(base64.b64decode(screenshot_b64))
+    if page_source is not None:
+        with gzip.open(record["dom"], 'wt', encoding='utf-8') as f:
+            f.write(page_source)
+    with open(record["meta"], 'w', encoding='utf-8') as f:
+        json.dump({name: value for name, value in record.items() if name != "screenshot_new"},
+                  f, ensure_ascii=False, indent=2)
+
+
+class ArtifactCollector:
+    """Captures the browser state of one driver (worker or tab) on failed steps"""
+
+    def __init__(self, driver, directory):
+        """
+        Args:
+            driver: WebDriver the scenarios of this worker or tab run on
+            directory: Artifact directory of the run, e.g. reports/<report>_artifacts
+        """
+        self.driver = driver
+        self.directory = directory
+        self.records = {}        # scenario key -> list of records
+        self.last_screenshot = {}  # scenario key -> (hash, path)
+
+    def capture(self, scenario, step_name, message=""):
+        """
+        Capture the browser for a failed step; files are written in the background
+
+        Returns:
+            dict: Record with step, message, url, title, time, screenshot, dom and meta paths;
+                  None when MAX_CAPTURES is reached or the browser could not be read at all
+        """
+        key = scenario or "no_scenario"
+        records = self.records.setdefault(key, [])
+        if len(records) >= MAX_CAPTURES:
+            return None
+        base = os.path.join(self.directory, _slug(key, 100), f"{len(records) + 1:02d}_{_slug(step_name)}")
+        record = {"step": step_name, "message": message, "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                  "url": None, "title": None, "screenshot": None, "dom": None, "meta": base + ".json",
+                  "screenshot_new": False}
+        screenshot_b64 = page_source = None
+        try:
+            record["url"] = self.driver.current_url
+            record["title"] = self.driver.title
+        except Exception:
+            pass
+        try:
+            screenshot_b64 = self.driver.get_screenshot_as_base64()
+        except Exception:
+            pass
+        try:
+            page_source = self.driver.page_source
+        except Exception:
+            pass
+        if screenshot_b64 is None and page_source is None and record["url"] is None:
+            return None   # Browser gone (crashed worker, closed session)
+
+        if screenshot_b64 is not None:
+            digest = hashlib.sha1(screenshot_b64.encode("ascii")).hexdigest()
+            previous = self.last_screenshot.get(key)
+            if previous and previous[0] == digest:
+                record["screenshot"] = previous[1]
+            else:
+                record["screenshot"] = base + ".png"
+                record["screenshot_new"] = True
+                self.last_screenshot[key] = (digest, record["screenshot"])
+        if page_source is not None:
+            record["dom"] = base + ".html.gz"
+        records.append(record)
+        _submit(lambda: _write_files(record, screenshot_b64, page_source))
+        return record
+
+    def end(self, scenario):
+        """
+        Records of a finished scenario (without the writer's bookkeeping)
+
+        Returns:
+            list: Records in capture order; None when nothing was captured
+        """
+        key = scenario or "no_scenario"
+        self.last_screenshot.pop(key, None)
+        records = self.records.pop(key, None)
+        if not records:
+            return None
+        return [{name: value for name, value in record.items() if name != "screenshot_new"} for record in records]
+
+
+def save_page_source(driver, label, directory=PAGE_SOURCE_DIR):
+    """
+    Save the current page source for inspection as <directory>/<label>_<YYYYMMDD_HHMMSS>.html.gz
+
+    Returns:
+        str: Path of the file, or None if the page could not be read or written
+    """
+    path = os.path.join(directory, f"{_slug(label, 100)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html.gz")
+    try:
+        page_source = driver.page_source
+        os.makedirs(directory, exist_ok=True)
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            f.write(page_source)
+    except Exception as e:
+        print(f"Could not save page source: {e}")
+        return None
+    print(f"Page source saved to {path}")
+    return path
+
+
+def artifacts_dir(events_path):
+    """Artifact directory of a report's event file"""
+    return os.path.splitext(events_path)[0] + "_artifacts"
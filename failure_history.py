@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+
+"""
+Scenario Failure History
+失败历史索引 - 从历史报告与新运行中记录场景结果, 支持失败优先排序
+
+Keeps the recent outcomes of every scenario in a small JSON store under
+reports/ (next to scenario_durations.json):
+
+    {"scenarios": {"website::dynamic_advanced.alipay": [
+         {"run": "package6_comprehensive_test_20250730_093040.html", "status": "FAIL"},
+         {"run": "20240115_143025", "status": "FLAKY"}, ...]},
+     "ingested": ["admin_panel_test_20250731_094347.html", ...]}
+
+A status is PASS, FAIL or FLAKY (passed after a retry). New runs are recorded
+by parallel_runner.py and run_all_tests.py as they finish; HTML reports in
+reports/ that were never recorded are ingested once:
+
+    - reports with "Scenario:" lines attribute each step to its scenario key
+    - older reports have no scenario keys: admin outcome headings such as
+      "[PASS] Static Premium Plan - Balance Payment" are mapped to ids from their
+      package and payment words, and website reports are split into scenarios
+      at their "Navigate to ..." steps (see legacy_website_segments)
+
+priority() turns the history into a recency-weighted failure score used by
+run_all_tests.py --order=failed-first.
+"""
+
+import glob
+import html
+import json
+import os
+import re
+
+HISTORY_PATH = os.path.join("reports", "failure_history.json")
+REPORTS_GLOB = os.path.join("reports", "*.html")
+
+# Number of recent outcomes kept per scenario
+MAX_RUNS = 20
+
+# Weight of an outcome in priority(); each older run counts DECAY times less
+STATUS_WEIGHTS = {"FAIL": 1.0, "FLAKY": 0.5, "PASS": 0.0}
+DECAY = 0.7
+
+# Words of legacy report headings -> scenario key parts (first match wins)
+LEGACY_PACKAGES = (
+    ("dynamic advanced", "dynamic_advanced"),
+    ("dynamic dedicated", "dynamic_dedicated"),
+    ("static", "static_premium"),
+    ("long-term", "fixed_long_term"),
+    ("long term", "fixed_long_term"),
+    ("dedicated", "dynamic_dedicated"),
+)
+# Packages the website matrix keys differently (CompleteWebsitePurchase完整官网.PURCHASE_PACKAGES)
+WEBSITE_PACKAGE_KEYS = {"fixed_long_term": "fixed_longterm"}
+LEGACY_WEBSITE_PAYMENTS = (("wallet", "wallet"), ("alipay", "alipay"), ("wechat", "wechat"))
+LEGACY_ADMIN_PAYMENTS = (("pending order", "pending_order"), ("balance payment", "balance_payment"))
+
+STEP_PATTERN = re.compile(
+    r'<h3>\[(?:PASS|FAIL|INFO)\] (?P<heading>[^<]*)</h3>\s*'
+    r'(?:<p><strong>Scenario:</strong> (?P<scenario>[^<]*)</p>\s*)?'
+    r'<p><strong>Time:</strong> (?P<time>[^<]*)</p>\s*'
+    r'<p><strong>Status:</strong> (?P<status>\w+)</p>\s*'
+    r'<p><strong>Message:</strong> (?P<message>.*?)</p>\s*</div>', re.DOTALL)
+
+
+def _match_word(text, table):
+    for word, value in table:
+        if word in text:
+            return value
+    return None
+
+
+def read_report_steps(path):
+    """
+    Steps of one HTML report
+
+    Returns:
+        tuple: (suite name "admin" or "website",
+                list of step dicts with name, scenario key ("" when untagged), status, message, timestamp)
+    """
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        text = f.read()
+    suite_name = "admin" if "Admin Panel Test Report" in text[:2000] else "website"
+    steps = [{"name": html.unescape(match.group("heading").strip()),
+              "scenario": html.unescape((match.group("scenario") or "").strip()),
+              "status": match.group("status"),
+              "message": html.unescape(match.group("message").strip()),
+              "timestamp": match.group("time").strip()}
+             for match in STEP_PATTERN.finditer(text)]
+    return suite_name, steps
+
+
+def legacy_admin_scenario_id(heading):
+    """
+    Scenario id of an outcome heading in an old (untagged) admin report
+
+    "<Package> Plan - <Payment>" and "Run <Package> <Payment> Test - Final Failure (Retry 2)"
+    are outcomes; every other step heading returns None.
+    """
+    text = heading.lower()
+    package = _match_word(text, LEGACY_PACKAGES)
+    payment = _match_word(text, LEGACY_ADMIN_PAYMENTS)
+    if package and payment and " - " in heading:
+        return f"admin::{package}.{payment}"
+    return None
+
+
+def legacy_admin_segments(steps):
+    """
+    Split the steps of an old (untagged) admin report into scenario attempts
+
+    Each outcome heading (see legacy_admin_scenario_id) closes an attempt made
+    of the steps since the previous outcome.
+
+    Returns:
+        list: (scenario id, list of step dicts) per attempt
+    """
+    segments = []
+    pending = []
+    for step in steps:
+        pending.append(step)
+        scenario_id = legacy_admin_scenario_id(step["name"])
+        if scenario_id:
+            segments.append((scenario_id, pending))
+            pending = []
+    return segments
+
+
+def legacy_website_segments(steps):
+    """
+    Split the steps of an old (untagged) website report into scenario attempts
+
+    Every scenario starts with a "Navigate to ..." step: "Navigate to <Package>"
+    on the meal page, "Navigate to Count Manage" in the personal center and
+    "Navigate to <Package> - No Balance" for the no-balance checks. The payment
+    method is the one selected in the segment (wallet when none is), and the
+    package of a personal center segment is the one named in one of its
+    headings, else the previous personal center segment's package (the old
+    main() ran the payment methods of one package back to back).
+
+    Args:
+        steps: List of step dicts in report order
+
+    Returns:
+        list: (scenario id, list of step dicts) per segment, login segments omitted
+    """
+    segments = []
+    current = None
+    pc_package = None
+    for step in steps:
+        text = step["name"].lower()
+        if text.startswith("navigate to "):
+            current = None
+            if "no balance" in text:
+                current = {"id": "website::no_balance", "pc": False, "package": None, "payment": None}
+            elif "count manage" in text:
+                current = {"pc": True, "package": None, "payment": "wallet"}
+            elif _match_word(text, LEGACY_PACKAGES):
+                current = {"pc": False, "package": _match_word(text, LEGACY_PACKAGES), "payment": "wallet"}
+            if current is not None:
+                current["steps"] = [step]
+                segments.append(current)
+            continue
+        if current is None:
+            continue
+        if text.startswith("select "):
+            current["payment"] = _match_word(text, LEGACY_WEBSITE_PAYMENTS) or current["payment"]
+        if current["pc"] and current["package"] is None:
+            current["package"] = _match_word(text, LEGACY_PACKAGES)
+        current["steps"].append(step)
+
+    result = []
+    for segment in segments:
+        if segment["pc"]:
+            segment["package"] = segment["package"] or pc_package
+            pc_package = segment["package"]
+        if "id" not in segment:
+            if segment["package"] is None:
+                continue
+            prefix = "pc_" if segment["pc"] else ""
+            package = WEBSITE_PACKAGE_KEYS.get(segment["package"], segment["package"])
+            segment["id"] = f"website::{prefix}{package}.{segment['payment']}"
+        result.append((segment["id"], segment["steps"]))
+    return result
+
+
+def report_attempts(suite_name, steps):
+    """
+    Scenario attempts of a report: tagged steps by their "Scenario:" key, untagged ones by segment
+
+    Returns:
+        list: (scenario id, list of step dicts) per attempt, in report order
+    """
+    if any(step["scenario"] for step in steps):
+        by_scenario = {}
+        for step in steps:
+            if step["scenario"]:
+                by_scenario.setdefault(f"{suite_name}::{step['scenario']}", []).append(step)
+        return list(by_scenario.items())
+    if suite_name == "admin":
+        return legacy_admin_segments(steps)
+    return legacy_website_segments(steps)
+
+
+def attempt_outcomes(attempts):
+    """
+    Outcome per scenario of report_attempts(): FAIL if the last attempt failed, FLAKY if an
+    earlier attempt failed or a stage was retried ("Retry <stage>" step), else PASS
+
+    Returns:
+        dict: scenario id -> "PASS", "FAIL" or "FLAKY"
+    """
+    results = {}
+    for scenario_id, steps in attempts:
+        results.setdefault(scenario_id, [])
+        if any(step["name"].startswith("Retry ") for step in steps):
+            results[scenario_id].append(False)  # A stage failed before the retry passed
+        results[scenario_id].append(not any(step["status"] == "FAIL" for step in steps))
+    outcomes = {}
+    for scenario_id, passed in results.items():
+        if not passed[-1]:
+            outcomes[scenario_id] = "FAIL"
+        elif not all(passed):
+            outcomes[scenario_id] = "FLAKY"
+        else:
+            outcomes[scenario_id] = "PASS"
+    return outcomes
+
+
+def parse_report(path):
+    """
+    Scenario outcomes recorded in one HTML report
+
+    Returns:
+        dict: scenario id -> "PASS", "FAIL" or "FLAKY"
+    """
+    return attempt_outcomes(report_attempts(*read_report_steps(path)))
+
+
+class FailureHistory:
+    """Local store of past scenario outcomes"""
+
+    def __init__(self, path=HISTORY_PATH):
+        self.path = path
+        self.scenarios = {}
+        self.ingested = []
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.scenarios = data.get("scenarios", {})
+                self.ingested = data.get("ingested", [])
+            except (OSError, ValueError) as e:
+                print(f"Could not read failure history {path}: {e}")
+        self._merge_misnamed_website_ids()
+
+    def _merge_misnamed_website_ids(self):
+        """Move outcomes ingested as website::fixed_long_term.* (older versions) to the matrix ids"""
+        for scenario_id in list(self.scenarios):
+            suite_name, _, key = scenario_id.partition("::")
+            package, dot, payment = key.partition(".")
+            if suite_name != "website" or package not in WEBSITE_PACKAGE_KEYS:
+                continue
+            samples = self.scenarios.pop(scenario_id)
+            target = f"website::{WEBSITE_PACKAGE_KEYS[package]}{dot}{payment}"
+            # Ingested legacy reports predate the live runs recorded under the matrix id
+            self.scenarios[target] = (samples + self.scenarios.get(target, []))[-MAX_RUNS:]
+
+    def record(self, scenario_id, status, run):
+        """
+        Add one outcome of a scenario
+
+        Args:
+            scenario_id: "<suite>::<key>" id as used by run_all_tests.py
+            status: "PASS", "FAIL" or "FLAKY"
+            run: Run id or report name the outcome comes from
+        """
+        samples = self.scenarios.setdefault(scenario_id, [])
+        samples.append({"run": run, "status": status})
+        del samples[:-MAX_RUNS]
+
+    def record_run(self, outcomes, run, reports=()):
+        """
+        Add the outcomes of a finished run and save the history
+
+        Args:
+            outcomes: dict of scenario id -> "PASS", "FAIL" or "FLAKY" (skipped scenarios left out)
+            run: Run id or report name
+            reports: HTML reports of the run, so ingest_reports() does not count them again
+        """
+        for scenario_id, status in outcomes.items():
+            self.record(scenario_id, status, run)
+        for report_path in reports:
+            self.mark_ingested(report_path)
+        self.save()
+
+    def mark_ingested(self, report_path):
+        """Remember that a report's outcomes are already in the history"""
+        name = os.path.basename(report_path)
+        if name not in self.ingested:
+            self.ingested.append(name)
+
+    def ingest_reports(self, pattern=REPORTS_GLOB):
+        """
+        Add the outcomes of every report not ingested yet, oldest first
+
+        Returns:
+            int: Number of reports ingested
+        """
+        # Report names end in _YYYYMMDD_HHMMSS.html, so sort on the timestamp across report kinds
+        paths = sorted(glob.glob(pattern), key=lambda path: os.path.basename(path)[-20:])
+        count = 0
+        for path in paths:
+            name = os.path.basename(path)
+            if name in self.ingested:
+                continue
+            try:
+                outcomes = parse_report(path)
+            except OSError as e:
+                print(f"Could not read report {path}: {e}")
+                continue
+            for scenario_id, status in outcomes.items():
+                self.record(scenario_id, status, name)
+            self.mark_ingested(path)
+            count += 1
+        return count
+
+    def priority(self, scenario_id):
+        """
+        Recency-weighted failure score: the newest outcome counts fully, each older one DECAY times less
+
+        Returns:
+            float: 0 for scenarios that always passed or were never run
+        """
+        samples = self.scenarios.get(scenario_id, [])
+        return sum(STATUS_WEIGHTS.get(sample["status"], 0.0) * DECAY ** age
+                   for age, sample in enumerate(reversed(samples)))
+
+    def summary(self, scenario_id):
+        """Recent outcomes as a short string, newest last, e.g. "PPFPF" """
+        return "".join(sample["status"][0] for sample in self.scenarios.get(scenario_id, []))
+
+    def save(self):
+        """Write the history back to disk"""
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({"scenarios": self.scenarios, "ingested": self.ingested},
+                      f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def order_failed_first(scenario_ids, history):
+    """
+    Scenario ids with the highest failure score first; ties keep their order
+
+    Returns:
+        list: Reordered scenario ids
+    """
+    return sorted(scenario_ids, key=lambda scenario_id: -history.priority(scenario_id))
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+"""
+Remote WebDriver Nodes
+远程节点 - Selenium Grid / standalone 节点的容量与健康检查
+
+Describes the remote WebDriver endpoints the parallel runner may use. A node
+is given on the command line as URL or URL#SLOTS:
+
+    http://box1:4444#4      Selenium standalone or Grid hub, at most 4 sessions
+    http://box2:4444        slot count read from the node's /status
+
+Health checks use the W3C /status endpoint ("value.ready").
+
+To try it on one machine, start two standalone nodes:
+    docker run -d -p 4444:4444 --shm-size=2g selenium/standalone-chrome
+    docker run -d -p 4445:4444 --shm-size=2g selenium/standalone-chrome
+"""
+
+import json
+import urllib.request
+
+HEALTH_TIMEOUT = 5
+
+
+class GridNode:
+    """A remote WebDriver endpoint and the number of sessions it may run at once"""
+
+    def __init__(self, url, slots=None):
+        self.url = url.rstrip("/")
+        self.slots = slots
+        self.ready = False
+        self.message = ""
+
+    def __repr__(self):
+        return f"GridNode({self.url!r}, slots={self.slots})"
+
+
+def parse_node_spec(spec):
+    """Parse "URL" or "URL#SLOTS" into a GridNode"""
+    url, _, slots = spec.partition("#")
+    if slots and (not slots.isdigit() or int(slots) < 1):
+        raise ValueError(f"Invalid slot count in node spec '{spec}'")
+    return GridNode(url, int(slots) if slots else None)
+
+
+def check_node(url, timeout=HEALTH_TIMEOUT):
+    """
+    Query a node's /status endpoint
+
+    Args:
+        url: Node or hub URL
+        timeout: Seconds to wait for the response
+
+    Returns:
+        tuple: (ready bool, message str, slot count or None when the node does not report it)
+    """
+    try:
+        with urllib.request.urlopen(f"{url.rstrip('/')}/status", timeout=timeout) as response:
+            value = json.loads(response.read().decode('utf-8')).get("value", {})
+    except Exception as e:
+        return False, f"unreachable: {e}", None
+
+    # Grid 4 hubs and standalone nodes list their slots; Grid 3 hubs do not
+    slots = None
+    if value.get("nodes"):
+        slots = sum(len(node.get("slots", [])) for node in value["nodes"]
+                    if node.get("availability", "UP") == "UP") or None
+    return bool(value.get("ready")), value.get("message", ""), slots
+
+
+def check_nodes(nodes):
+    """
+    Run health checks on all nodes, filling in ready/message and missing slot counts
+
+    Returns:
+        list: The nodes that are ready to accept sessions
+    """
+    healthy = []
+    for node in nodes:
+        node.ready, node.message, reported_slots = check_node(node.url)
+        if node.slots is None:
+            node.slots = reported_slots or 1
+        status = "ready" if node.ready else "NOT READY"
+        print(f"Node {node.url}: {status}, {node.slots} slot(s) {f'- {node.message}' if node.message else ''}")
+        if node.ready:
+            healthy.append(node)
+    return healthy
+
+
+def assign_workers(nodes, workers):
+    """
+    Spread workers over node slots, one node at a time in round-robin order
+
+    Args:
+        nodes: Healthy GridNodes
+        workers: Number of workers to place (capped at the total slot count)
+
+    Returns:
+        list: Node URL for each worker
+    """
+    assignment = []
+    for slot_index in range(max((node.slots for node in nodes), default=0)):
+        for node in nodes:
+            if slot_index < node.slots:
+                assignment.append(node.url)
+    return assignment[:workers]
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+
+"""
+HAR Recorder
+HAR 网络记录 - 从 Chrome 网络事件为每个场景生成压缩 HAR 文件
+
+When a payment flow is slow, the step timings do not tell which backend
+call was slow. With --har (run_all_tests.py, parallel_runner.py) the worker
+browsers are started with Chrome's performance log (goog:loggingPrefs), which
+carries the CDP Network events, and every scenario gets a HAR 1.2 file built
+from them:
+
+    Network.requestWillBeSent   -> request, start time, redirects
+    Network.responseReceived    -> status, headers, MIME type, ResourceTiming
+    Network.loadingFinished     -> transfer size, end time
+    Network.loadingFailed       -> error (status 0)
+
+Response bodies are skipped unless include_bodies is set (--har-bodies); then
+the JSON and text responses still held by the browser are added at the end
+of the scenario. Only the four Network events are kept while parsing the
+log, so memory grows with the number of requests, not with the log.
+
+The HAR is written gzipped next to the report, as
+reports/<report>_har/<scenario>.har.gz, and linked from the scenario in the
+HTML and JSON reports. Open it with any HAR viewer (Chrome DevTools accepts
+the unpacked file).
+
+The performance log is shared by all tabs of a browser, so HAR capture needs
+--tabs 1.
+"""
+
+import gzip
+import json
+import os
+from datetime import datetime, timezone
+from urllib.parse import parse_qsl, urlsplit
+
+NETWORK_EVENTS = {"Network.requestWillBeSent", "Network.responseReceived", "Network.loadingFinished",
+                  "Network.loadingFailed"}
+
+# Response MIME types whose bodies are kept with include_bodies
+BODY_MIME_TYPES = ("json", "text/", "javascript", "xml")
+
+
+def enable_performance_log(chrome_options):
+    """Ask chromedriver for the Network events of the performance log"""
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    chrome_options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+
+def _iso(epoch_seconds):
+    return datetime.fromtimestamp(epoch_seconds, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _headers(headers):
+    return [{"name": name, "value": str(value)} for name, value in (headers or {}).items()]
+
+
+def _query_string(url):
+    return [{"name": name, "value": value} for name, value in parse_qsl(urlsplit(url).query, keep_blank_values=True)]
+
+
+def _span(timing, start, end):
+    if timing.get(start, -1) < 0 or timing.get(end, -1) < 0:
+        return -1
+    return round(timing[end] - timing[start], 3)
+
+
+class HarRecorder:
+    """Builds one HAR per scenario from a driver's performance log"""
+
+    def __init__(self, driver, directory, include_bodies=False):
+        """
+        Args:
+            driver: WebDriver started with enable_performance_log()
+            directory: Where the scenarios' .har.gz files are written
+            include_bodies: Add the JSON and text response bodies
+        """
+        self.driver = driver
+        self.directory = directory
+        self.include_bodies = include_bodies
+        self.entries = {}     # requestId -> entry in progress
+        self.finished = []    # entries in request order
+
+    def _read_log(self):
+        try:
+            return self.driver.get_log("performance")
+        except Exception as e:
+            print(f"Could not read the performance log: {str(e)}")
+            return []
+
+    def begin(self):
+        """Start a new scenario: events logged before now are dropped"""
+        self._read_log()
+        self.entries = {}
+        self.finished = []
+
+    def _start_entry(self, params):
+        request = params["request"]
+        url = request["url"] + request.get("urlFragment", "")
+        post_data = request.get("postData")
+        entry = {
+            "startedDateTime": _iso(params.get("wallTime") or 0),
+            "time": 0,
+            "request": {"method": request["method"], "url": url, "httpVersion": "",
+                        "headers": _headers(request.get("headers")), "queryString": _query_string(url),
+                        "cookies": [], "headersSize": -1, "bodySize": len(post_data) if post_data else 0},
+            "response": {"status": 0, "statusText": "", "httpVersion": "", "headers": [], "cookies": [],
+                         "content": {"size": 0, "mimeType": ""}, "redirectURL": "", "headersSize": -1,
+                         "bodySize": -1},
+            "cache": {},
+            "timings": {"send": 0, "wait": 0, "receive": 0},
+            "_requestId": params["requestId"],
+            "_resourceType": params.get("type", ""),
+            "_startTimestamp": params["timestamp"],
+        }
+        if post_data and self.include_bodies:
+            entry["request"]["postData"] = {"mimeType": request.get("headers", {}).get("Content-Type", ""),
+                                            "text": post_data}
+        self.entries[params["requestId"]] = entry
+        self.finished.append(entry)
+
+    def _set_response(self, entry, response):
+        entry["response"].update(
+            status=response.get("status", 0), statusText=response.get("statusText", ""),
+            httpVersion=response.get("protocol", ""), headers=_headers(response.get("headers")),
+            redirectURL=(response.get("headers") or {}).get("Location", ""))
+        entry["response"]["content"]["mimeType"] = response.get("mimeType", "")
+        entry["request"]["httpVersion"] = response.get("protocol", "")
+        if response.get("remoteIPAddress"):
+            entry["serverIPAddress"] = response["remoteIPAddress"]
+        timing = response.get("timing")
+        if timing:
+            entry["_timing"] = timing
+
+    def _finish_entry(self, entry, end_timestamp, size=None):
+        timing = entry.pop("_timing", None)
+        total = round((end_timestamp - entry["_startTimestamp"]) * 1000.0, 3)
+        if timing:
+            starts = [timing[name] for name in ("dnsStart", "connectStart", "sendStart") if timing.get(name, -1) >= 0]
+            headers_end = timing.get("receiveHeadersEnd", 0)
+            queued = (timing["requestTime"] - entry["_startTimestamp"]) * 1000.0
+            entry["timings"] = {
+                "blocked": round(max(queued, 0) + (starts[0] if starts else 0), 3),
+                "dns": _span(timing, "dnsStart", "dnsEnd"),
+                "connect": _span(timing, "connectStart", "connectEnd"),
+                "ssl": _span(timing, "sslStart", "sslEnd"),
+                "send": max(_span(timing, "sendStart", "sendEnd"), 0),
+                "wait": round(max(headers_end - timing.get("sendEnd", 0), 0), 3),
+                "receive": round(max((end_timestamp - timing["requestTime"]) * 1000.0 - headers_end, 0), 3),
+            }
+            total = sum(value for name, value in entry["timings"].items() if value > 0 and name != "ssl")
+        else:
+            entry["timings"] = {"send": 0, "wait": max(total, 0), "receive": 0}
+        entry["time"] = round(max(total, 0), 3)
+        if size is not None:
+            entry["response"]["bodySize"] = size
+            entry["response"]["_transferSize"] = size
+
+    def _handle(self, method, params):
+        request_id = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            previous = self.entries.get(request_id)
+            if previous is not None and params.get("redirectResponse"):
+                self._set_response(previous, params["redirectResponse"])
+                self._finish_entry(previous, params["timestamp"])
+            self._start_entry(params)
+            return
+        entry = self.entries.get(request_id)
+        if entry is None:
+            return
+        if method == "Network.responseReceived":
+            self._set_response(entry, params["response"])
+        elif method == "Network.loadingFinished":
+            self._finish_entry(entry, params["timestamp"], params.get("encodedDataLength"))
+            del self.entries[request_id]
+        elif method == "Network.loadingFailed":
+            entry["response"]["_error"] = params.get("errorText", "")
+            self._finish_entry(entry, params["timestamp"])
+            del self.entries[request_id]
+
+    def _add_bodies(self):
+        execute_cdp = getattr(self.driver, "execute_cdp_cmd", None)
+        if execute_cdp is None:
+            return
+        for entry in self.finished:
+            content = entry["response"]["content"]
+            if not any(kind in content["mimeType"] for kind in BODY_MIME_TYPES) \
+                    or 300 <= entry["response"]["status"] < 400:
+                continue
+            try:
+                body = execute_cdp("Network.getResponseBody", {"requestId": entry["_requestId"]})
+            except Exception:
+                continue  # Evicted from the browser's buffer, or a redirect
+            content["text"] = body["body"]
+            content["size"] = len(body["body"])
+            if body.get("base64Encoded"):
+                content["encoding"] = "base64"
+
+    def har(self, title=""):
+        """
+        HAR 1.2 document of the scenario so far
+
+        Requests still in flight are included without a response end.
+        """
+        for entry in self._read_log():
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            if message.get("method") in NETWORK_EVENTS:
+                self._handle(message["method"], message.get("params", {}))
+        if self.include_bodies:
+            self._add_bodies()
+        entries = []
+        for entry in self.finished:
+            entry = {name: value for name, value in entry.items()
+                     if name not in ("_requestId", "_startTimestamp", "_timing")}
+            entry["pageref"] = "page_1"
+            entries.append(entry)
+        started = entries[0]["startedDateTime"] if entries else _iso(datetime.now().timestamp())
+        return {"log": {
+            "version": "1.2",
+            "creator": {"name": "ShenLong har_recorder", "version": "1.0"},
+            "pages": [{"startedDateTime": started, "id": "page_1", "title": title, "pageTimings": {}}],
+            "entries": entries,
+        }}
+
+    def write(self, key):
+        """
+        Write the scenario's HAR as <directory>/<key>.har.gz
+
+        Returns:
+            str: Path of the file, or None if it could not be written
+        """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"{key}.har.gz")
+            with gzip.open(path, 'wt', encoding='utf-8') as f:
+                json.dump(self.har(title=key), f, ensure_ascii=False)
+        except OSError as e:
+            print(f"Could not write HAR for {key}: {e}")
+            return None
+        finally:
+            self.entries = {}
+            self.finished = []
+        return path
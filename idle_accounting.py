@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+
+"""
+Idle-Time Accounting
+空闲时间统计 - 场景时间分为固定 sleep、等待元素、浏览器操作和其他
+
+install() wraps, process-wide:
+
+    time.sleep                         -> "sleep"
+    WebDriverWait.until / until_not    -> "wait"
+    WebDriver.execute (every command)  -> "action"
+
+Only the outermost call is counted, so the polls and sleeps inside a
+WebDriverWait are wait time and the commands a helper sends while sleeping
+between them are not counted twice. Time goes to the scenario running on the
+calling thread (begin()/end()), which keeps the tabs of a TabExecutor apart;
+calls made outside a scenario are ignored. The rest of a scenario's wall time
+is "other": Python, reporting, waiting for the login gate or the tab lock.
+
+Every sleep is also recorded by call site (file:line of the time.sleep call),
+so the report can list the sleeps that cost the most across the suite.
+
+    idle_accounting.begin("dynamic_advanced.alipay")
+    ...run the scenario...
+    breakdown = idle_accounting.end()   # {"sleep": 41.0, "wait": 12.3, "action": 6.1, "calls": {...},
+                                        #  "sleep_sites": {"CompleteWebsitePurchase完整官网.py:1187": [30.0, 1]}}
+
+    python idle_accounting.py reports/package6_comprehensive_test_20240115_143025.jsonl
+"""
+
+import argparse
+import functools
+import os
+import sys
+import threading
+import time
+
+CATEGORIES = ("sleep", "wait", "action")
+
+# Rows of the "most expensive sleep call sites" table
+TOP_SLEEP_SITES = 20
+
+_state = threading.local()
+_install_lock = threading.Lock()
+_installed = False
+
+
+class ScenarioAccount:
+    """Seconds and calls per category for one running scenario"""
+
+    def __init__(self, key):
+        self.key = key
+        self.seconds = dict.fromkeys(CATEGORIES, 0.0)
+        self.calls = dict.fromkeys(CATEGORIES, 0)
+        self.sleep_sites = {}   # "file:line" -> [seconds, calls]
+
+    def add(self, category, seconds, site=None):
+        self.seconds[category] += seconds
+        self.calls[category] += 1
+        if site:
+            entry = self.sleep_sites.setdefault(site, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += 1
+
+    def as_dict(self):
+        result = {category: round(seconds, 3) for category, seconds in self.seconds.items()}
+        result["calls"] = dict(self.calls)
+        result["sleep_sites"] = {site: [round(seconds, 3), calls] for site, (seconds, calls) in self.sleep_sites.items()}
+        return result
+
+
+def _call_site(frame):
+    return f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno}"
+
+
+def _timed(category, func):
+    """Wrap func so its outermost calls inside a scenario are added to category"""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        account = getattr(_state, "account", None)
+        if account is None or getattr(_state, "busy", False):
+            return func(*args, **kwargs)
+        site = _call_site(sys._getframe(1)) if category == "sleep" else None
+        _state.busy = True
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _state.busy = False
+            account.add(category, time.perf_counter() - start, site)
+
+    return wrapper
+
+
+def install():
+    """Wrap time.sleep, WebDriverWait.until/until_not and WebDriver.execute (once per process)"""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        time.sleep = _timed("sleep", time.sleep)
+        try:
+            from selenium.webdriver.remote.webdriver import WebDriver
+            from selenium.webdriver.support.ui import WebDriverWait
+        except ImportError:
+            pass  # Only sleeps can be accounted without Selenium
+        else:
+            WebDriverWait.until = _timed("wait", WebDriverWait.until)
+            WebDriverWait.until_not = _timed("wait", WebDriverWait.until_not)
+            WebDriver.execute = _timed("action", WebDriver.execute)
+        _installed = True
+
+
+def begin(key):
+    """Start accounting the calling thread's time to scenario key"""
+    install()
+    _state.account = ScenarioAccount(key)
+    _state.busy = False
+
+
+def end():
+    """
+    Stop accounting the calling thread's scenario
+
+    Returns:
+        dict: Seconds per category, "calls" per category and "sleep_sites"; None if begin() was not called
+    """
+    account = getattr(_state, "account", None)
+    _state.account = None
+    return account.as_dict() if account else None
+
+
+def breakdown(idle, duration):
+    """
+    Seconds and percent of duration per category, plus "other" for the rest
+
+    Returns:
+        dict: category -> (seconds, percent) for sleep, wait, action and other
+    """
+    duration = duration or 0.0
+    result = {category: idle.get(category, 0.0) for category in CATEGORIES}
+    result["other"] = max(duration - sum(result.values()), 0.0)
+    total = max(duration, sum(result.values())) or 1.0
+    return {category: (round(seconds, 3), round(100.0 * seconds / total, 1)) for category, seconds in result.items()}
+
+
+def suite_breakdown(scenarios):
+    """
+    Idle-time accounting of a suite from its scenario summaries (see report_stream.summarize_events)
+
+    Returns:
+        dict: {"scenarios": number accounted, "duration", "categories": breakdown(),
+               "sleep_sites": [[site, seconds, calls], ...] most expensive first, TOP_SLEEP_SITES at most}
+        None when no scenario was accounted
+    """
+    accounted = [entry for entry in scenarios if entry.get("idle")]
+    if not accounted:
+        return None
+    totals = dict.fromkeys(CATEGORIES, 0.0)
+    sites = {}
+    duration = 0.0
+    for entry in accounted:
+        duration += entry["duration"] or 0.0
+        for category in CATEGORIES:
+            totals[category] += entry["idle"].get(category, 0.0)
+        for site, (seconds, calls) in entry["idle"].get("sleep_sites", {}).items():
+            site_total = sites.setdefault(site, [site, 0.0, 0])
+            site_total[1] += seconds
+            site_total[2] += calls
+    top = sorted(sites.values(), key=lambda site: -site[1])[:TOP_SLEEP_SITES]
+    return {"scenarios": len(accounted), "duration": round(duration, 3),
+            "categories": breakdown(totals, duration),
+            "sleep_sites": [[site, round(seconds, 3), calls] for site, seconds, calls in top]}
+
+
+def breakdown_text(suite_idle):
+    """One console line of a suite_breakdown(), e.g. "sleep 1204.0s (52.1%), wait ..." """
+    return ", ".join(f"{category} {seconds:.1f}s ({percent:.1f}%)"
+                     for category, (seconds, percent) in suite_idle["categories"].items())
+
+
+def main():
+    from report_stream import summarize_events
+
+    parser = argparse.ArgumentParser(description="Sleep / wait / action breakdown of ShenLong test runs")
+    parser.add_argument("events", nargs="+", help="Report event files (.jsonl)")
+    args = parser.parse_args()
+
+    for events_path in args.events:
+        suite = summarize_events(events_path)
+        print("=" * 80)
+        print(f"{suite['title']} ({os.path.basename(events_path)})")
+        print("=" * 80)
+        if not suite.get("idle"):
+            print("No idle-time accounting in this event file")
+            continue
+        for entry in suite["scenarios"]:
+            if entry.get("idle"):
+                parts = breakdown(entry["idle"], entry["duration"])
+                print(f"{entry['key']:<45} {entry['duration'] or 0:>8.1f}s  "
+                      + "  ".join(f"{category} {percent:>5.1f}%" for category, (_, percent) in parts.items()))
+        print(f"\nSuite: {breakdown_text(suite['idle'])}")
+        print(f"\nTop {TOP_SLEEP_SITES} sleep call sites:")
+        for site, seconds, calls in suite["idle"]["sleep_sites"]:
+            print(f"  {site:<55} {seconds:>8.1f}s  {calls:>4} call(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,385 @@
+# -*- coding: utf-8 -*-
+
+"""
+Live Progress Dashboard
+实时进度面板 - 运行期间通过 Server-Sent Events 推送场景与步骤进度
+
+A full run of both suites takes tens of minutes. With --dashboard
+(run_all_tests.py, parallel_runner.py) the runner starts a small HTTP server
+(standard library only) in the main process, which already receives every
+worker's events over the event queue, so parallel runs need nothing extra:
+
+    http://127.0.0.1:8765/          the page
+    http://127.0.0.1:8765/events    Server-Sent Events: "step" for every step,
+                                    "state" (at most once per STATE_INTERVAL)
+    http://127.0.0.1:8765/state     the current state as JSON
+
+The page shows per worker the scenario it is running, its last step and how
+long it has run against its estimate, the completed scenarios with their
+results and durations, a live step log, the elapsed time and an ETA. The ETA
+adds up the estimates (median of previous durations, see scenario_history.py)
+of the scenarios not started yet and the rest of the estimates of the running
+ones, divided by the task slots (workers x tabs) of their suite.
+
+    dashboard = LiveDashboard(port=8765)
+    dashboard.start()
+    dashboard.plan("website", keys, slots=4)
+    dashboard.publish("website", {"type": "scenario_start", "worker": 1, "scenario": key})
+"""
+
+import json
+import queue
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from scenario_history import DEFAULT_ESTIMATE, DurationHistory
+
+DEFAULT_PORT = 8765
+
+# Seconds between two "state" messages while events keep arriving
+STATE_INTERVAL = 1.0
+
+# Seconds between keep-alive comments on an idle event stream
+KEEPALIVE_INTERVAL = 15.0
+
+# Steps kept for the live log (and sent to a page when it connects)
+RECENT_STEPS = 200
+
+# Messages queued for one page before it is considered gone
+SUBSCRIBER_BACKLOG = 1000
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>ShenLong Test Run - Live</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }
+        .header { background-color: #2c3e50; color: white; padding: 15px 20px; border-radius: 5px; }
+        .header h1 { margin: 0 0 8px 0; font-size: 22px; }
+        .stats span { margin-right: 25px; }
+        .summary { background-color: white; padding: 15px 20px; margin: 15px 0; border-radius: 5px;
+                   box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+        table { border-collapse: collapse; font-size: 13px; width: 100%; }
+        td, th { border: 1px solid #ddd; padding: 4px 8px; text-align: left; }
+        .PASS { color: #27ae60; font-weight: bold; }
+        .FAIL { color: #e74c3c; font-weight: bold; }
+        .SKIP { color: #7f8c8d; font-weight: bold; }
+        .running { color: #2980b9; font-weight: bold; }
+        .over { color: #e67e22; font-weight: bold; }
+        .bar { background: #ecf0f1; height: 10px; border-radius: 5px; overflow: hidden; }
+        .bar div { background: #27ae60; height: 10px; }
+        #log { font-family: monospace; font-size: 12px; max-height: 300px; overflow-y: auto; }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>ShenLong Test Run <span id="finished"></span></h1>
+        <div class="stats">
+            <span id="progress">connecting...</span><span id="elapsed"></span><span id="eta"></span>
+        </div>
+        <div class="bar"><div id="bar" style="width:0%"></div></div>
+    </div>
+    <div class="summary"><h2>Workers</h2><table id="workers"></table></div>
+    <div class="summary"><h2>Completed</h2><table id="completed"></table></div>
+    <div class="summary"><h2>Steps</h2><div id="log"></div></div>
+<script>
+let state = null;
+let skew = 0;
+const esc = text => String(text == null ? "" : text).replace(/[&<>"]/g,
+    c => ({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"}[c]));
+const clock = seconds => {
+    seconds = Math.max(0, Math.round(seconds));
+    const h = Math.floor(seconds / 3600), m = Math.floor(seconds % 3600 / 60), s = seconds % 60;
+    return (h ? h + "h " : "") + (h || m ? m + "m " : "") + s + "s";
+};
+const now = () => Date.now() / 1000 - skew;
+function logStep(step) {
+    const log = document.getElementById("log");
+    const line = document.createElement("div");
+    const time = new Date(step.at * 1000).toLocaleTimeString();
+    line.innerHTML = `${time} <span class="${esc(step.status)}">[${esc(step.status)}]</span> ` +
+        `${esc(step.worker || "-")} ${esc(step.scenario || "")} - ${esc(step.step)}` +
+        (step.message ? `: ${esc(step.message)}` : "");
+    log.prepend(line);
+    while (log.childNodes.length > 200) log.removeChild(log.lastChild);
+}
+function render() {
+    if (!state) return;
+    const t = now();
+    const done = state.counts.PASS + state.counts.FAIL + state.counts.SKIP;
+    document.getElementById("progress").textContent =
+        `${done}/${state.total} done - ${state.counts.PASS} passed, ${state.counts.FAIL} failed, ` +
+        `${state.counts.SKIP} skipped, ${state.counts.running} running`;
+    document.getElementById("elapsed").textContent = "Elapsed: " + clock((state.ended || t) - state.started);
+    document.getElementById("eta").textContent = state.finished ? "" :
+        "ETA: " + clock(state.remaining - (t - state.now)) + " (estimated)";
+    document.getElementById("finished").textContent = state.finished ? "- finished" : "";
+    document.getElementById("bar").style.width = (state.total ? 100 * done / state.total : 0) + "%";
+    document.getElementById("workers").innerHTML =
+        "<tr><th>Worker</th><th>Scenario</th><th>Running</th><th>Estimate</th><th>Last step</th><th>Done</th></tr>" +
+        state.workers.map(w => {
+            const running = w.scenario ? t - w.started : 0;
+            const over = w.scenario && running > w.estimate ? "over" : "running";
+            return `<tr><td>${esc(w.worker)}</td><td class="running">${esc(w.scenario || "-")}</td>` +
+                `<td class="${over}">${w.scenario ? clock(running) : "-"}</td>` +
+                `<td>${w.scenario ? clock(w.estimate) : "-"}</td><td>${esc(w.step || "-")}</td>` +
+                `<td>${w.done} (<span class="FAIL">${w.failed}</span> failed)</td></tr>`;
+        }).join("");
+    document.getElementById("completed").innerHTML =
+        "<tr><th>Scenario</th><th>Result</th><th>Duration</th><th>Estimate</th><th>Worker</th><th>Message</th></tr>" +
+        state.completed.map(s => `<tr><td>${esc(s.id)}</td><td class="${s.status}">${s.status}</td>` +
+            `<td>${s.duration != null ? clock(s.duration) : "-"}</td><td>${clock(s.estimate)}</td>` +
+            `<td>${esc(s.worker || "-")}</td><td>${esc(s.message)}</td></tr>`).join("");
+}
+const source = new EventSource("/events");
+source.addEventListener("state", event => {
+    const first = state === null;
+    state = JSON.parse(event.data);
+    skew = Date.now() / 1000 - state.now;
+    if (first) state.steps.forEach(logStep);
+    render();
+});
+source.addEventListener("step", event => logStep(JSON.parse(event.data)));
+setInterval(render, 1000);
+</script>
+</body>
+</html>
+"""
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass  # Keep the runner's console output readable
+
+    def _send(self, body, content_type):
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        dashboard = self.server.dashboard
+        if self.path == "/":
+            self._send(PAGE, "text/html; charset=utf-8")
+        elif self.path == "/state":
+            self._send(json.dumps(dashboard.snapshot(), ensure_ascii=False), "application/json; charset=utf-8")
+        elif self.path == "/events":
+            self._stream(dashboard)
+        else:
+            self.send_error(404)
+
+    def _stream(self, dashboard):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        subscriber = dashboard.subscribe()
+        try:
+            while True:
+                try:
+                    message = subscriber.get(timeout=KEEPALIVE_INTERVAL)
+                except queue.Empty:
+                    message = ": keepalive\n\n"
+                if message is None:
+                    break
+                self.wfile.write(message.encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            dashboard.unsubscribe(subscriber)
+
+
+def _message(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+class LiveDashboard:
+    """Progress of a run in the main process, served over HTTP with Server-Sent Events"""
+
+    def __init__(self, port=DEFAULT_PORT, host="127.0.0.1", history=None):
+        """
+        Args:
+            port: TCP port to listen on
+            host: Interface to bind ("0.0.0.0" to watch from another machine)
+            history: DurationHistory for the estimates (default: the one under reports/)
+        """
+        self.port = port
+        self.host = host
+        self.history = history or DurationHistory()
+        self.lock = threading.Lock()
+        self.scenarios = {}    # "suite::key" -> scenario state, in plan order
+        self.slots = {}        # suite -> task slots (workers x tabs)
+        self.steps = deque(maxlen=RECENT_STEPS)
+        self.subscribers = set()
+        self.started = time.time()
+        self.ended = None
+        self.dirty = False
+        self.server = None
+
+    @property
+    def url(self):
+        return f"http://{'127.0.0.1' if self.host == '0.0.0.0' else self.host}:{self.port}/"
+
+    def start(self):
+        """
+        Start serving in background threads
+
+        Returns:
+            str: URL of the page, or None if the port could not be bound (the run goes on without it)
+        """
+        try:
+            self.server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        except OSError as e:
+            print(f"Could not start the live dashboard on {self.host}:{self.port}: {e}")
+            return None
+        self.server.daemon_threads = True
+        self.server.dashboard = self
+        threading.Thread(target=self.server.serve_forever, name="dashboard-http", daemon=True).start()
+        threading.Thread(target=self._push_state, name="dashboard-state", daemon=True).start()
+        print(f"Live dashboard: {self.url}")
+        return self.url
+
+    def stop(self):
+        """Close the event streams and stop the server"""
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            subscriber.put(None)
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def subscribe(self):
+        subscriber = queue.Queue(maxsize=SUBSCRIBER_BACKLOG)
+        with self.lock:
+            subscriber.put(_message("state", self._snapshot(steps=True)))
+            self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def _broadcast(self, message):
+        """Queue message for every page (lock held); pages that stopped reading are dropped"""
+        for subscriber in list(self.subscribers):
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                self.subscribers.discard(subscriber)
+
+    def _push_state(self):
+        while self.server is not None:
+            time.sleep(STATE_INTERVAL)
+            with self.lock:
+                if self.dirty and self.subscribers:
+                    self._broadcast(_message("state", self._snapshot()))
+                self.dirty = False
+
+    def plan(self, suite, keys, slots=1):
+        """Add the scenarios a suite is going to run (again for a suite already planned: only slots change)"""
+        with self.lock:
+            self.slots[suite] = max(1, slots)
+            for key in keys:
+                self._scenario(suite, key)
+            self.dirty = True
+
+    def _scenario(self, suite, key):
+        scenario_id = f"{suite}::{key}"
+        if scenario_id not in self.scenarios:
+            self.slots.setdefault(suite, 1)
+            self.scenarios[scenario_id] = {
+                "id": scenario_id, "suite": suite, "key": key, "status": "pending", "worker": None,
+                "started": None, "duration": None, "ended": None, "step": None, "message": "",
+                "estimate": self.history.estimate(f"{suite}:{key}", default=DEFAULT_ESTIMATE)}
+        return self.scenarios[scenario_id]
+
+    def publish(self, suite, event):
+        """
+        Update the state from a runner event (the dicts workers put on parallel_runner's event queue)
+
+        Handled: scenario_start, step, scenario_end (with "success", optional "duration",
+        "skipped" reason and "message") and worker_error; other events are ignored.
+        """
+        now = time.time()
+        worker = f"{suite}:{event['worker']}" if event.get("worker") is not None else None
+        with self.lock:
+            if event["type"] == "scenario_start":
+                scenario = self._scenario(suite, event["scenario"])
+                scenario.update(status="running", worker=worker, started=event.get("at") or now, step=None)
+            elif event["type"] == "scenario_end":
+                scenario = self._scenario(suite, event["scenario"])
+                if scenario["status"] in ("PASS", "FAIL", "SKIP"):
+                    return   # A scenario only finishes once
+                status = "SKIP" if event.get("skipped") else "PASS" if event["success"] else "FAIL"
+                duration = event.get("duration")
+                if duration is None and scenario["started"] is not None:
+                    duration = now - scenario["started"]
+                scenario.update(status=status, duration=duration, ended=now, worker=worker or scenario["worker"],
+                                message=event.get("skipped") or event.get("message") or scenario["message"])
+            elif event["type"] in ("step", "worker_error"):
+                step = {"at": event.get("at") or now, "worker": worker, "scenario": event.get("scenario"),
+                        "step": event.get("step_name") or "Worker Error",
+                        "status": event.get("status", "FAIL"), "message": str(event.get("message") or "")[:300]}
+                if step["scenario"]:
+                    scenario = self._scenario(suite, step["scenario"])
+                    scenario["step"] = step["step"]
+                    if step["status"] == "FAIL" and not scenario["message"]:
+                        scenario["message"] = f"{step['step']}: {step['message']}"[:300]
+                self.steps.append(step)
+                self._broadcast(_message("step", step))
+            else:
+                return
+            self.dirty = True
+
+    def finish(self):
+        """Mark the run as finished (the page stops counting and shows the final state)"""
+        with self.lock:
+            self.ended = time.time()
+            self._broadcast(_message("state", self._snapshot()))
+
+    def _snapshot(self, steps=False):
+        now = time.time()
+        counts = {"pending": 0, "running": 0, "PASS": 0, "FAIL": 0, "SKIP": 0}
+        remaining = {}   # suite -> estimated seconds of work left
+        workers = {}
+        for scenario in self.scenarios.values():
+            counts[scenario["status"]] += 1
+            if scenario["status"] == "pending":
+                remaining[scenario["suite"]] = remaining.get(scenario["suite"], 0.0) + scenario["estimate"]
+            elif scenario["status"] == "running":
+                left = max(scenario["estimate"] - (now - scenario["started"]), 0.0)
+                remaining[scenario["suite"]] = remaining.get(scenario["suite"], 0.0) + left
+            if scenario["worker"]:
+                worker = workers.setdefault(scenario["worker"], {
+                    "worker": scenario["worker"], "scenario": None, "started": None, "estimate": None,
+                    "step": None, "done": 0, "failed": 0})
+                if scenario["status"] == "running":
+                    worker.update(scenario=scenario["key"], started=scenario["started"],
+                                  estimate=scenario["estimate"], step=scenario["step"])
+                else:
+                    worker["done"] += 1
+                    worker["failed"] += scenario["status"] == "FAIL"
+        completed = sorted((scenario for scenario in self.scenarios.values()
+                            if scenario["status"] in ("PASS", "FAIL", "SKIP")), key=lambda scenario: -scenario["ended"])
+        return {
+            "now": now, "started": self.started, "ended": self.ended, "finished": self.ended is not None,
+            "total": len(self.scenarios), "counts": counts,
+            "remaining": round(sum(seconds / self.slots.get(suite, 1) for suite, seconds in remaining.items()), 1),
+            "workers": sorted(workers.values(), key=lambda worker: worker["worker"]),
+            "completed": [{name: scenario[name] for name in ("id", "status", "duration", "estimate", "worker", "message")}
+                          for scenario in completed],
+            "steps": list(self.steps) if steps else [],
+        }
+
+    def snapshot(self):
+        """Current state of the run as a JSON-ready dict, with the recent steps"""
+        with self.lock:
+            return self._snapshot(steps=True)
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+
+"""
+Page Performance Metrics
+页面性能指标 - 每次 driver.get 后采集导航计时、绘制、LCP/CLS 与 CDP 指标
+
+The suites open every important storefront and admin page on each run
+(meal/ip?ipType=N, personalCenter, countManage, client/userDetail, ...),
+which makes them a synthetic performance probe. While a scenario runs,
+WebDriver.get is wrapped and, once the page has loaded, one script reads:
+
+    - Navigation Timing: dns, connect, ttfb, response, dom_interactive,
+      dom_content_loaded, load (ms since navigation start) and transfer_size
+    - Paint Timing: first_paint, first_contentful_paint
+    - lcp (Largest Contentful Paint) and cls (sum of the layout shifts without
+      recent input), read from buffered PerformanceObservers
+
+and, on local Chrome drivers, the CDP Performance.getMetrics counters listed
+in CDP_METRICS. With the "eager" page load strategy (tabs) load may still be
+missing (None). A failed collection never fails the scenario.
+
+The records of each scenario travel with its scenario_end event ("pages"),
+are summarized per page in the HTML report and stored in the pages table of
+the results warehouse, so latency regressions show across runs:
+
+    python results_db.py pages --metric lcp --runs 30
+"""
+
+import functools
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Navigation Timing values recorded for every page visit, in ms
+TIMING_FIELDS = ("dns", "connect", "ttfb", "response", "dom_interactive", "dom_content_loaded", "load",
+                 "first_paint", "first_contentful_paint", "lcp")
+
+# CDP Performance.getMetrics counters kept per visit
+CDP_METRICS = ("Nodes", "Documents", "JSEventListeners", "JSHeapUsedSize", "LayoutCount", "RecalcStyleCount",
+               "LayoutDuration", "RecalcStyleDuration", "ScriptDuration", "TaskDuration")
+
+METRICS_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+const paints = {};
+performance.getEntriesByType('paint').forEach(entry => { paints[entry.name] = entry.startTime; });
+function buffered(type) {
+    try {
+        const observer = new PerformanceObserver(() => {});
+        observer.observe({type: type, buffered: true});
+        const entries = observer.takeRecords();
+        observer.disconnect();
+        return entries;
+    } catch (e) {
+        return [];
+    }
+}
+const lcp = buffered('largest-contentful-paint');
+const shifts = buffered('layout-shift').filter(entry => !entry.hadRecentInput);
+const since = value => (nav && value > 0) ? value : null;
+return {
+    url: location.href,
+    dns: nav ? nav.domainLookupEnd - nav.domainLookupStart : null,
+    connect: nav ? nav.connectEnd - nav.connectStart : null,
+    ttfb: nav ? since(nav.responseStart) : null,
+    response: nav ? nav.responseEnd - nav.responseStart : null,
+    dom_interactive: nav ? since(nav.domInteractive) : null,
+    dom_content_loaded: nav ? since(nav.domContentLoadedEventEnd) : null,
+    load: nav ? since(nav.loadEventEnd) : null,
+    transfer_size: nav ? nav.transferSize : null,
+    first_paint: paints['first-paint'] || null,
+    first_contentful_paint: paints['first-contentful-paint'] || null,
+    lcp: lcp.length ? lcp[lcp.length - 1].startTime : null,
+    cls: shifts.reduce((total, entry) => total + entry.value, 0)
+};
+"""
+
+_state = threading.local()
+_install_lock = threading.Lock()
+_installed = False
+
+
+def page_name(url):
+    """Page of a URL without scheme and host, e.g. "/meal/ip?ipType=0" """
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    if parts.fragment.startswith("/"):
+        path = parts.fragment.split("?")[0]   # Hash-routed single page app
+    return f"{path}?{parts.query}" if parts.query else path
+
+
+def _cdp_metrics(driver):
+    execute_cdp = getattr(driver, "execute_cdp_cmd", None)
+    if execute_cdp is None:
+        return {}   # Remote and tab drivers have no CDP access
+    try:
+        execute_cdp("Performance.enable", {})
+        metrics = execute_cdp("Performance.getMetrics", {})["metrics"]
+    except Exception:
+        return {}
+    return {metric["name"]: metric["value"] for metric in metrics if metric["name"] in CDP_METRICS}
+
+
+def collect(driver, url):
+    """
+    Performance metrics of the page just loaded by driver.get(url)
+
+    Returns:
+        dict: page, url, requested, at, TIMING_FIELDS (ms, rounded), transfer_size, cls, cdp;
+              None when the page could not be read
+    """
+    try:
+        metrics = driver.execute_script(METRICS_SCRIPT)
+    except Exception as e:
+        print(f"Could not read page metrics of {url}: {str(e)}")
+        return None
+    record = {"page": page_name(metrics.get("url") or url), "url": metrics.get("url") or url,
+              "requested": url, "at": time.time()}
+    for field in TIMING_FIELDS:
+        value = metrics.get(field)
+        record[field] = round(value, 1) if value is not None else None
+    record["transfer_size"] = metrics.get("transfer_size")
+    record["cls"] = round(metrics.get("cls") or 0.0, 4)
+    record["cdp"] = _cdp_metrics(driver)
+    return record
+
+
+def _measured(get):
+    @functools.wraps(get)
+    def wrapper(self, url):
+        result = get(self, url)
+        pages = getattr(_state, "pages", None)
+        if pages is not None:
+            record = collect(self, url)
+            if record:
+                pages.append(record)
+        return result
+
+    return wrapper
+
+
+def install():
+    """Wrap WebDriver.get (once per process)"""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        try:
+            from selenium.webdriver.remote.webdriver import WebDriver
+        except ImportError:
+            return
+        WebDriver.get = _measured(WebDriver.get)
+        _installed = True
+
+
+def begin(key):
+    """Record the pages the calling thread's scenario opens"""
+    install()
+    _state.pages = []
+
+
+def end():
+    """
+    Stop recording the calling thread's scenario
+
+    Returns:
+        list: One collect() record per driver.get, in order; None if begin() was not called
+    """
+    pages = getattr(_state, "pages", None)
+    _state.pages = None
+    return pages
+
+
+def _median(values):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    middle = len(ordered) // 2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def suite_pages(scenarios):
+    """
+    Per-page summary of the visits of a suite (see report_stream.summarize_events)
+
+    Returns:
+        list: {"page", "visits", TIMING_FIELDS and "cls": (median, max)} per page, slowest median load first;
+              None when no page was measured
+    """
+    visits = {}
+    for entry in scenarios:
+        for record in entry.get("pages") or []:
+            visits.setdefault(record["page"], []).append(record)
+    if not visits:
+        return None
+    summary = []
+    for page, records in visits.items():
+        row = {"page": page, "visits": len(records)}
+        for field in TIMING_FIELDS + ("cls",):
+            values = [record[field] for record in records if record.get(field) is not None]
+            row[field] = (_median(values), max(values)) if values else (None, None)
+        summary.append(row)
+    return sorted(summary, key=lambda row: -(row["load"][0] or row["dom_content_loaded"][0] or 0))
@@ -0,0 +1,743 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ShenLong IP Parallel Scenario Runner
+并行测试运行器 - 多进程执行官网购买 / 后台测试场景
+
+Runs the scenarios registered in a suite module's SCENARIOS table across
+N worker processes. Every worker owns its own Chrome driver and logs in with the
+account each scenario needs, so workers never share a browser session.
+
+Suite modules provide SCENARIOS, ACCOUNT_LOGINS and TestReporter, and may add:
+    logout_and_switch_account(driver, reporter) - to change accounts in one browser
+    worker_session()  - context manager held for a worker's lifetime (e.g. a user lease)
+    MAX_WORKERS       - upper bound on useful workers for the suite
+    MAX_TABS          - upper bound on concurrent tabs per worker browser
+
+With --tabs N each worker runs N scenarios at once in tabs of its one browser
+(see tab_executor.py). Tabs share cookies, so a worker only switches accounts
+once none of its tabs is still running a scenario on the previous account.
+
+With --node the workers start remote sessions instead of a local Chrome:
+each node (Selenium Grid hub or standalone server) gets at most its slot
+count of workers, nodes are health-checked before the run, and a worker stops
+taking scenarios once its node stops answering (see grid_nodes.py).
+
+Workers send step events back to the main process over a multiprocessing queue,
+where a single TestReporter aggregates them into one HTML report.
+
+Scenarios are dispatched by the main process as their dependencies and
+resources allow (SCENARIO_RULES, see scenario_graph.py), longest dependency
+chain first using the durations recorded by previous runs (see scenario_history.py).
+
+A suite's ENVIRONMENT_URLS are probed before the first browser starts, and a
+circuit breaker watches the run for environment-level failures (see
+circuit_breaker.py); once it trips, the remaining scenarios are skipped.
+
+Usage:
+    python parallel_runner.py --workers 4
+    python parallel_runner.py --suite admin --workers 2
+    python parallel_runner.py --workers 2 --tabs 3
+    python parallel_runner.py --node http://localhost:4444#2 --node http://localhost:4445#2
+"""
+
+import argparse
+import contextlib
+import importlib
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import traceback
+from datetime import datetime
+
+import command_profiler
+import failure_artifacts
+import idle_accounting
+import page_metrics
+import trace_spans
+from circuit_breaker import SKIP_REASON, CircuitBreaker
+from failure_artifacts import ArtifactCollector, artifacts_dir
+from failure_history import FailureHistory
+from grid_nodes import assign_workers, check_node, check_nodes, parse_node_spec
+from live_dashboard import DEFAULT_PORT, LiveDashboard
+from report_stream import StepClock
+from scenario_graph import GraphScheduler, ScenarioGraph
+from scenario_history import DEFAULT_ESTIMATE, DurationHistory, plan_longest_first
+
+# Suites are imported lazily by module name so that every worker process
+# loads its own copy of Selenium and the test helpers
+SUITES = {
+    "website": "CompleteWebsitePurchase完整官网",
+    "admin": "Admin_Panel_Test",
+}
+
+DEFAULT_WORKERS = 4
+
+# Seconds workers get to finish their current step after the circuit breaker trips
+BREAKER_GRACE_PERIOD = 5
+
+# ============================================================================
+# WORKER SIDE - runs inside each child process
+# ============================================================================
+
+class QueueReporter:
+    """TestReporter stand-in that forwards every step to the main process"""
+
+    def __init__(self, event_queue, worker_id, scenario=None, artifacts=None):
+        self.event_queue = event_queue
+        self.worker_id = worker_id
+        self.scenario = scenario
+        self.clock = StepClock()
+        self.artifacts = artifacts  # ArtifactCollector capturing the browser on FAIL steps
+
+    def add_step(self, step_name, status, message="", attempt=None, start_ns=None, category=None):
+        """Send a test step event to the aggregating reporter, timed by this worker's StepClock"""
+        start_ns, end_ns = self.clock.lap(self.scenario, start_ns)
+        self.event_queue.put({
+            "type": "step",
+            "worker": self.worker_id,
+            "scenario": self.scenario,
+            "step_name": step_name,
+            "status": status,
+            "message": message,
+            "attempt": attempt,
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "at": time.time(),
+            "start_ns": start_ns,
+            "end_ns": end_ns,
+            "category": category,
+        })
+        if status == "FAIL" and self.artifacts:
+            self.artifacts.capture(self.scenario, step_name, message)
+
+
+def run_scenario(driver, reporter, func):
+    """
+    Run a single scenario function and normalise its outcome
+
+    Returns:
+        bool: True if the scenario reported success, False otherwise
+    """
+    try:
+        return bool(func(driver, reporter))
+    except Exception as e:
+        reporter.add_step("Scenario Error", "FAIL", f"Unhandled error: {str(e)}")
+        return False
+
+
+def run_cleanup(driver, reporter, cleanup):
+    """Run a scenario's cleanup; failures are reported but do not change the scenario result"""
+    try:
+        cleanup(driver, reporter)
+    except Exception as e:
+        reporter.add_step("Scenario Cleanup", "INFO", f"Cleanup failed: {str(e)}")
+
+
+class AccountGate:
+    """
+    Tracks which account a worker's browser is logged in as
+
+    All tabs of a browser share its cookies. A scenario may only start while the
+    browser is on its account; the account is switched once no tab is using it.
+    """
+
+    def __init__(self, suite):
+        self.suite = suite
+        self.logout = getattr(suite, "logout_and_switch_account", None)
+        self.condition = threading.Condition()
+        self.account = None
+        self.active = 0
+
+    @contextlib.contextmanager
+    def use(self, account, driver, reporter):
+        """
+        Hold the browser on account for the duration of the with-block
+
+        Yields:
+            bool: True if the browser is logged in as account, False if login failed
+        """
+        with self.condition:
+            while self.active and self.account != account:
+                self.condition.wait()
+
+            # Switch the browser session only when the account changes
+            if self.account != account:
+                if self.account is not None and self.logout:
+                    self.logout(driver, reporter)
+                self.account = None
+                if self.suite.ACCOUNT_LOGINS[account](driver, reporter):
+                    self.account = account
+
+            logged_in = self.account == account
+            if logged_in:
+                self.active += 1
+        try:
+            yield logged_in
+        finally:
+            if logged_in:
+                with self.condition:
+                    self.active -= 1
+                    self.condition.notify_all()
+
+
+def worker_main(worker_id, suite_module, task_queue, event_queue, tabs=1, node_url=None, profile_commands=False,
+                har_dir=None, har_bodies=False, artifacts_dir=None, console_log=False, trace_dir=None):
+    """
+    Worker process entry point
+
+    Pulls scenario keys from task_queue until it receives None. The driver is
+    created once per worker and the session is only switched when the next
+    scenario needs a different account. With tabs > 1 the worker runs that many
+    scenarios concurrently, each in its own tab of the same browser. With
+    node_url the browser is a remote session on that WebDriver node. With
+    profile_commands every WebDriver command is profiled (see command_profiler.py).
+    With har_dir every scenario's network traffic is written there as a HAR
+    (see har_recorder.py; needs tabs == 1). With artifacts_dir every FAIL step
+    saves a screenshot and DOM snapshot there (see failure_artifacts.py). With
+    console_log every scenario's browser console messages and JS exceptions are
+    collected (see browser_console.py; needs tabs == 1). With trace_dir the waits,
+    sleeps and WebDriver commands of every scenario are recorded there as trace
+    spans (see trace_spans.py).
+    """
+    if profile_commands:
+        command_profiler.enable()
+    if trace_dir:
+        trace_spans.enable(trace_dir, worker_id)
+    suite = importlib.import_module(suite_module)
+    cleanups = ScenarioGraph.from_suite(suite).cleanups
+    scenarios = {key: (account, func, cleanups.get(key)) for key, account, func in suite.SCENARIOS}
+    worker_session = getattr(suite, "worker_session", contextlib.nullcontext)
+    gate = AccountGate(suite)
+
+    from driver_utils import setup_chrome_driver, setup_remote_driver
+    page_load_strategy = "eager" if tabs > 1 else None
+    performance_log = bool(har_dir)
+    if node_url:
+        driver = setup_remote_driver(node_url, page_load_strategy=page_load_strategy, performance_log=performance_log,
+                                     console_log=console_log)
+
+        def health_check():
+            return check_node(node_url)[0]
+    else:
+        driver = setup_chrome_driver(page_load_strategy=page_load_strategy, performance_log=performance_log,
+                                     console_log=console_log)
+        health_check = None
+    if not driver:
+        event_queue.put({"type": "worker_error", "worker": worker_id,
+                         "message": f"Failed to initialize Chrome driver{f' on {node_url}' if node_url else ''}"})
+        return
+
+    try:
+        # Leases are taken before the first task so a waiting worker holds no scenario
+        with worker_session():
+            if tabs > 1:
+                _run_tabs(worker_id, scenarios, driver, gate, tabs, task_queue, event_queue, health_check,
+                          artifacts_dir)
+            else:
+                reporter = QueueReporter(event_queue, worker_id,
+                                         artifacts=ArtifactCollector(driver, artifacts_dir) if artifacts_dir else None)
+                har = None
+                if har_dir:
+                    from har_recorder import HarRecorder
+                    har = HarRecorder(driver, har_dir, include_bodies=har_bodies)
+                console = None
+                if console_log:
+                    from browser_console import ConsoleRecorder
+                    console = ConsoleRecorder(driver)
+                _run_tasks(worker_id, scenarios, driver, gate, reporter, task_queue, event_queue, health_check,
+                           har=har, console=console)
+    except Exception as e:
+        event_queue.put({"type": "worker_error", "worker": worker_id,
+                         "message": f"{str(e)}\n{traceback.format_exc()}"})
+    finally:
+        failure_artifacts.drain()
+        driver.quit()
+
+
+def _run_tasks(worker_id, scenarios, driver, gate, reporter, task_queue, event_queue, health_check=None,
+               har=None, console=None):
+    """
+    Worker loop: run scenarios until the None sentinel arrives
+
+    After a failed scenario, health_check (if given) is asked whether the browser's
+    node is still up; if not the loop stops so the remaining scenarios go to other workers.
+    With har (a HarRecorder) every scenario's network traffic is written as a HAR,
+    with console (a ConsoleRecorder) its browser console messages are collected.
+    """
+    while True:
+        key = task_queue.get()
+        if key is None:
+            break
+
+        account, func, cleanup = scenarios[key]
+        reporter.scenario = key
+        start = time.time()
+        event_queue.put({"type": "scenario_start", "worker": worker_id, "scenario": key, "at": start,
+                         "start_ns": reporter.clock.begin(key)})
+        idle_accounting.begin(key)
+        command_profiler.begin(key)
+        page_metrics.begin(key)
+        trace_spans.begin(key, reporter.worker_id)
+        if har:
+            har.begin()
+        if console:
+            console.begin()
+
+        with gate.use(account, driver, reporter) as logged_in:
+            if logged_in:
+                success = run_scenario(driver, reporter, func)
+                if cleanup:
+                    run_cleanup(driver, reporter, cleanup)
+            else:
+                reporter.add_step("Scenario Skipped", "FAIL", f"Login failed for account '{account}'")
+                event_queue.put({"type": "login_failed", "worker": worker_id, "scenario": key, "account": account})
+                success = False
+
+        trace_spans.end()
+        event_queue.put({"type": "scenario_end", "worker": worker_id, "scenario": key,
+                         "success": success, "duration": time.time() - start,
+                         "idle": idle_accounting.end(), "commands": command_profiler.end(),
+                         "pages": page_metrics.end(), "har": har.write(key) if har else None,
+                         "artifacts": reporter.artifacts.end(key) if reporter.artifacts else None,
+                         "console": console.end() if console else None})
+
+        if not success and health_check and not health_check():
+            event_queue.put({"type": "worker_error", "worker": worker_id,
+                             "message": "Node failed its health check - worker stopped taking scenarios"})
+            break
+
+
+def _run_tabs(worker_id, scenarios, driver, gate, tabs, task_queue, event_queue, health_check=None,
+              artifacts_dir=None):
+    """Run one task loop per tab, each in its own thread on a TabDriver of the shared browser"""
+    from tab_executor import TabExecutor
+    executor = TabExecutor(driver)
+
+    def tab_loop(tab_id, tab_driver):
+        try:
+            reporter = QueueReporter(event_queue, tab_id,
+                                     artifacts=ArtifactCollector(tab_driver, artifacts_dir) if artifacts_dir else None)
+            _run_tasks(tab_id, scenarios, tab_driver, gate, reporter, task_queue, event_queue, health_check)
+        except Exception as e:
+            event_queue.put({"type": "worker_error", "worker": tab_id,
+                             "message": f"{str(e)}\n{traceback.format_exc()}"})
+        finally:
+            executor.close_tab(tab_driver)
+
+    threads = []
+    for tab_number in range(1, tabs + 1):
+        tab_id = f"{worker_id}.{tab_number}"
+        thread = threading.Thread(target=tab_loop, name=f"worker-{tab_id}",
+                                  args=(tab_id, executor.open_tab()))
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+
+# ============================================================================
+# MAIN PROCESS - scheduling and aggregation
+# ============================================================================
+
+def run_parallel(suite_name, scenario_keys, workers=DEFAULT_WORKERS, tabs=1, node_urls=None, timeout=None,
+                 journal=None, profile_commands=False, har=False, har_bodies=False, console=False,
+                 dashboard=None, trace=False):
+    """
+    Run scenario_keys across worker processes and aggregate their reports
+
+    Scenarios are handed to a worker only when the GraphScheduler says they are
+    ready and the worker has a free task loop, so a dispatched scenario holds
+    its resources until it ends. Scenarios whose dependency failed are not run.
+
+    Every worker has its own task queue, so a worker can be terminated without
+    affecting the others: a scenario running longer than timeout kills its
+    worker (and any other scenario in that worker's tabs) and a fresh worker
+    takes its place.
+
+    When the circuit breaker trips (see circuit_breaker.py) nothing more is
+    dispatched, the workers are stopped after BREAKER_GRACE_PERIOD seconds and
+    every unfinished scenario is skipped.
+
+    Args:
+        suite_name: Key of SUITES to run
+        scenario_keys: Scenario keys from SCENARIOS, in dispatch priority order
+        workers: Number of worker processes (each with its own browser)
+        tabs: Concurrent scenarios (tabs) per worker browser
+        node_urls: Optional remote node URL per worker (see grid_nodes.assign_workers);
+            when given, one worker is started per entry
+        timeout: Optional per-scenario time limit in seconds
+        journal: Optional RunJournal; every result is appended as "<suite_name>::<key>" when known
+        profile_commands: Profile the workers' WebDriver commands for the report (see command_profiler.py)
+        har: Write a HAR per scenario next to the report (see har_recorder.py); ignored with tabs > 1
+        har_bodies: Include JSON and text response bodies in the HARs
+        console: Collect every scenario's browser console messages for the report (see browser_console.py);
+            ignored with tabs > 1
+        dashboard: Optional LiveDashboard the suite's progress is published to (see live_dashboard.py)
+        trace: Export the run as a Chrome trace-event file next to the report, with the workers'
+            waits, sleeps and WebDriver commands (see trace_spans.py)
+
+    Ctrl-C stops the workers, writes the HTML report and re-raises KeyboardInterrupt;
+    scenarios that were still running are not journaled, so a resumed run repeats them.
+
+    Returns:
+        tuple: (results dict of key -> bool, durations dict of key -> seconds, HTML report path,
+                skipped dict of key -> reason for scenarios that never ran)
+    """
+    suite = importlib.import_module(SUITES[suite_name])
+    reporter = suite.TestReporter()
+    har_dir = None
+    if har and tabs > 1:
+        print("HAR capture needs --tabs 1 (the performance log is shared by all tabs) - no HARs written")
+    elif har:
+        har_dir = os.path.splitext(reporter.events_path)[0] + "_har"
+    trace_dir = None
+    if trace:
+        trace_dir = trace_spans.trace_dir(reporter.events_path)
+        os.makedirs(trace_dir, exist_ok=True)
+    if console and tabs > 1:
+        print("Console capture needs --tabs 1 (the browser log is shared by all tabs) - console not collected")
+        console = False
+    if node_urls:
+        workers = len(node_urls)
+    workers = max(1, min(workers, len(scenario_keys)))
+    if dashboard:
+        dashboard.plan(suite_name, scenario_keys, workers * tabs)
+    results = {}
+    skipped = {}
+    retried = set()
+
+    def record(key, success, duration=None, reason=""):
+        if journal:
+            journal.record(f"{suite_name}::{key}", success, duration, reason)
+
+    def skip_scenario(key, reason):
+        results[key] = False
+        skipped[key] = reason
+        record(key, False, reason=reason)
+        reporter.add_step("Scenario Skipped", "FAIL", reason, scenario=key)
+        reporter.end_scenario(key, False, reason=reason)
+        if dashboard:
+            dashboard.publish(suite_name, {"type": "scenario_end", "scenario": key, "success": False,
+                                           "skipped": reason})
+        print(f"[scheduler] SKIP {key} ({reason})")
+
+    breaker = CircuitBreaker(getattr(suite, "ENVIRONMENT_URLS", None))
+    if not breaker.check():
+        for key in scenario_keys:
+            skip_scenario(key, f"{SKIP_REASON} ({breaker.reason})")
+        report_path = reporter.generate_html_report()
+        if journal:
+            journal.record_report(report_path)
+        return results, {}, report_path, skipped
+
+    graph = ScenarioGraph.from_suite(suite)
+    scheduler = GraphScheduler(graph, scenario_keys,
+                               priority={key: -index for index, key in enumerate(scenario_keys)})
+    event_queue = multiprocessing.Queue()
+
+    processes = {}     # worker id -> Process
+    task_queues = {}   # worker id -> that worker's task queue
+    node_of = {}       # worker id -> node URL (None for a local browser)
+    idle = {}          # worker id -> free task loops
+    assigned = {}      # worker id -> scenarios dispatched and not yet finished
+    started = {}       # scenario key -> time its worker reported it started
+    durations = {}
+
+    def start_worker(worker_id, node_url):
+        task_queues[worker_id] = multiprocessing.Queue()
+        node_of[worker_id] = node_url
+        idle[worker_id] = tabs
+        assigned[worker_id] = set()
+        processes[worker_id] = multiprocessing.Process(
+            target=worker_main, name=f"worker-{worker_id}",
+            args=(worker_id, SUITES[suite_name], task_queues[worker_id], event_queue, tabs, node_url,
+                  profile_commands, har_dir, har_bodies, artifacts_dir(reporter.events_path), console,
+                  trace_dir))
+        processes[worker_id].start()
+
+    def finish_scenario(key, success):
+        started.pop(key, None)
+        for blocked, failed_dependency in scheduler.finish(key, success):
+            skip_scenario(blocked, f"dependency '{failed_dependency}' failed")
+
+    def fail_scenario(key, step_name, message):
+        results[key] = False
+        duration = time.time() - started[key] if key in started else None
+        record(key, False, duration)
+        reporter.add_step(step_name, "FAIL", message, scenario=key)
+        reporter.end_scenario(key, False, duration)
+        if dashboard:
+            dashboard.publish(suite_name, {"type": "scenario_end", "scenario": key, "success": False,
+                                           "duration": duration, "message": f"{step_name}: {message}"})
+        finish_scenario(key, False)
+
+    def retire_worker(worker_id, step_name, message):
+        """Fail the unfinished scenarios of a stopped worker and stop dispatching to it"""
+        for key in sorted(assigned.pop(worker_id, ())):
+            if key not in results:
+                fail_scenario(key, step_name, message)
+        idle.pop(worker_id, None)
+
+    def dispatch():
+        while not breaker.tripped:
+            live = [worker_id for worker_id in idle if idle[worker_id] > 0 and processes[worker_id].is_alive()]
+            # Least busy worker first; worker resources may leave a scenario ready on another worker only
+            for worker_id in sorted(live, key=lambda candidate: -idle[candidate]):
+                key = scheduler.next_ready(worker_id)
+                if key is not None:
+                    break
+            else:
+                break
+            task_queues[worker_id].put(key)
+            idle[worker_id] -= 1
+            assigned[worker_id].add(key)
+
+    for worker_id in range(1, workers + 1):
+        start_worker(worker_id, node_urls[worker_id - 1] if node_urls else None)
+    next_worker_id = workers + 1
+    dispatch()
+
+    interrupted = False
+    try:
+        while len(results) < len(scenario_keys):
+            try:
+                event = event_queue.get(timeout=1)
+            except queue.Empty:
+                event = None
+
+            if event is None:
+                # Only look for dead workers once their events have been drained
+                for worker_id in list(idle):
+                    if not processes[worker_id].is_alive():
+                        retire_worker(worker_id, "Scenario Not Completed", "Worker exited before finishing")
+                if not idle:
+                    break
+            elif event["type"] == "step":
+                reporter.add_step(event["step_name"], event["status"], event["message"],
+                                  attempt=event["attempt"], scenario=event["scenario"],
+                                  timestamp=event["timestamp"], at=event.get("at"),
+                                  start_ns=event.get("start_ns"), end_ns=event.get("end_ns"),
+                                  category=event.get("category"), worker=event["worker"])
+                breaker.record_step(event["scenario"], event["status"], event["message"])
+                if event["step_name"].startswith("Retry "):
+                    retried.add(event["scenario"])
+            elif event["type"] == "login_failed":
+                breaker.record_login_failure(event["account"])
+            elif event["type"] == "scenario_start":
+                started[event["scenario"]] = time.time()
+                reporter.start_scenario(event["scenario"], at=event.get("at"), current=False,
+                                        start_ns=event.get("start_ns"), worker=event["worker"])
+                print(f"[worker-{event['worker']}] Started {event['scenario']}")
+            elif event["type"] == "scenario_end":
+                key = event["scenario"]
+                worker_id = int(str(event["worker"]).split(".")[0])
+                if key not in results:
+                    results[key] = event["success"]
+                    durations[key] = event["duration"]
+                    record(key, event["success"], event["duration"])
+                    reporter.end_scenario(key, event["success"], event["duration"], idle=event.get("idle"),
+                                          commands=event.get("commands"), pages=event.get("pages"),
+                                          har=event.get("har"), artifacts=event.get("artifacts"),
+                                          console=event.get("console"))
+                    status = "PASS" if event["success"] else "FAIL"
+                    print(f"[worker-{event['worker']}] {status} {key} ({event['duration']:.1f}s)")
+                    breaker.record_result(key, event["success"])
+                    finish_scenario(key, event["success"])
+                if worker_id in idle:
+                    idle[worker_id] += 1
+                    assigned[worker_id].discard(key)
+            elif event["type"] == "worker_error":
+                reporter.add_step(f"Worker {event['worker']} Error", "FAIL", event["message"])
+            if dashboard and event is not None:
+                dashboard.publish(suite_name, event)
+
+            if timeout:
+                now = time.time()
+                for worker_id in list(idle):
+                    overdue = sorted(key for key in assigned[worker_id]
+                                     if key in started and now - started[key] > timeout)
+                    if not overdue:
+                        continue
+                    print(f"[worker-{worker_id}] TIMEOUT {', '.join(overdue)} after {timeout}s - replacing worker")
+                    processes[worker_id].terminate()
+                    processes[worker_id].join(timeout=10)
+                    for key in overdue:
+                        fail_scenario(key, "Scenario Timeout", f"Exceeded the {timeout}s scenario time limit")
+                    retire_worker(worker_id, "Scenario Not Completed",
+                                  f"Stopped with worker {worker_id} after a timeout in {', '.join(overdue)}")
+                    start_worker(next_worker_id, node_of[worker_id])
+                    next_worker_id += 1
+
+            if breaker.tripped:
+                for key in scenario_keys:
+                    if key not in results:
+                        skip_scenario(key, f"{SKIP_REASON} ({breaker.reason})")
+                break
+
+            dispatch()
+    except KeyboardInterrupt:
+        print("Interrupted - stopping workers...")
+        interrupted = True
+        for process in processes.values():
+            process.terminate()
+    finally:
+        # One sentinel per task loop - every tab of every worker stops on its own
+        for worker_id in idle:
+            for _ in range(tabs):
+                task_queues[worker_id].put(None)
+        for process in processes.values():
+            process.join(timeout=BREAKER_GRACE_PERIOD if breaker.tripped else 30)
+            if breaker.tripped and process.is_alive():
+                process.terminate()
+                process.join(timeout=10)
+
+    # Scenarios a crashed worker never finished
+    unfinished = [key for key in scenario_keys if key not in results]
+    for key in unfinished:
+        results[key] = False
+        if not interrupted:
+            record(key, False)
+        reporter.add_step("Scenario Not Completed", "FAIL", "Worker exited before finishing", scenario=key)
+        reporter.end_scenario(key, False)
+        if dashboard:
+            dashboard.publish(suite_name, {"type": "scenario_end", "scenario": key, "success": False,
+                                           "message": "Worker exited before finishing"})
+
+    report_path = reporter.generate_html_report()
+    if journal:
+        journal.record_report(report_path)
+    # Keep the outcomes for --order=failed-first; scenarios that never ran say nothing about flakiness
+    outcomes = {f"{suite_name}::{key}": "FLAKY" if success and key in retried else "PASS" if success else "FAIL"
+                for key, success in results.items()
+                if key not in skipped and not (interrupted and key in unfinished)}
+    FailureHistory().record_run(outcomes, journal.run_id if journal else os.path.basename(report_path),
+                                [report_path])
+    if interrupted:
+        raise KeyboardInterrupt
+    return results, durations, report_path, skipped
+
+
+def plan_scenarios(suite_name, scenario_keys, workers, tabs, history, default_estimate=DEFAULT_ESTIMATE,
+                   priority=None):
+    """
+    Order scenarios for dispatch and estimate the run's makespan
+
+    Priority is the critical path (own estimate plus longest chain of dependents);
+    the makespan estimate ignores dependencies and resource conflicts. With
+    priority (dict of key -> score, e.g. FailureHistory.priority) higher scores
+    go first and the critical path only breaks ties.
+
+    Returns:
+        tuple: (ordered keys, estimates dict, expected makespan, per-slot expected load list)
+    """
+    suite = importlib.import_module(SUITES[suite_name])
+    estimates = {key: history.estimate(f"{suite_name}:{key}", default=default_estimate) for key in scenario_keys}
+    ranks = ScenarioGraph.from_suite(suite).critical_path(list(estimates), estimates)
+    # Every tab is an independent task loop, so plan for workers * tabs slots
+    _, makespan, loads = plan_longest_first(list(estimates), estimates, workers * tabs)
+    priority = priority or {}
+    ordered = sorted(estimates, key=lambda key: (priority.get(key, 0.0), ranks[key]), reverse=True)
+    return ordered, estimates, makespan, loads
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run ShenLong test scenarios in parallel")
+    parser.add_argument("--suite", choices=sorted(SUITES), default="website",
+                        help="Scenario suite to run (default: website)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help=f"Number of worker processes / browsers "
+                             f"(default: {DEFAULT_WORKERS}, or every node slot with --node)")
+    parser.add_argument("--node", action="append", default=[], metavar="URL[#SLOTS]",
+                        help="Remote WebDriver node or Grid hub to run browsers on (repeatable)")
+    parser.add_argument("--tabs", type=int, default=1,
+                        help="Scenarios run concurrently in tabs of each worker's browser (default: 1)")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Per-scenario time limit in seconds; the worker is replaced when exceeded")
+    parser.add_argument("--default-estimate", type=float, default=DEFAULT_ESTIMATE,
+                        help=f"Seconds assumed for scenarios without duration history (default: {DEFAULT_ESTIMATE:.0f})")
+    parser.add_argument("--profile-commands", action="store_true",
+                        help="Count WebDriver commands by type and call site, with latency histograms, in the report")
+    parser.add_argument("--har", action="store_true",
+                        help="Write a gzipped HAR of every scenario's network traffic next to the report (needs --tabs 1)")
+    parser.add_argument("--har-bodies", action="store_true", help="Include JSON and text response bodies in the HARs")
+    parser.add_argument("--console", action="store_true",
+                        help="Collect browser console messages and JS exceptions of every scenario (needs --tabs 1)")
+    parser.add_argument("--trace", action="store_true",
+                        help="Export scenarios, steps, waits and WebDriver commands as a Chrome trace-event file")
+    parser.add_argument("--dashboard", type=int, nargs="?", const=DEFAULT_PORT, metavar="PORT",
+                        help=f"Serve a live progress page on 127.0.0.1:PORT during the run (default port: {DEFAULT_PORT})")
+    args = parser.parse_args()
+
+    suite = importlib.import_module(SUITES[args.suite])
+    history = DurationHistory()
+    all_keys = [key for key, _, _ in suite.SCENARIOS]
+    node_urls = None
+    if args.node:
+        nodes = check_nodes([parse_node_spec(spec) for spec in args.node])
+        if not nodes:
+            print("No healthy WebDriver node available - aborting")
+            return 2
+        capacity = sum(node.slots for node in nodes)
+        requested = args.workers if args.workers is not None else capacity
+        workers = min(requested, capacity)
+    else:
+        workers = args.workers if args.workers is not None else DEFAULT_WORKERS
+    workers = max(1, min(workers, len(all_keys), getattr(suite, "MAX_WORKERS", workers)))
+    if args.node:
+        node_urls = assign_workers(nodes, workers)
+    tabs = max(1, min(args.tabs, getattr(suite, "MAX_TABS", args.tabs)))
+    scenario_keys, estimates, makespan, loads = plan_scenarios(args.suite, all_keys, workers, tabs, history,
+                                                               default_estimate=args.default_estimate)
+
+    print("Starting ShenLong Parallel Scenario Runner")
+    print("=" * 80)
+    print(f"Suite: {args.suite} | Scenarios: {len(scenario_keys)} | Workers: {workers} | Tabs per worker: {tabs}")
+    print(f"Expected makespan (longest-first): {makespan:.0f}s | "
+          f"Sequential estimate: {sum(estimates.values()):.0f}s")
+    if node_urls:
+        print("Workers per node: " + ", ".join(f"{url} x{node_urls.count(url)}"
+                                               for url in dict.fromkeys(node_urls)))
+    print("Expected load per slot: " + ", ".join(f"{load:.0f}s" for load in loads))
+    dashboard = None
+    if args.dashboard:
+        dashboard = LiveDashboard(port=args.dashboard, history=history)
+        if not dashboard.start():
+            dashboard = None
+    print("=" * 80)
+
+    start = time.time()
+    results, durations, report_path, skipped = run_parallel(args.suite, scenario_keys, workers=workers, tabs=tabs,
+                                                            node_urls=node_urls, timeout=args.timeout,
+                                                            profile_commands=args.profile_commands,
+                                                            har=args.har or args.har_bodies, har_bodies=args.har_bodies,
+                                                            console=args.console, dashboard=dashboard,
+                                                            trace=args.trace)
+    wall_time = time.time() - start
+    if dashboard:
+        dashboard.finish()
+
+    for key, seconds in durations.items():
+        history.record(f"{args.suite}:{key}", seconds)
+    history.save()
+
+    passed = sum(1 for success in results.values() if success)
+    print("\n" + "=" * 80)
+    print("PARALLEL RUN SUMMARY")
+    print("=" * 80)
+    for key in scenario_keys:
+        duration = durations.get(key)
+        duration_text = f"{duration:.1f}s" if duration is not None else "-"
+        status = "SKIP" if key in skipped else "PASS" if results[key] else "FAIL"
+        print(f"  {key:<32} {status:<6} {duration_text} {skipped.get(key, '')}")
+    print("-" * 80)
+    print(f"Passed: {passed}/{len(results)} | Skipped: {len(skipped)} | Wall time: {wall_time:.1f}s (expected {makespan:.0f}s) | "
+          f"Sum of scenario time: {sum(durations.values()):.1f}s")
+    print(f"Detailed HTML Report: {report_path}")
+    print("=" * 80)
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
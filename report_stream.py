@@ -0,0 +1,967 @@
+# -*- coding: utf-8 -*-
+
+"""
+Streaming Test Reporter
+流式测试报告 - 每个步骤即时写入 JSONL, 结束时 (或随时) 渲染 HTML
+
+The suites' TestReporter classes used to keep every step in a list and build
+the HTML report with repeated string concatenation at the end of the run:
+quadratic in the number of steps, and a crash lost the whole report. A
+StreamingReporter appends each step to reports/<prefix>_<timestamp>.jsonl as
+it happens instead and keeps only the PASS/FAIL counters in memory:
+
+    {"type": "run", "title": "ShenLong Admin Panel Test Report", "prefix": "admin_panel_test",
+     "started": "2024-01-15 14:30:25"}
+    {"type": "scenario_start", "scenario": "dynamic_advanced.wallet", "at": 1705300201.21,
+     "start_ns": 81234500000000}
+    {"type": "step", "step_name": "Click Pay Button", "status": "PASS", "message": "...",
+     "attempt": null, "scenario": "dynamic_advanced.wallet", "timestamp": "2024-01-15 14:31:02",
+     "at": 1705300262.27, "start_ns": 81295310000000, "end_ns": 81295560000000,
+     "category": "click"}
+    {"type": "scenario_end", "scenario": "dynamic_advanced.wallet", "status": "PASS",
+     "duration": 61.2, "reason": "", "at": 1705300262.41}
+
+Steps are flushed every FLUSH_EVERY steps or FLUSH_INTERVAL seconds, and FAIL
+steps immediately. Each step carries the epoch time "at" and monotonic
+start_ns/end_ns (see StepClock), from which the report draws a waterfall
+timeline per scenario; its category comes from step_category() unless given.
+Optional scenario_end fields hold the scenario's instrumentation: "idle",
+"commands", "pages", "har", "artifacts" and "console" (see the modules of the
+same names). Relayed events carry the worker id ("worker"), and the "run"
+event maps the writer's perf_counter_ns clock to epoch time for trace_spans.py.
+
+generate_html_report() renders the HTML from the event file one step at a
+time and writes the same results next to it as JSON (<report>.json) and
+JUnit XML (<report>.xml) for CI and dashboards, and into the results
+database (see results_db.py). A JSON document is
+{"suites": [...]}, so the outputs of several workers, suites or machines
+merge by concatenating their "suites" lists (merge_json_reports()).
+
+    python report_stream.py reports/admin_panel_test_20240115_143025.jsonl   # render on demand
+    python report_stream.py --merge reports/merged shard1.json shard2.json   # merged.json + merged.xml
+"""
+
+import argparse
+import contextlib
+import html
+import json
+import os
+import sqlite3
+import threading
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+import browser_console
+import command_profiler
+import failure_artifacts
+import idle_accounting
+import page_metrics
+import trace_spans
+
+REPORTS_DIR = "reports"
+
+# Flush the event file after this many steps or seconds, whichever comes first
+FLUSH_EVERY = 20
+FLUSH_INTERVAL = 2.0
+
+REPORT_STYLE = """
+        body { font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }
+        .header { background-color: #2c3e50; color: white; padding: 20px; border-radius: 5px; }
+        .summary { background-color: white; padding: 20px; margin: 20px 0; border-radius: 5px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+        .test-step { background-color: white; margin: 10px 0; padding: 15px; border-radius: 5px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+        .pass { border-left: 5px solid #27ae60; }
+        .fail { border-left: 5px solid #e74c3c; }
+        .info { border-left: 5px solid #3498db; }
+        .stats { display: flex; justify-content: space-around; }
+        .stat-box { text-align: center; padding: 15px; }
+        .stat-number { font-size: 2em; font-weight: bold; }
+        .pass-color { color: #27ae60; }
+        .fail-color { color: #e74c3c; }
+        .info-color { color: #3498db; }
+        .timeline { margin: 15px 0 25px 0; }
+        .timeline h3 { margin-bottom: 5px; }
+        .wf-row { display: flex; align-items: center; font-size: 12px; height: 18px; }
+        .wf-label { width: 260px; overflow: hidden; white-space: nowrap; text-overflow: ellipsis; }
+        .wf-track { position: relative; flex: 1; height: 12px; background-color: #ecf0f1; }
+        .wf-bar { position: absolute; top: 0; height: 12px; min-width: 1px; }
+        .wf-time { width: 70px; text-align: right; }
+        .wf-slow { font-weight: bold; color: #e74c3c; }
+        .cat-navigate { background-color: #3498db; }
+        .cat-wait { background-color: #f39c12; }
+        .cat-click { background-color: #27ae60; }
+        .cat-sleep { background-color: #95a5a6; }
+        .cat-verify { background-color: #8e44ad; }
+        .cat-other { background-color: #34495e; }
+        .breakdown { border-collapse: collapse; font-size: 13px; margin-bottom: 15px; }
+        .breakdown td, .breakdown th { border: 1px solid #ddd; padding: 4px 10px; text-align: right; }
+        .breakdown td:first-child, .breakdown th:first-child, .breakdown td.text { text-align: left; }
+        .level-SEVERE { color: #e74c3c; font-weight: bold; }
+        .level-WARNING { color: #e67e22; }
+        .artifact { max-width: 240px; max-height: 160px; border: 1px solid #ddd; }
+        .legend span { display: inline-block; padding: 2px 8px; margin-right: 5px; color: white; font-size: 12px; }"""
+
+# Step name keywords -> timeline category, first match wins; anything else is "other"
+STEP_CATEGORIES = (
+    ("sleep", ("sleep", "settle", "delay", "pause")),
+    ("navigate", ("navigate", "redirect", "open", "load", "switch to", "refresh")),
+    ("wait", ("wait", "found", "appear", "visible", "qr ")),
+    ("click", ("click", "select", "enter", "tick", "confirm", "option", "button", "close")),
+    ("verify", ("verif", "check", "success", "complete", "assert")),
+)
+
+# Steps per scenario highlighted as the slowest in the timeline
+SLOWEST_STEPS = 3
+
+
+def step_category(step_name):
+    """Timeline category of a step from its name: navigate, wait, click, sleep, verify or other"""
+    text = f"{step_name} ".lower()
+    for category, words in STEP_CATEGORIES:
+        if any(word in text for word in words):
+            return category
+    return "other"
+
+
+class StepClock:
+    """
+    Monotonic per-scenario step timer
+
+    A step's span runs from the end of the previous step of the same scenario
+    (or from begin()) to the moment it is reported.
+    """
+
+    def __init__(self):
+        self.last_ns = {}   # scenario key -> perf_counter_ns of its start or last step
+        self.lock = threading.Lock()
+
+    def begin(self, scenario, start_ns=None):
+        """Mark the start of a scenario; returns the start time in ns"""
+        start_ns = start_ns or time.perf_counter_ns()
+        with self.lock:
+            self.last_ns[scenario] = start_ns
+        return start_ns
+
+    def lap(self, scenario, start_ns=None):
+        """
+        Span of a step reported now
+
+        Args:
+            scenario: Scenario key the step belongs to (None for steps outside scenarios)
+            start_ns: Explicit start of the step (default: end of the previous step)
+
+        Returns:
+            tuple: (start_ns, end_ns)
+        """
+        end_ns = time.perf_counter_ns()
+        with self.lock:
+            start_ns = start_ns or self.last_ns.get(scenario, end_ns)
+            self.last_ns[scenario] = end_ns
+        return start_ns, end_ns
+
+
+@contextlib.contextmanager
+def timed_step(reporter, step_name, status="PASS", message="", category=None):
+    """
+    Report a step spanning exactly the with-block, instead of the time since the previous step
+
+    Works with any reporter whose add_step() takes start_ns and category
+    (StreamingReporter, parallel_runner.QueueReporter). An exception in the
+    block is reported as a FAIL step and re-raised.
+
+        with timed_step(reporter, "Wait for QR Code", message="QR code visible", category="wait"):
+            WebDriverWait(driver, 20).until(...)
+    """
+    start_ns = time.perf_counter_ns()
+    try:
+        yield
+    except Exception as e:
+        reporter.add_step(step_name, "FAIL", str(e), start_ns=start_ns, category=category)
+        raise
+    reporter.add_step(step_name, status, message, start_ns=start_ns, category=category)
+
+
+class StreamingReporter:
+    """Test reporter that writes every step to an append-only JSONL event file"""
+
+    # Set by the suite's TestReporter subclass
+    TITLE = "ShenLong Test Report"
+    REPORT_PREFIX = "test_report"
+
+    def __init__(self):
+        self.start_time = datetime.now()
+        self.passed = 0
+        self.failed = 0
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.last_flush = time.time()
+        self.current_scenario = None
+        self.clock = StepClock()
+        self.artifacts = None   # ArtifactCollector of the scenario run by run_scenario()
+
+        # Create reports directory if it doesn't exist
+        if not os.path.exists(REPORTS_DIR):
+            os.makedirs(REPORTS_DIR)
+        timestamp = self.start_time.strftime("%Y%m%d_%H%M%S")
+        self.events_path = os.path.join(REPORTS_DIR, f"{self.REPORT_PREFIX}_{timestamp}.jsonl")
+        self.events = None   # Opened on the first write, closed by close() / generate_html_report()
+        self._write({"type": "run", "title": self.TITLE, "prefix": self.REPORT_PREFIX,
+                     "started": self.start_time.strftime("%Y-%m-%d %H:%M:%S"),
+                     "clock_offset_ns": time.time_ns() - time.perf_counter_ns()}, flush=True)
+
+    def _write(self, event, flush=False):
+        with self.lock:
+            if self.events is None:
+                self.events = open(self.events_path, 'a', encoding='utf-8')
+            self.events.write(json.dumps(event, ensure_ascii=False) + "\n")
+            self.pending += 1
+            if flush or self.pending >= FLUSH_EVERY or time.time() - self.last_flush >= FLUSH_INTERVAL:
+                self.events.flush()
+                self.pending = 0
+                self.last_flush = time.time()
+
+    def add_step(self, step_name, status, message="", attempt=None, scenario=None, timestamp=None, at=None,
+                 start_ns=None, end_ns=None, category=None, worker=None):
+        """Add a test step to the report
+
+        Args:
+            scenario: Scenario key the step belongs to (set by parallel_runner.py);
+                defaults to the scenario started with start_scenario()
+            timestamp: Original step time when the step was recorded in a worker process
+            at: Original step time as epoch seconds
+            start_ns: Monotonic start of the step (default: end of the scenario's previous step)
+            end_ns: Monotonic end of the step, when it was timed in a worker process (default: now)
+            category: Timeline category (default: from the step name, see step_category())
+            worker: Id of the worker (or tab, "2.1") the step was recorded in
+        """
+        scenario = scenario or self.current_scenario
+        if end_ns is None:
+            start_ns, end_ns = self.clock.lap(scenario, start_ns)
+        if status == "PASS":
+            self.passed += 1
+        elif status == "FAIL":
+            self.failed += 1
+        event = {
+            "type": "step",
+            "step_name": step_name,
+            "status": status,  # "PASS", "FAIL", "INFO", "RETRY"
+            "message": message,
+            "attempt": attempt,
+            "scenario": scenario,
+            "timestamp": timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "at": at or time.time(),
+            "start_ns": start_ns,
+            "end_ns": end_ns,
+            "category": category or step_category(step_name),
+        }
+        if worker is not None:
+            event["worker"] = worker
+        self._write(event, flush=status == "FAIL")
+
+        # Print to console
+        status_text = status if status in ["PASS", "FAIL", "INFO", "RETRY"] else "INFO"
+        retry_text = f" (Attempt {attempt})" if attempt is not None else ""
+        scenario_text = f"[{scenario}] " if scenario else ""
+        print(f"[{status_text}] {scenario_text}{step_name}{retry_text}: {message}")
+        if status == "FAIL" and self.artifacts:
+            self.artifacts.capture(scenario, step_name, message)
+
+    def start_scenario(self, key, at=None, current=True, start_ns=None, worker=None):
+        """
+        Record the start of a scenario
+
+        Args:
+            key: Scenario key
+            at: Start time as epoch seconds (default: now)
+            current: Attribute later steps without a scenario key to this scenario
+                (False when several scenarios run at once, as in parallel_runner.py)
+            start_ns: Monotonic start time, when the scenario started in a worker process
+            worker: Id of the worker (or tab) running the scenario
+        """
+        if current:
+            self.current_scenario = key
+        start_ns = self.clock.begin(key, start_ns)
+        event = {"type": "scenario_start", "scenario": key, "at": at or time.time(), "start_ns": start_ns}
+        if worker is not None:
+            event["worker"] = worker
+        self._write(event)
+
+    def end_scenario(self, key, success, duration=None, reason="", at=None, idle=None, commands=None,
+                     pages=None, har=None, artifacts=None, console=None):
+        """
+        Record the result of a scenario
+
+        Args:
+            key: Scenario key
+            success: True if the scenario passed
+            duration: Seconds the scenario ran (default: since start_scenario)
+            reason: Why the scenario was skipped, "" if it ran
+            idle: idle_accounting.end() of the scenario
+            commands: command_profiler.end() of the scenario
+            pages: page_metrics.end() of the scenario
+            har: Path of the scenario's HAR file
+            artifacts: failure_artifacts.ArtifactCollector.end() of the scenario
+            console: browser_console.ConsoleRecorder.end() of the scenario
+        """
+        if self.current_scenario == key:
+            self.current_scenario = None
+        status = "SKIP" if reason else "PASS" if success else "FAIL"
+        event = {"type": "scenario_end", "scenario": key, "status": status,
+                 "duration": round(duration, 3) if duration is not None else None,
+                 "reason": reason, "at": at or time.time()}
+        if idle:
+            event["idle"] = idle
+        if commands:
+            event["commands"] = commands
+        if pages:
+            event["pages"] = pages
+        if har:
+            event["har"] = har
+        if artifacts:
+            event["artifacts"] = artifacts
+        if console:
+            event["console"] = console
+        self._write(event, flush=True)
+
+    def run_scenario(self, key, func, driver):
+        """
+        Run func(driver, reporter) as scenario key, recording its start, result, idle-time accounting
+        and the browser state of its failed steps
+
+        Returns:
+            bool: The scenario's result; an exception is recorded as FAIL and re-raised
+        """
+        self.start_scenario(key)
+        start = time.time()
+        success = False
+        idle_accounting.begin(key)
+        command_profiler.begin(key)
+        page_metrics.begin(key)
+        trace_spans.begin(key)
+        self.artifacts = failure_artifacts.ArtifactCollector(driver, failure_artifacts.artifacts_dir(self.events_path))
+        try:
+            success = bool(func(driver, self))
+        finally:
+            artifacts, self.artifacts = self.artifacts.end(key), None
+            trace_spans.end()
+            self.end_scenario(key, success, time.time() - start, idle=idle_accounting.end(),
+                              commands=command_profiler.end(), pages=page_metrics.end(), artifacts=artifacts)
+        return success
+
+    def flush(self):
+        """Write buffered steps to the event file"""
+        with self.lock:
+            if self.events is not None:
+                self.events.flush()
+            self.pending = 0
+            self.last_flush = time.time()
+
+    def close(self):
+        """Flush and close the event file; a later step reopens it for appending"""
+        with self.lock:
+            if self.events is not None:
+                self.events.close()
+                self.events = None
+            self.pending = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def generate_html_report(self):
+        """Generate HTML report with all test results, plus the JSON and JUnit XML results next to it"""
+        self.close()
+        failure_artifacts.drain()
+        suites = [summarize_events(self.events_path)]
+        report_path = render_html_report(self.events_path, start_time=self.start_time, suite=suites[0])
+        base = os.path.splitext(report_path)[0]
+        self.json_path = write_json_report(suites, base + ".json")
+        self.junit_path = write_junit_report(suites, base + ".xml")
+        record_in_warehouse(suites[0], os.path.basename(report_path))
+        print(f"HTML Report generated: {report_path}")
+        print(f"Results: {self.json_path} (JSON), {self.junit_path} (JUnit XML)")
+        if os.path.isdir(trace_spans.trace_dir(self.events_path)):
+            self.trace_path = trace_spans.write_trace(self.events_path, base + ".trace.json")
+            print(f"Trace: {self.trace_path} (open in chrome://tracing or https://ui.perfetto.dev)")
+        if suites[0]["idle"]:
+            print(f"Time breakdown: {idle_accounting.breakdown_text(suites[0]['idle'])}")
+        if suites[0]["commands"]:
+            print(f"WebDriver commands: {suites[0]['commands']['count']} round trips, "
+                  f"{suites[0]['commands']['seconds']:.1f}s")
+        if suites[0]["console"]:
+            levels = ", ".join(f"{count} {level}" for level, count in suites[0]["console"]["levels"].items())
+            print(f"Browser console: {levels} ({suites[0]['console']['distinct']} distinct)")
+        return report_path
+
+
+def read_events(events_path):
+    """Events of a JSONL event file in order; a last line cut short by a crash is ignored"""
+    with open(events_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def summarize_events(events_path):
+    """
+    Per-scenario results of an event file
+
+    Step durations come from the steps' start_ns/end_ns, or for older event
+    files the time since the scenario's previous step (or its start). A step's
+    "offset" is its start in seconds since the scenario started. Scenarios that
+    started but never ended (crash, timeout) are reported as FAIL.
+
+    Returns:
+        dict: {"name", "title", "started", "tests", "failures", "skipped", "time",
+               "scenarios": [{"key", "status", "duration", "reason", "message", "steps": [...]}],
+               "steps": [steps that belong to no scenario, e.g. logins],
+               "idle": idle_accounting.suite_breakdown() of the scenarios,
+               "commands": command_profiler.suite_profile() of the scenarios,
+               "pages": page_metrics.suite_pages() of the scenarios,
+               "console": browser_console.suite_console() of the scenarios}
+        Scenarios have "idle", "commands", "pages", "har", "artifacts" and "console" when they were accounted,
+        profiled, measured, recorded, failed with a browser to capture or logged to the browser console. Each step has name, status, message, attempt, timestamp, category, duration and offset.
+    """
+    suite = {"name": StreamingReporter.REPORT_PREFIX, "title": StreamingReporter.TITLE,
+             "started": None, "scenarios": [], "steps": []}
+    scenarios = {}
+    last_at = {}   # scenario key -> time of its start or last step
+    origin_ns = {}  # scenario key -> monotonic start of the scenario
+    origin_at = {}  # scenario key -> epoch start of the scenario (event files without start_ns)
+    step_ends = {}  # scenario key -> [(epoch end, name, duration)] of its steps, for the console messages
+    first_at = None
+    end_at = None
+
+    def scenario_entry(key):
+        if key not in scenarios:
+            scenarios[key] = {"key": key, "status": None, "duration": None, "reason": "", "message": "",
+                              "idle": None, "commands": None, "pages": None, "har": None,
+                              "artifacts": None, "console": None, "steps": []}
+            suite["scenarios"].append(scenarios[key])
+        return scenarios[key]
+
+    for event in read_events(events_path):
+        at = event.get("at")
+        if at is not None:
+            first_at = at if first_at is None else min(first_at, at)
+            end_at = at if end_at is None else max(end_at, at)
+        if event["type"] == "run":
+            suite.update(name=event["prefix"], title=event["title"], started=event["started"])
+        elif event["type"] == "scenario_start":
+            scenario_entry(event["scenario"])
+            last_at[event["scenario"]] = origin_at[event["scenario"]] = at
+            if event.get("start_ns") is not None:
+                origin_ns[event["scenario"]] = event["start_ns"]
+        elif event["type"] == "scenario_end":
+            entry = scenario_entry(event["scenario"])
+            entry.update(status=event["status"], reason=event["reason"], idle=event.get("idle"),
+                         commands=event.get("commands"), pages=event.get("pages"),
+                         har=event.get("har"), artifacts=event.get("artifacts"), console=event.get("console"))
+            entry["duration"] = event["duration"]
+            if entry["duration"] is None and at is not None and last_at.get(event["scenario"]) is not None:
+                entry["duration"] = round(at - last_at[event["scenario"]], 3)
+        elif event["type"] == "step":
+            key = event.get("scenario")
+            previous = last_at.get(key)
+            step = {"name": event["step_name"], "status": event["status"], "message": event["message"],
+                    "attempt": event.get("attempt"), "timestamp": event["timestamp"],
+                    "category": event.get("category") or step_category(event["step_name"]),
+                    "duration": round(at - previous, 3) if at is not None and previous is not None else None,
+                    "offset": None}
+            start_ns, end_ns = event.get("start_ns"), event.get("end_ns")
+            if start_ns is not None and end_ns is not None:
+                step["duration"] = round((end_ns - start_ns) / 1e9, 3)
+                origin_ns.setdefault(key, start_ns)
+                step["offset"] = round((start_ns - origin_ns[key]) / 1e9, 3)
+            elif step["duration"] is not None and origin_at.get(key) is not None:
+                step["offset"] = round(previous - origin_at[key], 3)
+            last_at[key] = at
+            if key is None:
+                suite["steps"].append(step)
+                continue
+            entry = scenario_entry(key)
+            entry["steps"].append(step)
+            step_ends.setdefault(key, []).append((at, step["name"], step["duration"]))
+            if step["status"] == "FAIL" and not entry["message"]:
+                entry["message"] = f"{step['name']}: {step['message']}"
+
+    for entry in suite["scenarios"]:
+        if entry["status"] is None:
+            entry["status"] = "FAIL"
+            entry["message"] = entry["message"] or "Scenario did not finish"
+        if entry["status"] == "SKIP":
+            entry["message"] = entry["reason"]
+        if entry["console"]:
+            browser_console.attribute(entry["console"], step_ends.get(entry["key"], []))
+    suite["tests"] = len(suite["scenarios"])
+    suite["failures"] = sum(1 for entry in suite["scenarios"] if entry["status"] == "FAIL")
+    suite["skipped"] = sum(1 for entry in suite["scenarios"] if entry["status"] == "SKIP")
+    suite["time"] = round(end_at - first_at, 3) if first_at is not None else 0.0
+    suite["idle"] = idle_accounting.suite_breakdown(suite["scenarios"])
+    suite["commands"] = command_profiler.suite_profile(suite["scenarios"])
+    suite["pages"] = page_metrics.suite_pages(suite["scenarios"])
+    suite["console"] = browser_console.suite_console(suite["scenarios"])
+    return suite
+
+
+def write_json_report(suites, path):
+    """Write suite summaries (see summarize_events) as one {"suites": [...]} JSON document"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"generated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "suites": suites},
+                  f, ensure_ascii=False, indent=2)
+    return path
+
+
+def combine_suites(suites):
+    """
+    Merge suites of the same name (e.g. one per shard or per resumed session)
+
+    A scenario that appears more than once keeps its last result.
+
+    Returns:
+        list: One suite per name, in order of first appearance
+    """
+    combined = {}
+    for suite in suites:
+        if suite["name"] not in combined:
+            combined[suite["name"]] = dict(suite, scenarios=[], steps=[], time=0.0)
+        target = combined[suite["name"]]
+        target["scenarios"] = [entry for entry in target["scenarios"]
+                               if entry["key"] not in {other["key"] for other in suite["scenarios"]}]
+        target["scenarios"] += suite["scenarios"]
+        target["steps"] += suite["steps"]
+        target["time"] = round(target["time"] + suite["time"], 3)
+        target["started"] = min(filter(None, [target.get("started"), suite.get("started")]), default=None)
+    for suite in combined.values():
+        suite["tests"] = len(suite["scenarios"])
+        suite["failures"] = sum(1 for entry in suite["scenarios"] if entry["status"] == "FAIL")
+        suite["skipped"] = sum(1 for entry in suite["scenarios"] if entry["status"] == "SKIP")
+        suite["idle"] = idle_accounting.suite_breakdown(suite["scenarios"])
+        suite["commands"] = command_profiler.suite_profile(suite["scenarios"])
+        suite["pages"] = page_metrics.suite_pages(suite["scenarios"])
+        suite["console"] = browser_console.suite_console(suite["scenarios"])
+    return list(combined.values())
+
+
+def merge_json_reports(paths):
+    """Suites of several JSON result documents, combined by suite name (see combine_suites)"""
+    suites = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            suites.extend(json.load(f)["suites"])
+    return combine_suites(suites)
+
+
+def _step_lines(steps):
+    return "\n".join(
+        f"[{step['status']}] {step['name']}"
+        + (f" ({step['duration']:.3f}s)" if step["duration"] is not None else "")
+        + f": {step['message']}" for step in steps)
+
+
+def write_junit_report(suites, path):
+    """
+    Write suite summaries as JUnit XML: one <testsuite> per suite, one <testcase> per scenario
+
+    Each testcase's system-out lists its steps with their durations.
+    """
+    root = ET.Element("testsuites", tests=str(sum(suite["tests"] for suite in suites)),
+                      failures=str(sum(suite["failures"] for suite in suites)),
+                      skipped=str(sum(suite["skipped"] for suite in suites)))
+    for suite in suites:
+        element = ET.SubElement(root, "testsuite", name=suite["name"], tests=str(suite["tests"]),
+                                failures=str(suite["failures"]), skipped=str(suite["skipped"]),
+                                errors="0", time=f"{suite['time']:.3f}")
+        if suite.get("started"):
+            element.set("timestamp", suite["started"].replace(" ", "T"))
+        for entry in suite["scenarios"]:
+            case = ET.SubElement(element, "testcase", classname=suite["name"], name=entry["key"],
+                                 time=f"{entry['duration'] or 0:.3f}")
+            if entry["status"] == "FAIL":
+                ET.SubElement(case, "failure", message=entry["message"][:500]).text = entry["message"]
+            elif entry["status"] == "SKIP":
+                ET.SubElement(case, "skipped", message=entry["reason"])
+            if entry["steps"]:
+                ET.SubElement(case, "system-out").text = _step_lines(entry["steps"])
+        if suite["steps"]:
+            ET.SubElement(element, "system-out").text = _step_lines(suite["steps"])
+    ET.ElementTree(root).write(path, encoding='utf-8', xml_declaration=True)
+    return path
+
+
+def record_in_warehouse(suite, name):
+    """Store a suite summary in the results database; a database problem never fails the report"""
+    from results_db import ResultsWarehouse
+
+    try:
+        warehouse = ResultsWarehouse()
+        try:
+            warehouse.record_suite(suite, name)
+        finally:
+            warehouse.close()
+    except sqlite3.Error as e:
+        print(f"Could not record results in the warehouse: {e}")
+
+
+def timeline_html(suite, report_dir=""):
+    """
+    Waterfall timeline of every scenario of a suite summary (see summarize_events)
+
+    One row per timed step: a bar starting at the step's offset in the scenario,
+    as wide as its duration and colored by category. The SLOWEST_STEPS slowest
+    steps of each scenario are listed in its heading and highlighted, next to
+    a link to the scenario's HAR (relative to report_dir) when one was written.
+    """
+    legend = "".join(f'<span class="cat-{category}">{category}</span>'
+                     for category in [name for name, _ in STEP_CATEGORIES] + ["other"])
+    parts = [f"""
+    <div class="summary">
+        <h2>Timeline</h2>
+        <div class="legend">{legend}</div>
+"""]
+    for entry in suite["scenarios"]:
+        steps = [step for step in entry["steps"] if step["duration"] is not None and step["offset"] is not None]
+        if not steps and not entry.get("har"):
+            continue
+        total = max([entry["duration"] or 0] + [step["offset"] + step["duration"] for step in steps]) or 1
+        slowest = sorted(steps, key=lambda step: -step["duration"])[:SLOWEST_STEPS]
+        slowest_text = ", ".join(f"{html.escape(str(step['name']))} ({step['duration']:.1f}s)" for step in slowest)
+        har_link = ""
+        if entry.get("har"):
+            har_link = f' - <a href="{html.escape(os.path.relpath(entry["har"], report_dir or "."))}">HAR</a>'
+        parts.append(f"""
+        <div class="timeline">
+            <h3>{html.escape(entry["key"])} - {entry["status"]} - {total:.1f}s{har_link}</h3>
+            <p>Slowest: {slowest_text or "-"}</p>
+""")
+        for step in steps:
+            left = 100.0 * step["offset"] / total
+            width = 100.0 * step["duration"] / total
+            name = html.escape(str(step["name"]))
+            slow = ' wf-slow' if any(step is other for other in slowest) else ""
+            parts.append(
+                f'            <div class="wf-row"><span class="wf-label{slow}" title="{name}">{name}</span>'
+                f'<div class="wf-track"><div class="wf-bar cat-{step["category"]}" '
+                f'style="left:{left:.2f}%;width:{width:.2f}%" '
+                f'title="{name} [{step["category"]}] +{step["offset"]:.2f}s, {step["duration"]:.3f}s"></div></div>'
+                f'<span class="wf-time{slow}">{step["duration"]:.2f}s</span></div>\n')
+        parts.append("        </div>\n")
+    parts.append("    </div>\n")
+    return "".join(parts)
+
+
+def idle_html(suite):
+    """Sleep / wait / action / other breakdown per scenario and for the suite, and the costliest sleep call sites"""
+    if not suite.get("idle"):
+        return ""
+    header = "".join(f"<th>{category}</th>" for category in idle_accounting.CATEGORIES + ("other",))
+
+    def cells(parts):
+        return "".join(f"<td>{seconds:.1f}s ({percent:.1f}%)</td>" for seconds, percent in parts.values())
+
+    rows = [f"<tr><td>{html.escape(entry['key'])}</td><td>{entry['duration'] or 0:.1f}s</td>"
+            f"{cells(idle_accounting.breakdown(entry['idle'], entry['duration']))}</tr>"
+            for entry in suite["scenarios"] if entry.get("idle")]
+    rows.append(f"<tr><th>Suite ({suite['idle']['scenarios']} scenarios)</th><th>{suite['idle']['duration']:.1f}s</th>"
+                f"{cells(suite['idle']['categories'])}</tr>")
+    sites = "".join(f"<tr><td>{html.escape(site)}</td><td>{seconds:.1f}s</td><td>{calls}</td>"
+                    f"<td>{seconds / calls:.2f}s</td></tr>"
+                    for site, seconds, calls in suite["idle"]["sleep_sites"])
+    newline = "\n            "
+    return f"""
+    <div class="summary">
+        <h2>Time Breakdown</h2>
+        <table class="breakdown">
+            <tr><th>Scenario</th><th>Duration</th>{header}</tr>
+            {newline.join(rows)}
+        </table>
+        <h3>Top {idle_accounting.TOP_SLEEP_SITES} Sleep Call Sites</h3>
+        <table class="breakdown">
+            <tr><th>Call site</th><th>Total</th><th>Calls</th><th>Average</th></tr>
+            {sites}
+        </table>
+    </div>
+"""
+
+
+def commands_html(suite):
+    """Round trips per WebDriver command with latency histograms, per scenario, and the busiest call sites"""
+    profile = suite.get("commands")
+    if not profile:
+        return ""
+    bounds = [f"&le;{bound}ms" for bound in command_profiler.HISTOGRAM_BUCKETS]
+    bounds.append(f"&gt;{command_profiler.HISTOGRAM_BUCKETS[-1]}ms")
+    newline = "\n            "
+
+    def percentile_text(histogram, pct):
+        value = command_profiler.histogram_percentile(histogram, pct)
+        if value is None:
+            return "-"
+        if value == float("inf"):
+            return f"&gt;{command_profiler.HISTOGRAM_BUCKETS[-1]}"
+        return f"&le;{value:.0f}"
+
+    commands = [f"<tr><td>{html.escape(command)}</td><td>{stats['count']}</td><td>{stats['seconds']:.2f}s</td>"
+                f"<td>{1000.0 * stats['seconds'] / stats['count']:.1f}</td>"
+                f"<td>{percentile_text(stats['histogram'], 50)}</td><td>{percentile_text(stats['histogram'], 95)}</td>"
+                f"<td>{stats['max_ms']:.0f}</td>" + "".join(f"<td>{count or ''}</td>" for count in stats["histogram"])
+                + "</tr>" for command, stats in profile["commands"].items()]
+    scenarios = [f"<tr><td>{html.escape(key)}</td><td>{count}</td><td>{seconds:.2f}s</td></tr>"
+                 for key, count, seconds in profile["scenarios"]]
+    sites = [f"<tr><td>{html.escape(site)}</td><td>{count}</td><td>{seconds:.2f}s</td><td>"
+             + html.escape(", ".join(f"{command} x{calls}" for command, calls in
+                                     sorted(site_commands.items(), key=lambda item: -item[1])))
+             + "</td></tr>" for site, count, seconds, site_commands in profile["sites"]]
+    return f"""
+    <div class="summary">
+        <h2>WebDriver Commands</h2>
+        <p>{profile["count"]} round trips, {profile["seconds"]:.1f}s in WebDriver commands</p>
+        <table class="breakdown">
+            <tr><th>Command</th><th>Count</th><th>Total</th><th>Mean ms</th><th>p50 ms</th><th>p95 ms</th><th>Max ms</th>{"".join(f"<th>{bound}</th>" for bound in bounds)}</tr>
+            {newline.join(commands)}
+        </table>
+        <h3>Round Trips per Scenario</h3>
+        <table class="breakdown">
+            <tr><th>Scenario</th><th>Commands</th><th>Total</th></tr>
+            {newline.join(scenarios)}
+        </table>
+        <h3>Top {command_profiler.TOP_CALL_SITES} Call Sites</h3>
+        <table class="breakdown">
+            <tr><th>Call site</th><th>Commands</th><th>Total</th><th>By type</th></tr>
+            {newline.join(sites)}
+        </table>
+    </div>
+"""
+
+
+def pages_html(suite):
+    """Median and max load timings of every page the suite opened"""
+    if not suite.get("pages"):
+        return ""
+    fields = ("ttfb", "dom_content_loaded", "load", "first_contentful_paint", "lcp")
+
+    def cell(value, unit):
+        median, worst = value
+        if median is None:
+            return "<td>-</td>"
+        return f"<td>{median:.0f}{unit} / {worst:.0f}{unit}</td>" if unit else f"<td>{median:.3f} / {worst:.3f}</td>"
+
+    rows = [f"<tr><td>{html.escape(row['page'])}</td><td>{row['visits']}</td>"
+            + "".join(cell(row[field], "ms") for field in fields) + cell(row["cls"], "") + "</tr>"
+            for row in suite["pages"]]
+    newline = "\n            "
+    return f"""
+    <div class="summary">
+        <h2>Page Performance</h2>
+        <p>Median / max per page over its visits in this run</p>
+        <table class="breakdown">
+            <tr><th>Page</th><th>Visits</th><th>TTFB</th><th>DOMContentLoaded</th><th>Load</th><th>FCP</th><th>LCP</th><th>CLS</th></tr>
+            {newline.join(rows)}
+        </table>
+    </div>
+"""
+
+
+def artifacts_html(suite, report_dir=""):
+    """Screenshot, DOM snapshot and URL of every failed step that was captured (paths relative to report_dir)"""
+    captured = [entry for entry in suite["scenarios"] if entry.get("artifacts")]
+    if not captured:
+        return ""
+
+    def link(path, text):
+        if not path:
+            return "-"
+        return f'<a href="{html.escape(os.path.relpath(path, report_dir or "."))}">{text}</a>'
+
+    parts = ["""
+    <div class="summary">
+        <h2>Failure Artifacts</h2>
+"""]
+    for entry in captured:
+        parts.append(f"""
+        <h3>{html.escape(entry["key"])} - {entry["status"]}</h3>
+        <table class="breakdown">
+            <tr><th>Step</th><th>Time</th><th>URL</th><th>Screenshot</th><th>DOM</th></tr>
+""")
+        for record in entry["artifacts"]:
+            url = html.escape(record.get("url") or "-")
+            screenshot = "-"
+            if record.get("screenshot"):
+                src = html.escape(os.path.relpath(record["screenshot"], report_dir or "."))
+                screenshot = f'<a href="{src}"><img class="artifact" src="{src}" loading="lazy"></a>'
+            parts.append(
+                f'            <tr><td title="{html.escape(str(record.get("message") or ""))}">'
+                f'{html.escape(str(record["step"]))}</td><td>{record["time"]}</td><td>{url}</td>'
+                f'<td>{screenshot}</td><td>{link(record.get("dom"), "page source")}</td></tr>\n')
+        parts.append("        </table>\n")
+    parts.append("    </div>\n")
+    return "".join(parts)
+
+
+def console_html(suite):
+    """Browser console messages of the suite by signature, and per scenario with the step they appeared in"""
+    console = suite.get("console")
+    if not console:
+        return ""
+    newline = "\n            "
+    levels = ", ".join(f"{count} {level}" for level, count in console["levels"].items())
+    rows = [f'<tr><td class="level-{html.escape(level)}">{html.escape(level)}</td><td>{html.escape(source)}</td>'
+            f'<td class="text">{html.escape(message)}</td><td>{count}</td><td>{html.escape(", ".join(keys))}</td></tr>'
+            for level, source, message, count, keys in console["messages"]]
+    scenario_rows = []
+    for entry in suite["scenarios"]:
+        if not entry.get("console"):
+            continue
+        for record in entry["console"]["messages"]:
+            if record["level"] not in ("SEVERE", "WARNING"):
+                continue
+            step = "-"
+            if record.get("step"):
+                duration = f" ({record['step_duration']:.1f}s)" if record.get("step_duration") is not None else ""
+                step = f"{html.escape(str(record['step']))}{duration}"
+            scenario_rows.append(
+                f'<tr><td>{html.escape(entry["key"])}</td><td class="level-{record["level"]}">{record["level"]}</td>'
+                f'<td class="text">{html.escape(record["message"])}</td><td>{record["count"]}</td><td>{step}</td></tr>')
+        if entry["console"]["dropped"]:
+            scenario_rows.append(f'<tr><td>{html.escape(entry["key"])}</td><td>-</td>'
+                                 f'<td class="text">{entry["console"]["dropped"]} more distinct message(s) not kept</td>'
+                                 f'<td>-</td><td>-</td></tr>')
+    return f"""
+    <div class="summary">
+        <h2>Browser Console</h2>
+        <p>{console["total"]} messages ({levels}), {console["distinct"]} distinct</p>
+        <table class="breakdown">
+            <tr><th>Level</th><th>Source</th><th>Message</th><th>Count</th><th>Scenarios</th></tr>
+            {newline.join(rows)}
+        </table>
+        <h3>Errors and Warnings per Scenario</h3>
+        <table class="breakdown">
+            <tr><th>Scenario</th><th>Level</th><th>Message</th><th>Count</th><th>First seen in step</th></tr>
+            {newline.join(scenario_rows)}
+        </table>
+    </div>
+"""
+
+
+def render_html_report(events_path, report_path=None, start_time=None, suite=None):
+    """
+    Render the HTML report of an event file, streaming the steps to disk
+
+    Args:
+        events_path: JSONL file written by a StreamingReporter
+        report_path: Output path (default: the event file with .html)
+        start_time: Run start used for the duration (default: from the event file)
+        suite: summarize_events() of the event file, for the timeline (computed when omitted)
+
+    Returns:
+        str: Path of the HTML report
+    """
+    report_path = report_path or os.path.splitext(events_path)[0] + ".html"
+    title = StreamingReporter.TITLE
+    passed = failed = 0
+    for event in read_events(events_path):
+        if event["type"] == "run":
+            title = event["title"]
+            start_time = start_time or datetime.strptime(event["started"], "%Y-%m-%d %H:%M:%S")
+        elif event["type"] == "step":
+            passed += event["status"] == "PASS"
+            failed += event["status"] == "FAIL"
+    end_time = datetime.now()
+    duration = end_time - (start_time or end_time)
+    suite = suite or summarize_events(events_path)
+
+    with open(report_path, 'w', encoding='utf-8') as f:
+        f.write(f"""
+<!DOCTYPE html>
+<html>
+<head>
+    <title>{html.escape(title)}</title>
+    <style>{REPORT_STYLE}
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>{html.escape(title)}</h1>
+        <p>Generated on: {end_time.strftime("%Y-%m-%d %H:%M:%S")}</p>
+        <p>Test Duration: {str(duration).split('.')[0]}</p>
+    </div>
+
+    <div class="summary">
+        <h2>Test Summary</h2>
+        <div class="stats">
+            <div class="stat-box">
+                <div class="stat-number pass-color">{passed}</div>
+                <div>Passed</div>
+            </div>
+            <div class="stat-box">
+                <div class="stat-number fail-color">{failed}</div>
+                <div>Failed</div>
+            </div>
+            <div class="stat-box">
+                <div class="stat-number">{passed + failed}</div>
+                <div>Total Tests</div>
+            </div>
+        </div>
+    </div>
+""")
+        f.write(timeline_html(suite, os.path.dirname(report_path)))
+        f.write(idle_html(suite))
+        f.write(commands_html(suite))
+        f.write(pages_html(suite))
+        f.write(console_html(suite))
+        f.write(artifacts_html(suite, os.path.dirname(report_path)))
+        f.write("""
+    <div class="summary">
+        <h2>Test Steps</h2>
+""")
+        for event in read_events(events_path):
+            if event["type"] != "step":
+                continue
+            status_class = event["status"].lower()
+            status_text = "[PASS]" if event["status"] == "PASS" else "[FAIL]" if event["status"] == "FAIL" else "[INFO]"
+            scenario = event.get("scenario")
+            f.write(f"""
+        <div class="test-step {status_class}">
+            <h3>{status_text} {html.escape(str(event["step_name"]))}</h3>
+            {f'<p><strong>Scenario:</strong> {html.escape(str(scenario))}</p>' if scenario else ""}
+            <p><strong>Time:</strong> {event["timestamp"]}</p>
+            <p><strong>Status:</strong> {event["status"]}</p>
+            <p><strong>Message:</strong> {html.escape(str(event["message"]))}</p>
+        </div>
+""")
+        f.write("""
+    </div>
+</body>
+</html>
+""")
+    return report_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render or merge ShenLong test results")
+    parser.add_argument("files", nargs="+", help="Event files (.jsonl) to render, or JSON results with --merge")
+    parser.add_argument("--merge", metavar="OUTPUT",
+                        help="Merge JSON results into OUTPUT.json and OUTPUT.xml (JUnit)")
+    args = parser.parse_args()
+
+    if args.merge:
+        suites = merge_json_reports(args.files)
+        print(f"Merged {len(suites)} suite(s): {write_json_report(suites, args.merge + '.json')}, "
+              f"{write_junit_report(suites, args.merge + '.xml')}")
+        return 0
+    for events_path in args.files:
+        suites = [summarize_events(events_path)]
+        report_path = render_html_report(events_path, suite=suites[0])
+        base = os.path.splitext(report_path)[0]
+        write_json_report(suites, base + ".json")
+        write_junit_report(suites, base + ".xml")
+        print(f"HTML Report generated: {report_path} (+ .json, .xml)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,428 @@
+# -*- coding: utf-8 -*-
+
+"""
+Test Results Warehouse
+测试结果数据库 - 运行、场景、步骤、耗时与失败信息 (SQLite)
+
+Every report written by a StreamingReporter is also stored in
+reports/results.db, and run_all_tests.py adds the ShenLong_Parts results:
+
+    runs       one row per report (suite, start time, source "live" or "import")
+    scenarios  one row per scenario of a run: status, flaky, duration, failure message
+    steps      one row per step: scenario, name, status, message, duration
+    pages      one row per page visit: load timings, LCP/CLS and CDP counters (see page_metrics.py)
+
+Step durations are the monotonic step spans of the event file (see
+report_stream.py); for imported HTML reports, the time since the previous
+step of the same scenario. The HTML reports that predate the warehouse are
+imported once (reports with a JSON result file next to them are read from
+that file instead):
+
+    python results_db.py import
+    python results_db.py p95 "Click Pay Button" --runs 30
+    python results_db.py failure-rate --runs 30
+    python results_db.py pages --metric lcp --runs 30
+"""
+
+import argparse
+import glob
+import json
+import math
+import os
+import sqlite3
+from datetime import datetime
+
+from failure_history import attempt_outcomes, read_report_steps, report_attempts
+from page_metrics import TIMING_FIELDS
+
+DB_PATH = os.path.join("reports", "results.db")
+REPORTS_GLOB = os.path.join("reports", "*.html")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,          -- report file name, or "<run id>:parts"
+    suite TEXT NOT NULL,                -- website, admin or parts
+    started TEXT,                       -- YYYY-MM-DD HH:MM:SS
+    source TEXT NOT NULL                -- live or import
+);
+CREATE TABLE IF NOT EXISTS scenarios (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    scenario TEXT NOT NULL,             -- "<suite>::<key>" as used by run_all_tests.py
+    status TEXT NOT NULL,               -- PASS, FAIL or SKIP
+    flaky INTEGER NOT NULL DEFAULT 0,   -- passed after a failed attempt or retried stage
+    duration REAL,
+    message TEXT
+);
+CREATE TABLE IF NOT EXISTS steps (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    scenario TEXT,                      -- NULL for steps outside any scenario (logins)
+    seq INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    message TEXT,
+    timestamp TEXT,
+    duration REAL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    scenario TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    page TEXT NOT NULL,                 -- path and query, e.g. /meal/ip?ipType=0
+    url TEXT,
+    dns REAL,                           -- timings in ms since navigation start
+    connect REAL,
+    ttfb REAL,
+    response REAL,
+    dom_interactive REAL,
+    dom_content_loaded REAL,
+    load REAL,
+    first_paint REAL,
+    first_contentful_paint REAL,
+    lcp REAL,
+    cls REAL,
+    transfer_size INTEGER,
+    cdp TEXT                            -- JSON of the CDP Performance.getMetrics counters
+);
+CREATE INDEX IF NOT EXISTS idx_runs_started ON runs(started);
+CREATE INDEX IF NOT EXISTS idx_scenarios_scenario ON scenarios(scenario, run_id);
+CREATE INDEX IF NOT EXISTS idx_steps_name ON steps(name, run_id);
+CREATE INDEX IF NOT EXISTS idx_steps_run ON steps(run_id, scenario);
+CREATE INDEX IF NOT EXISTS idx_pages_page ON pages(page, run_id);
+"""
+
+# Page metrics that can be queried with page_latency()
+PAGE_METRICS = TIMING_FIELDS + ("cls",)
+
+
+def suite_of(report_name):
+    """Suite name of a report prefix or file name"""
+    if report_name.startswith("admin"):
+        return "admin"
+    if report_name.startswith("parts"):
+        return "parts"
+    return "website"
+
+
+def _seconds_between(start, end):
+    try:
+        return (datetime.strptime(end, "%Y-%m-%d %H:%M:%S")
+                - datetime.strptime(start, "%Y-%m-%d %H:%M:%S")).total_seconds()
+    except (TypeError, ValueError):
+        return None
+
+
+def _started_from_name(name):
+    """Start time encoded in a report name ending in _YYYYMMDD_HHMMSS"""
+    try:
+        return datetime.strptime(os.path.splitext(name)[0][-15:], "%Y%m%d_%H%M%S").strftime("%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return None
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers (None when empty)"""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class ResultsWarehouse:
+    """SQLite store of test runs, scenarios and steps"""
+
+    def __init__(self, path=DB_PATH):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def has_run(self, name):
+        return self.connection.execute("SELECT 1 FROM runs WHERE name = ?", (name,)).fetchone() is not None
+
+    def _insert_run(self, name, suite, started, source):
+        # Re-recording a run replaces it (scenarios and steps cascade)
+        self.connection.execute("DELETE FROM runs WHERE name = ?", (name,))
+        cursor = self.connection.execute("INSERT INTO runs (name, suite, started, source) VALUES (?, ?, ?, ?)",
+                                         (name, suite, started, source))
+        return cursor.lastrowid
+
+    def record_suite(self, suite, name, source="live"):
+        """
+        Store one suite summary (see report_stream.summarize_events)
+
+        Args:
+            suite: Suite dict with scenarios and their steps
+            name: Unique run name, normally the report file name
+            source: "live" for runs recorded as they finish, "import" for old reports
+        """
+        suite_name = suite_of(suite["name"])
+        with self.connection:
+            run_id = self._insert_run(name, suite_name, suite.get("started") or _started_from_name(name), source)
+            seq = 0
+            for step in suite["steps"]:
+                seq += 1
+                self.connection.execute(
+                    "INSERT INTO steps (run_id, scenario, seq, name, status, message, timestamp, duration) "
+                    "VALUES (?, NULL, ?, ?, ?, ?, ?, ?)",
+                    (run_id, seq, step["name"], step["status"], step["message"], step["timestamp"], step["duration"]))
+            for entry in suite["scenarios"]:
+                scenario_id = f"{suite_name}::{entry['key']}"
+                flaky = entry["status"] == "PASS" and any(step["name"].startswith("Retry ") for step in entry["steps"])
+                self.connection.execute(
+                    "INSERT INTO scenarios (run_id, scenario, status, flaky, duration, message) VALUES (?, ?, ?, ?, ?, ?)",
+                    (run_id, scenario_id, entry["status"], int(flaky), entry["duration"], entry["message"]))
+                for step in entry["steps"]:
+                    seq += 1
+                    self.connection.execute(
+                        "INSERT INTO steps (run_id, scenario, seq, name, status, message, timestamp, duration) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (run_id, scenario_id, seq, step["name"], step["status"], step["message"],
+                         step["timestamp"], step["duration"]))
+                for page_seq, record in enumerate(entry.get("pages") or [], 1):
+                    columns = ("page", "url") + PAGE_METRICS + ("transfer_size",)
+                    self.connection.execute(
+                        f"INSERT INTO pages (run_id, scenario, seq, {', '.join(columns)}, cdp) "
+                        f"VALUES (?, ?, ?, {', '.join('?' * len(columns))}, ?)",
+                        [run_id, scenario_id, page_seq] + [record.get(column) for column in columns]
+                        + [json.dumps(record.get("cdp") or {})])
+        return run_id
+
+    def import_html_report(self, path):
+        """
+        Store an HTML report that has no JSON results (reports from before the warehouse)
+
+        Steps are attributed to scenarios as in failure_history.py; step durations come from
+        the step timestamps (one-second resolution).
+        """
+        name = os.path.basename(path)
+        suite_name, steps = read_report_steps(path)
+        attempts = report_attempts(suite_name, steps)
+        outcomes = attempt_outcomes(attempts)
+        scenario_of = {id(step): scenario_id for scenario_id, attempt in attempts for step in attempt}
+        with self.connection:
+            run_id = self._insert_run(name, suite_name, _started_from_name(name), "import")
+            seq = 0
+            previous = {}   # scenario id -> timestamp of its previous step
+            first_last = {}
+            for step in steps:
+                seq += 1
+                scenario_id = scenario_of.get(id(step))
+                duration = _seconds_between(previous.get(scenario_id), step["timestamp"])
+                previous[scenario_id] = step["timestamp"]
+                if scenario_id:
+                    first, _ = first_last.get(scenario_id, (step["timestamp"], None))
+                    first_last[scenario_id] = (first, step["timestamp"])
+                self.connection.execute(
+                    "INSERT INTO steps (run_id, scenario, seq, name, status, message, timestamp, duration) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (run_id, scenario_id, seq, step["name"], step["status"], step["message"],
+                     step["timestamp"], duration))
+            for scenario_id, outcome in outcomes.items():
+                failures = [step for attempt_id, attempt in attempts if attempt_id == scenario_id
+                            for step in attempt if step["status"] == "FAIL"]
+                message = f"{failures[-1]['name']}: {failures[-1]['message']}" if failures else ""
+                self.connection.execute(
+                    "INSERT INTO scenarios (run_id, scenario, status, flaky, duration, message) VALUES (?, ?, ?, ?, ?, ?)",
+                    (run_id, scenario_id, "FAIL" if outcome == "FAIL" else "PASS", int(outcome == "FLAKY"),
+                     _seconds_between(*first_last.get(scenario_id, (None, None))), message))
+        return run_id
+
+    def import_reports(self, pattern=REPORTS_GLOB):
+        """
+        Import every report in reports/ that is not in the warehouse yet
+
+        Imports that attributed website fixed long-term steps to website::fixed_long_term.*
+        instead of the matrix's website::fixed_longterm.* are imported again.
+
+        Returns:
+            int: Number of reports imported
+        """
+        from report_stream import merge_json_reports
+
+        stale = self._misattributed_imports()
+        count = 0
+        for path in sorted(glob.glob(pattern)):
+            name = os.path.basename(path)
+            if self.has_run(name) and name not in stale:
+                continue
+            json_path = os.path.splitext(path)[0] + ".json"
+            if os.path.exists(json_path):
+                for suite in merge_json_reports([json_path]):
+                    self.record_suite(suite, name, source="import")
+            else:
+                self.import_html_report(path)
+            count += 1
+        return count
+
+    def _misattributed_imports(self):
+        """Names of HTML imports from older versions, which used website::fixed_long_term.* scenario ids"""
+        rows = self.connection.execute(
+            "SELECT DISTINCT runs.name FROM runs JOIN scenarios ON scenarios.run_id = runs.id "
+            "WHERE runs.source = 'import' AND scenarios.scenario LIKE 'website::fixed\\_long\\_term.%' ESCAPE '\\'")
+        return {row[0] for row in rows}
+
+    def _recent_run_ids(self, runs, scenario=None, step=None):
+        """Ids of the last `runs` runs (that contain the scenario / step / step within scenario, when given), newest first"""
+        query = "SELECT DISTINCT runs.id, runs.started FROM runs"
+        params = []
+        if step is not None:
+            query += " JOIN steps ON steps.run_id = runs.id WHERE steps.name = ?"
+            params.append(step)
+            if scenario is not None:
+                query += " AND steps.scenario = ?"
+                params.append(scenario)
+        elif scenario is not None:
+            query += " JOIN scenarios ON scenarios.run_id = runs.id WHERE scenarios.scenario = ?"
+            params.append(scenario)
+        query += " ORDER BY runs.started DESC, runs.id DESC"
+        if runs:
+            query += " LIMIT ?"
+            params.append(runs)
+        return [row[0] for row in self.connection.execute(query, params)]
+
+    def step_duration_percentile(self, step, pct=95, runs=30, scenario=None):
+        """
+        Percentile of a step's duration over the last runs that contain it
+
+        Args:
+            step: Step name, e.g. "Click Pay Button"
+            pct: Percentile (95 for p95)
+            runs: Number of most recent runs to look at (None for all)
+            scenario: Only count the step within this scenario id
+
+        Returns:
+            tuple: (percentile seconds or None, number of samples)
+        """
+        run_ids = self._recent_run_ids(runs, scenario=scenario, step=step)
+        if not run_ids:
+            return None, 0
+        query = (f"SELECT duration FROM steps WHERE name = ? AND duration IS NOT NULL "
+                 f"AND run_id IN ({','.join('?' * len(run_ids))})")
+        params = [step] + run_ids
+        if scenario:
+            query += " AND scenario = ?"
+            params.append(scenario)
+        durations = [row[0] for row in self.connection.execute(query, params)]
+        return percentile(durations, pct), len(durations)
+
+    def failure_rates(self, runs=None, suite=None):
+        """
+        Failure rate per scenario over the last runs (skipped scenarios excluded)
+
+        Args:
+            runs: Number of most recent runs to look at (None for all)
+            suite: Only scenarios of this suite
+
+        Returns:
+            list: (scenario id, runs, failures, flaky, failure rate) sorted by failure rate, highest first
+        """
+        run_ids = self._recent_run_ids(runs)
+        if not run_ids:
+            return []
+        query = (f"SELECT scenario, COUNT(*), SUM(status = 'FAIL'), SUM(flaky) FROM scenarios "
+                 f"WHERE status != 'SKIP' AND run_id IN ({','.join('?' * len(run_ids))})")
+        params = list(run_ids)
+        if suite:
+            query += " AND scenario LIKE ?"
+            params.append(f"{suite}::%")
+        query += " GROUP BY scenario"
+        rows = [(scenario, total, failures, flaky, failures / total)
+                for scenario, total, failures, flaky in self.connection.execute(query, params)]
+        return sorted(rows, key=lambda row: (-row[4], row[0]))
+
+    def page_latency(self, metric="load", runs=30, pct=95):
+        """
+        Latency of every page over the last runs, with its latest run next to it
+
+        Args:
+            metric: One of PAGE_METRICS, e.g. "load" or "lcp"
+            runs: Number of most recent runs with page metrics to look at (None for all)
+            pct: Percentile reported next to the median
+
+        Returns:
+            list: (page, samples, median, percentile, latest run median) sorted by median, slowest first
+        """
+        if metric not in PAGE_METRICS:
+            raise ValueError(f"Unknown page metric '{metric}' (one of {', '.join(PAGE_METRICS)})")
+        query = "SELECT DISTINCT runs.id, runs.started FROM runs JOIN pages ON pages.run_id = runs.id " \
+                "ORDER BY runs.started DESC, runs.id DESC"
+        params = []
+        if runs:
+            query += " LIMIT ?"
+            params.append(runs)
+        run_ids = [row[0] for row in self.connection.execute(query, params)]
+        if not run_ids:
+            return []
+        samples = {}
+        for page, run_id, value in self.connection.execute(
+                f"SELECT page, run_id, {metric} FROM pages WHERE {metric} IS NOT NULL "
+                f"AND run_id IN ({','.join('?' * len(run_ids))})", run_ids):
+            samples.setdefault(page, []).append((run_ids.index(run_id), value))
+        rows = []
+        for page, values in samples.items():
+            newest = min(age for age, _ in values)
+            latest = [value for age, value in values if age == newest]
+            all_values = [value for _, value in values]
+            rows.append((page, len(all_values), percentile(all_values, 50), percentile(all_values, pct),
+                         percentile(latest, 50)))
+        return sorted(rows, key=lambda row: -row[2])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the ShenLong test results warehouse")
+    parser.add_argument("--db", default=DB_PATH, help=f"Database file (default: {DB_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("import", help="Import the reports in reports/ that are not in the database yet")
+    p95 = commands.add_parser("p95", help="Percentile duration of a step")
+    p95.add_argument("step", help="Step name, e.g. 'Click Pay Button'")
+    p95.add_argument("--runs", type=int, default=30, help="Most recent runs containing the step (default: 30)")
+    p95.add_argument("--pct", type=float, default=95, help="Percentile (default: 95)")
+    p95.add_argument("--scenario", help="Only within this scenario id, e.g. website::dynamic_advanced.alipay")
+    rates = commands.add_parser("failure-rate", help="Failure rate per scenario")
+    rates.add_argument("--runs", type=int, default=None, help="Most recent runs to look at (default: all)")
+    rates.add_argument("--suite", choices=["website", "admin", "parts"])
+    pages = commands.add_parser("pages", help="Latency per page across runs")
+    pages.add_argument("--metric", choices=PAGE_METRICS, default="load", help="Page metric (default: load)")
+    pages.add_argument("--runs", type=int, default=30, help="Most recent runs with page metrics (default: 30)")
+    pages.add_argument("--pct", type=float, default=95, help="Percentile next to the median (default: 95)")
+    args = parser.parse_args()
+
+    warehouse = ResultsWarehouse(args.db)
+    try:
+        if args.command == "import":
+            print(f"Imported {warehouse.import_reports()} report(s) into {args.db}")
+        elif args.command == "p95":
+            value, samples = warehouse.step_duration_percentile(args.step, args.pct, args.runs, args.scenario)
+            if value is None:
+                print(f"No timed samples of step '{args.step}'")
+                return 1
+            print(f"p{args.pct:g} of '{args.step}' over the last {args.runs} run(s): {value:.2f}s ({samples} samples)")
+        elif args.command == "pages":
+            digits = ".3f" if args.metric == "cls" else ".1f"
+            unit = "" if args.metric == "cls" else " (ms)"
+            print(f"{args.metric}{unit} per page over the last {args.runs} run(s)")
+            print(f"{'Page':<45} {'Visits':>7} {'Median':>9} {'p' + format(args.pct, 'g'):>9} {'Latest':>9}")
+            print("-" * 80)
+            for page, samples, median, high, latest in warehouse.page_latency(args.metric, args.runs, args.pct):
+                print(f"{page:<45} {samples:>7} {median:>9{digits}} {high:>9{digits}} {latest:>9{digits}}")
+        else:
+            print(f"{'Scenario':<50} {'Runs':>5} {'Fail':>5} {'Flaky':>6} {'Rate':>7}")
+            print("-" * 80)
+            for scenario, total, failures, flaky, rate in warehouse.failure_rates(args.runs, args.suite):
+                print(f"{scenario:<50} {total:>5} {failures:>5} {flaky:>6} {rate * 100:>6.1f}%")
+    finally:
+        warehouse.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
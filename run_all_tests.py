@@ -0,0 +1,578 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ShenLong IP Test Runner
+统一测试入口 - 发现、筛选并运行全部测试场景
+
+Discovers every scenario in the repository:
+    website::<key>  - CompleteWebsitePurchase完整官网.SCENARIOS (run by parallel_runner)
+    admin::<key>    - Admin_Panel_Test.SCENARIOS (run by parallel_runner)
+    parts::<script> - standalone scripts in ShenLong_Parts/ (one subprocess each)
+
+Scenarios are selected with -k keyword expressions matched against the scenario
+id and its package / payment method / entry point keywords, so any subset can be
+run without editing a main() function.
+
+Usage:
+    python run_all_tests.py --list
+    python run_all_tests.py -k alipay
+    python run_all_tests.py -k "dynamic_advanced and not wechat" --workers 4
+    python run_all_tests.py --suite admin --timeout 600
+    python run_all_tests.py --shard 2/4         # second of four machines
+    python run_all_tests.py --resume 20240115_143025
+    python run_all_tests.py --order failed-first  # recently failing / flaky scenarios first
+    python run_all_tests.py --dashboard         # live progress on http://127.0.0.1:8765/
+    python run_all_tests.py --node http://localhost:4444#2 --node http://localhost:4445#2
+"""
+
+import argparse
+import glob
+import importlib
+import os
+import re
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from circuit_breaker import SKIP_REASON, CircuitBreaker
+from failure_history import FailureHistory, order_failed_first
+from grid_nodes import assign_workers, check_nodes, parse_node_spec
+from live_dashboard import DEFAULT_PORT, LiveDashboard
+from parallel_runner import DEFAULT_WORKERS, SUITES, plan_scenarios, run_parallel
+from report_stream import (combine_suites, merge_json_reports, record_in_warehouse, write_json_report,
+                           write_junit_report)
+from run_journal import RunJournal
+from scenario_graph import ScenarioGraph
+from scenario_history import DurationHistory
+from scenario_matrix import parse_shard, shard
+from user_pool import lease_user
+
+# README promise: no single test may hang the run for more than 5 minutes
+DEFAULT_TIMEOUT = 300
+
+PARTS_DIR = "ShenLong_Parts"
+RESULTS_FILE = "test_results.txt"
+RESULTS_JSON = "test_results.json"
+RESULTS_JUNIT = "test_results.xml"
+
+# The ShenLong_Parts scripts all work on this hard-coded admin test user
+PARTS_USER_ID = 10614
+
+# Scripts that take a payment method argument run once per method
+PART_VARIANTS = {
+    "1_Dynamic_Advanced_Package": ["balance", "alipay", "wechat"],
+}
+
+PACKAGE_BY_PREFIX = {
+    "1": "dynamic_advanced",
+    "2": "dynamic_dedicated",
+    "3": "static_premium",
+    "4": "fixed_long_term",
+}
+
+# Package keys spelled differently by a suite -> the package keyword shared by every suite
+PACKAGE_KEYWORDS = {
+    "fixed_longterm": "fixed_long_term",   # website matrix (CompleteWebsitePurchase完整官网.PURCHASE_PACKAGES)
+}
+
+# Lines the ShenLong_Parts scripts print when a test fails (they always exit with code 0)
+PART_FAILURE_MARKERS = ("TEST FAILED", "TESTS FAILED", ": FAILED", "- FAILED", "❌ Test failed", "test failed!")
+
+# ============================================================================
+# DISCOVERY
+# ============================================================================
+
+def _suite_keywords(suite_name, key):
+    """Package, payment method and entry point keywords of a registry scenario key"""
+    package, _, payment = key.partition(".")
+    keywords = [suite_name, payment or "no_balance"]
+    if payment == "wallet":
+        keywords.append("balance_payment")  # Same payment method as the admin/parts naming
+    if package.startswith("pc_"):
+        keywords += ["personal_center", PACKAGE_KEYWORDS.get(package[len("pc_"):], package[len("pc_"):])]
+    else:
+        keywords += [PACKAGE_KEYWORDS.get(package, package)]
+        if suite_name == "website":
+            keywords.append("meal_page")
+    return keywords
+
+
+def _part_keywords(name):
+    """Keywords of a ShenLong_Parts script derived from its file name (e.g. 4_1_Pending_Order_Payment_Test)"""
+    parts = name.split("_")
+    keywords = ["parts"]
+    if parts[0] in PACKAGE_BY_PREFIX:
+        keywords.append(PACKAGE_BY_PREFIX[parts[0]])
+        if len(parts) > 1 and parts[1] == "1":
+            keywords.append("pending_order")
+        elif len(parts) > 1 and parts[1] == "2":
+            keywords.append("balance_payment")
+    elif name == "Admin":
+        keywords += ["dynamic_dedicated", "static_premium"]
+    return keywords
+
+
+def discover_scenarios():
+    """
+    Collect every runnable scenario
+
+    Returns:
+        list: dicts with id, suite, key, keywords and (for parts) script and args
+    """
+    scenarios = []
+    for suite_name, module_name in SUITES.items():
+        suite = importlib.import_module(module_name)
+        for key, _, _ in suite.SCENARIOS:
+            scenarios.append({
+                "id": f"{suite_name}::{key}",
+                "suite": suite_name,
+                "key": key,
+                "keywords": _suite_keywords(suite_name, key),
+            })
+
+    for script in sorted(glob.glob(os.path.join(PARTS_DIR, "*.py"))):
+        name = os.path.splitext(os.path.basename(script))[0]
+        for variant in PART_VARIANTS.get(name, [None]):
+            scenarios.append({
+                "id": f"parts::{name}" + (f"[{variant}]" if variant else ""),
+                "suite": "parts",
+                "key": name,
+                "keywords": _part_keywords(name) + ([variant] if variant else []),
+                "script": script,
+                "args": ["--payment-method", variant] if variant else [],
+            })
+    return scenarios
+
+
+def compile_keyword_expression(expression):
+    """
+    Turn a -k expression into a predicate over scenarios
+
+    Words match case-insensitively as substrings of the scenario id or keywords and
+    can be combined with and / or / not and parentheses, e.g. "alipay and not pc_".
+    """
+    tokens = re.findall(r"\(|\)|[^\s()]+", expression)
+    python_tokens = []
+    for token in tokens:
+        if token.lower() in ("and", "or", "not") or token in ("(", ")"):
+            python_tokens.append(token.lower())
+        else:
+            python_tokens.append(f"_match({token.lower()!r})")
+    code = compile(" ".join(python_tokens) or "True", "<-k>", "eval")
+
+    def predicate(scenario):
+        text = " ".join([scenario["id"]] + scenario["keywords"]).lower()
+        return eval(code, {"__builtins__": {}}, {"_match": lambda word: word in text})
+
+    return predicate
+
+
+def dependency_groups(scenarios):
+    """
+    Split the selected scenarios into groups that must run on the same machine
+
+    Scenarios linked by SCENARIO_RULES dependencies (in either direction) form
+    one group; every other scenario is a group of its own.
+
+    Returns:
+        list: Lists of scenario ids in discovery order
+    """
+    group_of = {}
+    for suite_name, module_name in SUITES.items():
+        keys = [scenario["key"] for scenario in scenarios if scenario["suite"] == suite_name]
+        if not keys:
+            continue
+        graph = ScenarioGraph.from_suite(importlib.import_module(module_name))
+        for key in keys:
+            group_of[f"{suite_name}::{key}"] = f"{suite_name}::{key}"
+        for key in keys:  # Union the dependency edges inside the selection
+            for dep in graph.dependencies[key] & set(keys):
+                root = _group_root(group_of, f"{suite_name}::{key}")
+                group_of[root] = _group_root(group_of, f"{suite_name}::{dep}")
+
+    groups = {}
+    for scenario in scenarios:
+        root = _group_root(group_of, scenario["id"]) if scenario["id"] in group_of else scenario["id"]
+        groups.setdefault(root, []).append(scenario["id"])
+    return list(groups.values())
+
+
+def _group_root(group_of, scenario_id):
+    while group_of[scenario_id] != scenario_id:
+        scenario_id = group_of[scenario_id]
+    return scenario_id
+
+# ============================================================================
+# EXECUTION
+# ============================================================================
+
+def run_part(scenario, timeout, log_dir):
+    """
+    Run one ShenLong_Parts script in its own process
+
+    Returns:
+        tuple: (passed bool, duration seconds, log file path)
+    """
+    log_name = re.sub(r"[^\w.-]", "_", scenario["id"].split("::", 1)[1])
+    log_path = os.path.join(log_dir, f"{log_name}.log")
+    env = dict(os.environ, PYTHONIOENCODING="utf-8")
+    start = time.time()
+    with open(log_path, 'w', encoding='utf-8') as log:
+        process = subprocess.Popen([sys.executable, scenario["script"]] + scenario["args"],
+                                   stdout=log, stderr=subprocess.STDOUT, env=env)
+        try:
+            returncode = process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            log.write(f"\nTIMEOUT: killed after {timeout}s\n")
+            return False, time.time() - start, log_path
+    duration = time.time() - start
+
+    with open(log_path, 'r', encoding='utf-8', errors='replace') as log:
+        output = log.read()
+    passed = returncode == 0 and not any(marker in output for marker in PART_FAILURE_MARKERS)
+    return passed, duration, log_path
+
+
+def run_parts(scenarios, timeout, journal=None, dashboard=None):
+    """
+    Run ShenLong_Parts scripts one at a time (they share one hard-coded admin user)
+
+    The admin environment is probed before every script; once it is down the
+    remaining scripts are skipped. Each result is appended to journal when given
+    and published to dashboard (a LiveDashboard) when given.
+
+    Returns:
+        tuple: (results dict, durations dict, skipped dict of id -> reason)
+    """
+    log_dir = os.path.join("reports", f"parts_logs_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    os.makedirs(log_dir, exist_ok=True)
+    results = {}
+    durations = {}
+    skipped = {}
+    breaker = CircuitBreaker(getattr(importlib.import_module(SUITES["admin"]), "ENVIRONMENT_URLS", None))
+    with lease_user([PARTS_USER_ID]):
+        for index, scenario in enumerate(scenarios, 1):
+            if not breaker.check():
+                results[scenario["id"]] = False
+                skipped[scenario["id"]] = f"{SKIP_REASON} ({breaker.reason})"
+                print(f"SKIP: {scenario['id']} ({skipped[scenario['id']]})")
+                if journal:
+                    journal.record(scenario["id"], False, reason=skipped[scenario["id"]])
+                if dashboard:
+                    dashboard.publish("parts", {"type": "scenario_end", "scenario": part_key(scenario),
+                                                "success": False, "skipped": skipped[scenario["id"]]})
+                continue
+            print(f"\nTest {index}/{len(scenarios)}")
+            print(f"Running: {scenario['id']}")
+            print("-" * 60)
+            if dashboard:
+                dashboard.publish("parts", {"type": "scenario_start", "scenario": part_key(scenario), "worker": 1})
+            passed, duration, log_path = run_part(scenario, timeout, log_dir)
+            if dashboard:
+                dashboard.publish("parts", {"type": "scenario_end", "scenario": part_key(scenario), "worker": 1,
+                                            "success": passed, "duration": duration,
+                                            "message": "" if passed else f"log: {log_path}"})
+            results[scenario["id"]] = passed
+            durations[scenario["id"]] = duration
+            if journal:
+                journal.record(scenario["id"], passed, duration)
+            print(f"{'PASSED' if passed else 'FAILED'}: {scenario['id']} (Duration: {duration:.2f}s) - log: {log_path}")
+            print("-" * 60)
+    FailureHistory().record_run({scenario_id: "PASS" if passed else "FAIL"
+                                 for scenario_id, passed in results.items() if scenario_id not in skipped},
+                                journal.run_id if journal else os.path.basename(log_dir))
+    return results, durations, skipped
+
+
+def part_key(scenario):
+    """Key of a ShenLong_Parts scenario within the "parts" suite, e.g. "1_1_Pending_Order_Payment_Test[alipay]" """
+    return scenario["id"].split("::", 1)[1]
+
+
+def suite_slots(suite_name, count, workers, tabs):
+    """
+    Workers and tabs per worker a suite runs count scenarios on, within its MAX_WORKERS / MAX_TABS
+
+    Returns:
+        tuple: (workers, tabs)
+    """
+    suite = importlib.import_module(SUITES[suite_name])
+    return (max(1, min(workers, count, getattr(suite, "MAX_WORKERS", workers))),
+            max(1, min(tabs, getattr(suite, "MAX_TABS", tabs))))
+
+
+def merge_journal(journal):
+    """
+    Results of every scenario selected for the run, from all sessions of its journal
+
+    Returns:
+        tuple: (results dict, durations dict, skipped dict of id -> reason); selected
+               scenarios without a result are reported as skipped
+    """
+    outcomes = journal.outcomes()
+    results = {}
+    durations = {}
+    skipped = {}
+    for scenario_id in journal.selected:
+        entry = outcomes.get(scenario_id)
+        if entry is None:
+            results[scenario_id] = False
+            skipped[scenario_id] = "not run (interrupted)"
+            continue
+        results[scenario_id] = entry["status"] == "PASS"
+        if entry["duration"] is not None:
+            durations[scenario_id] = entry["duration"]
+        if entry["status"] == "SKIP":
+            skipped[scenario_id] = entry["reason"]
+    return results, durations, skipped
+
+
+def write_results_file(results, durations, skipped, reports, total_time):
+    """Save the per-scenario outcome to RESULTS_FILE"""
+    passed = sum(1 for success in results.values() if success)
+    with open(RESULTS_FILE, 'w', encoding='utf-8') as f:
+        f.write(f"ShenLong IP Test Results - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write("=" * 80 + "\n")
+        for scenario_id, success in results.items():
+            duration = durations.get(scenario_id)
+            duration_text = f"{duration:.2f}s" if duration is not None else "-"
+            status = "SKIP" if scenario_id in skipped else "PASS" if success else "FAIL"
+            f.write(f"{status:<6} {scenario_id:<60} {duration_text} {skipped.get(scenario_id, '')}\n")
+        f.write("=" * 80 + "\n")
+        f.write(f"Passed: {passed}/{len(results)} | Skipped: {len(skipped)} | Total Execution Time: {total_time:.2f} seconds\n")
+        for report in reports:
+            f.write(f"Report: {report}\n")
+
+
+def write_machine_results(results, durations, skipped, reports, run_id):
+    """
+    Save the run as RESULTS_JSON and RESULTS_JUNIT
+
+    Website and admin scenarios come from the JSON results next to each HTML
+    report (with their step timings); ShenLong_Parts scripts have no steps and
+    are also added to the results database here as run "<run_id>:parts".
+    """
+    json_paths = [os.path.splitext(report)[0] + ".json" for report in reports]
+    suites = merge_json_reports([path for path in json_paths if os.path.exists(path)])
+    parts = [scenario_id for scenario_id in results if scenario_id.startswith("parts::")]
+    if parts:
+        parts_suite = {
+            "name": "parts", "title": "ShenLong_Parts scripts", "started": None,
+            "time": round(sum(durations.get(scenario_id, 0.0) for scenario_id in parts), 3),
+            "steps": [],
+            "scenarios": [{
+                "key": scenario_id.split("::", 1)[1],
+                "status": "SKIP" if scenario_id in skipped else "PASS" if results[scenario_id] else "FAIL",
+                "duration": durations.get(scenario_id),
+                "reason": skipped.get(scenario_id, ""),
+                "message": skipped.get(scenario_id, "") or ("" if results[scenario_id] else "Script reported a failure"),
+                "steps": [],
+            } for scenario_id in parts],
+        }
+        record_in_warehouse(parts_suite, f"{run_id}:parts")
+        suites = combine_suites(suites + [parts_suite])
+    write_json_report(suites, RESULTS_JSON)
+    write_junit_report(suites, RESULTS_JUNIT)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Discover and run ShenLong IP test scenarios")
+    parser.add_argument("-k", dest="keyword", default="",
+                        help="Keyword expression selecting scenarios, e.g. 'alipay' or 'static_premium and not parts'")
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES) + ["parts"],
+                        help="Only run scenarios from this suite (repeatable)")
+    parser.add_argument("--list", action="store_true", help="List the selected scenarios and exit")
+    parser.add_argument("--workers", type=int, default=None,
+                        help=f"Browsers per suite for website/admin scenarios "
+                             f"(default: {DEFAULT_WORKERS}, or every node slot with --node)")
+    parser.add_argument("--node", action="append", default=[], metavar="URL[#SLOTS]",
+                        help="Remote WebDriver node or Grid hub to run website/admin browsers on (repeatable); "
+                             "ShenLong_Parts scripts still run locally")
+    parser.add_argument("--tabs", type=int, default=1,
+                        help="Scenarios run concurrently in tabs of each browser (default: 1)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help=f"Per-scenario time limit in seconds (default: {DEFAULT_TIMEOUT})")
+    parser.add_argument("--shard", metavar="I/N",
+                        help="Only run shard I of N of the selection (e.g. 2/4), for splitting a run over machines")
+    parser.add_argument("--order", choices=["critical-path", "failed-first"], default="critical-path",
+                        help="critical-path: longest dependency chains first (default); failed-first: "
+                             "scenarios that failed or were flaky in recent runs first")
+    parser.add_argument("--resume", metavar="RUN_ID",
+                        help="Continue an interrupted run: its original selection minus the scenarios "
+                             "already in its journal (reports/runs/RUN_ID.jsonl)")
+    parser.add_argument("--profile-commands", action="store_true",
+                        help="Count WebDriver commands by type and call site, with latency histograms, in the reports")
+    parser.add_argument("--har", action="store_true",
+                        help="Write a gzipped HAR of every scenario's network traffic next to the reports (needs --tabs 1)")
+    parser.add_argument("--har-bodies", action="store_true", help="Include JSON and text response bodies in the HARs")
+    parser.add_argument("--console", action="store_true",
+                        help="Collect browser console messages and JS exceptions of every scenario (needs --tabs 1)")
+    parser.add_argument("--trace", action="store_true",
+                        help="Export scenarios, steps, waits and WebDriver commands of each suite as a Chrome trace-event file")
+    parser.add_argument("--dashboard", type=int, nargs="?", const=DEFAULT_PORT, metavar="PORT",
+                        help=f"Serve a live progress page on 127.0.0.1:PORT during the run (default port: {DEFAULT_PORT})")
+    args = parser.parse_args()
+
+    journal = None
+    if args.resume:
+        try:
+            journal = RunJournal(args.resume)
+        except FileNotFoundError as e:
+            parser.error(str(e))
+        completed = journal.completed()
+        by_id = {scenario["id"]: scenario for scenario in discover_scenarios()}
+        selected = [by_id[scenario_id] for scenario_id in journal.selected
+                    if scenario_id in by_id and scenario_id not in completed]
+    else:
+        try:
+            predicate = compile_keyword_expression(args.keyword)
+        except SyntaxError:
+            parser.error(f"Invalid -k expression '{args.keyword}'")
+        selected = [scenario for scenario in discover_scenarios()
+                    if (not args.suite or scenario["suite"] in args.suite) and predicate(scenario)]
+    if args.shard and not args.resume:
+        try:
+            shard_index, shard_count = parse_shard(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+        shard_ids = set(shard(dependency_groups(selected), shard_index, shard_count))
+        selected = [scenario for scenario in selected if scenario["id"] in shard_ids]
+
+    # Index reports/ once so runs from before the history existed count too (saved on real runs only)
+    failures = FailureHistory()
+    ingested = failures.ingest_reports()
+    priority = {}
+    if args.order == "failed-first":
+        ordered_ids = order_failed_first([scenario["id"] for scenario in selected], failures)
+        selected.sort(key=lambda scenario: ordered_ids.index(scenario["id"]))
+        priority = {scenario["id"]: failures.priority(scenario["id"]) for scenario in selected}
+
+    if args.list:
+        for scenario in selected:
+            history_text = f" {failures.summary(scenario['id'])[-10:]}" if args.order == "failed-first" else ""
+            print(f"{scenario['id']:<60} [{', '.join(scenario['keywords'])}]{history_text}")
+        print(f"\n{len(selected)} scenario(s) selected")
+        return 0
+    if not selected and not journal:
+        print("No scenarios match the selection")
+        return 1
+    if ingested:
+        failures.save()
+        print(f"Failure history: ingested {ingested} report(s) from reports/")
+
+    nodes = None
+    workers_per_suite = args.workers if args.workers is not None else DEFAULT_WORKERS
+    if args.node:
+        nodes = check_nodes([parse_node_spec(spec) for spec in args.node])
+        if not nodes:
+            print("No healthy WebDriver node available - aborting")
+            return 2
+        capacity = sum(node.slots for node in nodes)
+        workers_per_suite = min(args.workers if args.workers is not None else capacity, capacity)
+    if journal is None:
+        journal = RunJournal()
+        journal.start(scenario["id"] for scenario in selected)
+
+    print("=" * 80)
+    print("SHENLONG IP - COMPREHENSIVE TEST SUITE")
+    print("=" * 80)
+    print(f"Test Run Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Run ID: {journal.run_id} (journal: {journal.path})")
+    if args.resume:
+        print(f"Resuming: {len(journal.selected) - len(selected)} of {len(journal.selected)} scenario(s) already done")
+    print(f"Total Tests to Run: {len(selected)}")
+    print("=" * 80)
+
+    start = time.time()
+    history = DurationHistory()
+    interrupted = False
+
+    # Every selected scenario is on the page from the start, so the ETA covers the whole run
+    dashboard = None
+    if args.dashboard:
+        dashboard = LiveDashboard(port=args.dashboard, history=history)
+        if dashboard.start():
+            for suite_name in SUITES:
+                keys = [scenario["key"] for scenario in selected if scenario["suite"] == suite_name]
+                if keys:
+                    workers, tabs = suite_slots(suite_name, len(keys), workers_per_suite, args.tabs)
+                    dashboard.plan(suite_name, keys, workers * tabs)
+            dashboard.plan("parts", [part_key(scenario) for scenario in selected if scenario["suite"] == "parts"])
+        else:
+            dashboard = None
+
+    # With failed-first the suite holding the highest-scoring scenario runs first
+    suite_order = sorted(SUITES, key=lambda name: -max([score for scenario_id, score in priority.items()
+                                                        if scenario_id.startswith(f"{name}::")] or [0.0]))
+    try:
+        for suite_name in suite_order:
+            keys = [scenario["key"] for scenario in selected if scenario["suite"] == suite_name]
+            if not keys:
+                continue
+            workers, tabs = suite_slots(suite_name, len(keys), workers_per_suite, args.tabs)
+            node_urls = assign_workers(nodes, workers) if nodes else None
+            ordered, _, makespan, _ = plan_scenarios(
+                suite_name, keys, workers, tabs, history,
+                priority={key: priority.get(f"{suite_name}::{key}", 0.0) for key in keys})
+            print(f"\nSuite {suite_name}: {len(keys)} scenario(s) on {workers} worker(s) x {tabs} tab(s), "
+                  f"expected {makespan:.0f}s")
+            if node_urls:
+                print("Workers per node: " + ", ".join(f"{url} x{node_urls.count(url)}"
+                                                       for url in dict.fromkeys(node_urls)))
+            _, suite_durations, _, _ = run_parallel(suite_name, ordered, workers=workers, tabs=tabs,
+                                                    node_urls=node_urls, timeout=args.timeout, journal=journal,
+                                                    profile_commands=args.profile_commands,
+                                                    har=args.har or args.har_bodies, har_bodies=args.har_bodies,
+                                                    console=args.console, dashboard=dashboard, trace=args.trace)
+            for key, seconds in suite_durations.items():
+                history.record(f"{suite_name}:{key}", seconds)
+            history.save()
+
+        parts = [scenario for scenario in selected if scenario["suite"] == "parts"]
+        if parts:
+            run_parts(parts, args.timeout, journal, dashboard)
+    except KeyboardInterrupt:
+        interrupted = True
+        print(f"\nInterrupted - finished scenarios are in {journal.path}")
+
+    if dashboard:
+        dashboard.finish()
+
+    # The summary covers the whole run, including sessions before a --resume
+    total_time = time.time() - start
+    results, durations, skipped = merge_journal(journal)
+    reports = journal.reports()
+    passed = sum(1 for success in results.values() if success)
+    write_results_file(results, durations, skipped, reports, total_time)
+    write_machine_results(results, durations, skipped, reports, journal.run_id)
+
+    print("\n" + "=" * 80)
+    print("TEST EXECUTION SUMMARY")
+    print("=" * 80)
+    for scenario_id, success in results.items():
+        status = "SKIP" if scenario_id in skipped else "PASS" if success else "FAIL"
+        print(f"  {status:<6} {scenario_id} {skipped.get(scenario_id, '')}")
+    print("-" * 80)
+    print(f"Total Execution Time: {total_time:.2f} seconds")
+    print(f"Passed: {passed}/{len(results)}")
+    print(f"Failed: {len(results) - passed - len(skipped)}/{len(results)}")
+    print(f"Skipped: {len(skipped)}/{len(results)}")
+    success_rate = passed / len(results) * 100 if results else 0.0
+    print(f"Success Rate: {success_rate:.1f}%")
+    print(f"Results saved to: {RESULTS_FILE} ({RESULTS_JSON}, {RESULTS_JUNIT})")
+    for report in reports:
+        print(f"Detailed HTML Report: {report}")
+    if interrupted or any(reason == "not run (interrupted)" for reason in skipped.values()):
+        print(f"Resume with: python run_all_tests.py --resume {journal.run_id}")
+    print("=" * 80)
+    if interrupted:
+        return 130
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
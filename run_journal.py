@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+"""
+Run Journal
+运行日志 - 逐场景落盘, 中断后可用 --resume 继续
+
+Every finished scenario is appended to reports/runs/<run-id>.jsonl as soon as
+its result is known, so a crash or Ctrl-C loses at most the scenarios that
+were still running. One JSON object per line:
+
+    {"type": "run", "selected": [...], "started": "..."}        first line of a run
+    {"type": "scenario", "id": "website::dynamic_advanced.alipay",
+     "status": "PASS", "duration": 84.2, "reason": ""}          one per finished scenario
+    {"type": "report", "path": "reports/package6_comprehensive_test_....html"}
+
+`run_all_tests.py --resume <run-id>` reopens the journal, runs the selected
+scenarios that have no result yet (or were skipped because the environment
+was down) and appends to the same file; the final summary is built from the
+whole journal.
+"""
+
+import json
+import os
+from datetime import datetime
+
+from circuit_breaker import SKIP_REASON
+
+JOURNAL_DIR = os.path.join("reports", "runs")
+
+
+class RunJournal:
+    """Append-only record of one test run's scenario results"""
+
+    def __init__(self, run_id=None, directory=JOURNAL_DIR):
+        """
+        Args:
+            run_id: Existing run to reopen; a new id is created when omitted
+            directory: Where journals are kept
+        """
+        self.entries = []
+        os.makedirs(directory, exist_ok=True)
+        if not run_id:
+            self.run_id, self.path = self._create(directory)
+            return
+        self.run_id = run_id
+        self.path = os.path.join(directory, f"{self.run_id}.jsonl")
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"No run journal for run id '{run_id}' ({self.path})")
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    self.entries.append(json.loads(line))
+                except ValueError:
+                    pass  # Last line cut short by a crash
+
+    @staticmethod
+    def _create(directory):
+        """
+        Create the journal file of a new run with O_EXCL
+
+        Runs started in the same second (e.g. two runners launched together) get
+        ids with a _2, _3, ... suffix instead of appending to one journal.
+
+        Returns:
+            tuple: (run id, journal path)
+        """
+        base = datetime.now().strftime("%Y%m%d_%H%M%S")
+        suffix = 1
+        while True:
+            run_id = base if suffix == 1 else f"{base}_{suffix}"
+            path = os.path.join(directory, f"{run_id}.jsonl")
+            try:
+                os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return run_id, path
+            except FileExistsError:
+                suffix += 1
+
+    def _append(self, entry):
+        self.entries.append(entry)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def start(self, selected):
+        """Record the scenario ids this run was asked to execute"""
+        self._append({"type": "run", "selected": list(selected),
+                      "started": datetime.now().strftime("%Y-%m-%d %H:%M:%S")})
+
+    def record(self, scenario_id, success, duration=None, reason=""):
+        """
+        Record one finished scenario
+
+        Args:
+            scenario_id: "<suite>::<key>" id as used by run_all_tests.py
+            success: True if the scenario passed
+            duration: Seconds the scenario ran (None when it never started)
+            reason: Why the scenario was skipped, "" if it ran
+        """
+        status = "SKIP" if reason else "PASS" if success else "FAIL"
+        self._append({"type": "scenario", "id": scenario_id, "status": status,
+                      "duration": round(duration, 2) if duration is not None else None,
+                      "reason": reason,
+                      "finished": datetime.now().strftime("%Y-%m-%d %H:%M:%S")})
+
+    def record_report(self, path):
+        """Record an HTML report produced by this run"""
+        self._append({"type": "report", "path": path})
+
+    @property
+    def selected(self):
+        """Scenario ids selected when the run was first started"""
+        for entry in self.entries:
+            if entry["type"] == "run":
+                return entry["selected"]
+        return []
+
+    def outcomes(self):
+        """Latest journal entry per scenario id"""
+        latest = {}
+        for entry in self.entries:
+            if entry["type"] == "scenario":
+                latest[entry["id"]] = entry
+        return latest
+
+    def completed(self):
+        """Ids that already have a result; scenarios skipped for a down environment must run again"""
+        return {scenario_id for scenario_id, entry in self.outcomes().items()
+                if not entry["reason"].startswith(SKIP_REASON)}
+
+    def reports(self):
+        return list(dict.fromkeys(entry["path"] for entry in self.entries if entry["type"] == "report"))
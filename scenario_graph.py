@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+
+"""
+Scenario Dependency Graph
+场景依赖图 - 声明式依赖、状态、清理与资源冲突
+
+Suite modules describe how their scenarios relate in an optional
+SCENARIO_RULES dict next to SCENARIOS:
+
+    SCENARIO_RULES = {
+        "fixed_long_term.balance_payment": {
+            "requires": ["fixed_long_term.switch_off"],   # states that must exist first
+            "resources": ["fixed_long_term_history"],     # never held by two running scenarios
+        },
+        "fixed_long_term.pending_order": {
+            "provides": ["fixed_long_term.switch_off"],   # states left behind on success
+            "resources": ["fixed_long_term_history"],
+            "cleanup": some_function,                     # cleanup(driver, reporter), always run after
+        },
+        "other.scenario": {"after": ["some.key"]},        # plain ordering edge
+        "per_user.scenario": {
+            "worker_resources": ["history_table"],        # never held by two running scenarios of one
+        },                                                # worker (e.g. rows of the worker's leased user)
+    }
+
+The account a scenario needs stays in SCENARIOS and is handled by the worker's
+account gate. Everything else without a dependency edge or a shared resource
+runs concurrently; the parallel runner dispatches scenarios from GraphScheduler
+as they become ready.
+"""
+
+RULE_FIELDS = ("after", "requires", "provides", "resources", "worker_resources", "cleanup")
+
+
+class ScenarioGraph:
+    """Dependency edges, resources and cleanups for one suite's scenarios"""
+
+    def __init__(self, scenarios, rules=None):
+        """
+        Args:
+            scenarios: The suite's SCENARIOS list of (key, account, func)
+            rules: The suite's SCENARIO_RULES dict (optional)
+        """
+        rules = rules or {}
+        self.keys = [key for key, _, _ in scenarios]
+        self.accounts = {key: account for key, account, _ in scenarios}
+
+        for key, rule in rules.items():
+            if key not in self.accounts:
+                raise ValueError(f"SCENARIO_RULES refers to unknown scenario '{key}'")
+            unknown = set(rule) - set(RULE_FIELDS)
+            if unknown:
+                raise ValueError(f"Unknown rule field(s) {sorted(unknown)} for scenario '{key}'")
+
+        self.resources = {key: set(rules.get(key, {}).get("resources", [])) for key in self.keys}
+        self.worker_resources = {key: set(rules.get(key, {}).get("worker_resources", [])) for key in self.keys}
+        self.cleanups = {key: rules[key]["cleanup"] for key in self.keys if rules.get(key, {}).get("cleanup")}
+
+        providers = {}
+        for key in self.keys:
+            for state in rules.get(key, {}).get("provides", []):
+                providers.setdefault(state, set()).add(key)
+
+        self.dependencies = {}
+        for key in self.keys:
+            rule = rules.get(key, {})
+            deps = set(rule.get("after", []))
+            for state in rule.get("requires", []):
+                if state not in providers:
+                    raise ValueError(f"Scenario '{key}' requires state '{state}' that no scenario provides")
+                deps |= providers[state]
+            missing = deps - set(self.keys)
+            if missing:
+                raise ValueError(f"Scenario '{key}' depends on unknown scenario(s) {sorted(missing)}")
+            self.dependencies[key] = deps - {key}
+
+        self.topological_order()  # Raises on cycles
+
+    @classmethod
+    def from_suite(cls, suite):
+        return cls(suite.SCENARIOS, getattr(suite, "SCENARIO_RULES", None))
+
+    def topological_order(self, keys=None):
+        """Return keys in dependency order, raising ValueError on a cycle"""
+        keys = list(keys if keys is not None else self.keys)
+        selected = set(keys)
+        remaining = {key: self.dependencies[key] & selected for key in keys}
+        order = []
+        while remaining:
+            ready = [key for key in keys if key in remaining and not remaining[key]]
+            if not ready:
+                raise ValueError(f"Dependency cycle between scenarios {sorted(remaining)}")
+            for key in ready:
+                order.append(key)
+                del remaining[key]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
+
+    def with_dependencies(self, keys):
+        """keys plus everything they transitively depend on"""
+        selected = set()
+        stack = list(keys)
+        while stack:
+            key = stack.pop()
+            if key not in selected:
+                selected.add(key)
+                stack.extend(self.dependencies[key])
+        return [key for key in self.keys if key in selected]
+
+    def critical_path(self, keys, estimates):
+        """
+        Upward rank of every key: its own estimate plus the longest chain of dependents
+
+        Dispatching the highest rank first is longest-first scheduling that also
+        starts long dependency chains early.
+        """
+        selected = set(keys)
+        dependents = {key: [other for other in keys if key in self.dependencies[other]] for key in keys}
+        rank = {}
+        for key in reversed(self.topological_order(keys)):
+            rank[key] = estimates[key] + max((rank[dep] for dep in dependents[key] if dep in selected), default=0)
+        return rank
+
+
+class GraphScheduler:
+    """
+    Hands out ready scenarios of a ScenarioGraph while respecting dependencies and resources
+
+    A scenario is ready when all its dependencies finished successfully, none
+    of its resources is held by a running scenario and none of its worker
+    resources is held by a scenario running on the same worker. Scenarios whose
+    dependency failed are never started and are reported by finish() as blocked.
+    """
+
+    def __init__(self, graph, keys, priority=None):
+        """
+        Args:
+            graph: ScenarioGraph of the suite
+            keys: Scenario keys to run (dependencies outside this set are treated as satisfied)
+            priority: Optional dict of key -> rank; higher ranks are dispatched first
+        """
+        self.graph = graph
+        self.selected = set(keys)
+        priority = priority or {}
+        self.pending = sorted(keys, key=lambda key: -priority.get(key, 0))
+        self.running = set()
+        self.worker_of = {}   # running key -> worker it was started on (None when not given)
+        self.passed = set()
+        self.failed = set()
+
+    def _is_ready(self, key, worker):
+        deps = self.graph.dependencies[key] & self.selected
+        if not deps <= self.passed:
+            return False
+        held = set().union(*(self.graph.resources[other] for other in self.running)) if self.running else set()
+        if self.graph.resources[key] & held:
+            return False
+        on_worker = [other for other in self.running if self.worker_of[other] == worker]
+        held = set().union(*(self.graph.worker_resources[other] for other in on_worker)) if on_worker else set()
+        return not (self.graph.worker_resources[key] & held)
+
+    def next_ready(self, worker=None):
+        """Start and return the highest-priority scenario ready to run on worker, or None"""
+        for key in self.pending:
+            if self._is_ready(key, worker):
+                self.pending.remove(key)
+                self.running.add(key)
+                self.worker_of[key] = worker
+                return key
+        return None
+
+    def finish(self, key, success):
+        """
+        Record a finished scenario
+
+        Returns:
+            list: (key, failed dependency) for every pending scenario that can no longer run
+        """
+        self.running.discard(key)
+        self.worker_of.pop(key, None)
+        (self.passed if success else self.failed).add(key)
+
+        blocked = []
+        changed = True
+        while changed:
+            changed = False
+            for other in list(self.pending):
+                failed_deps = self.graph.dependencies[other] & self.failed
+                if failed_deps:
+                    self.pending.remove(other)
+                    self.failed.add(other)
+                    blocked.append((other, sorted(failed_deps)[0]))
+                    changed = True
+        return blocked
+
+    def done(self):
+        return not self.pending and not self.running
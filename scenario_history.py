@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+"""
+Scenario Duration History
+场景耗时历史 - 用于最长优先调度
+
+Keeps the recent per-scenario durations of previous runs in a small JSON store
+under reports/ and turns them into a longest-processing-time-first (LPT) plan
+for the parallel runner.
+"""
+
+import json
+import os
+import statistics
+
+HISTORY_PATH = os.path.join("reports", "scenario_durations.json")
+
+# Estimate (seconds) for scenarios that have never been timed
+DEFAULT_ESTIMATE = 90.0
+
+# Number of recent samples kept per scenario
+MAX_SAMPLES = 20
+
+
+class DurationHistory:
+    """Local store of past scenario durations"""
+
+    def __init__(self, path=HISTORY_PATH):
+        self.path = path
+        self.durations = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.durations = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Could not read duration history {path}: {e}")
+
+    def record(self, key, seconds):
+        """Add one measured duration for a scenario"""
+        samples = self.durations.setdefault(key, [])
+        samples.append(round(seconds, 2))
+        del samples[:-MAX_SAMPLES]
+
+    def estimate(self, key, default=DEFAULT_ESTIMATE):
+        """Median of the recent durations, or default when there is no history"""
+        samples = self.durations.get(key)
+        if not samples:
+            return default
+        return statistics.median(samples)
+
+    def save(self):
+        """Write the history back to disk"""
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.durations, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def plan_longest_first(keys, estimates, workers):
+    """
+    Order scenarios longest-first and simulate greedy assignment to workers
+
+    Workers pull the next scenario from a shared queue as soon as they are free,
+    so dispatching in descending-estimate order is LPT list scheduling.
+
+    Args:
+        keys: Scenario keys to schedule
+        estimates: dict of key -> estimated seconds
+        workers: Number of parallel workers
+
+    Returns:
+        tuple: (ordered keys, expected makespan in seconds, per-worker expected load list)
+    """
+    ordered = sorted(keys, key=lambda key: estimates[key], reverse=True)
+    loads = [0.0] * max(1, workers)
+    for key in ordered:
+        least_loaded = loads.index(min(loads))
+        loads[least_loaded] += estimates[key]
+    return ordered, max(loads), loads
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+"""
+Scenario Matrix
+场景矩阵 - 由声明式表格生成场景, 并均匀分片
+
+A suite describes a family of scenarios as axes of named values instead of
+one hand-written function per combination:
+
+    PURCHASE_AXES = [
+        ("entry_point", ENTRY_POINTS),      # meal_page, personal_center
+        ("package", PURCHASE_PACKAGES),     # dynamic_advanced, static_premium, ...
+        ("payment", PAYMENT_METHODS),       # wallet, alipay, wechat
+    ]
+    SCENARIOS += build_scenarios(PURCHASE_AXES, run_purchase, purchase_key, "balance",
+                                 supported=purchase_supported)
+
+Every combination becomes a (key, account, func) entry of SCENARIOS, so adding
+a row to any table adds its combinations to parallel_runner.py and
+run_all_tests.py without further code.
+
+shard() splits a list of scenario groups into N near-equal shards so several
+machines (or CI jobs) can each run one part of the same selection.
+"""
+
+import itertools
+import zlib
+
+
+def expand(axes, supported=None):
+    """
+    Every combination of the axis values, first axis varying slowest
+
+    Args:
+        axes: List of (axis name, dict of value name -> spec)
+        supported: Optional predicate(cell) dropping combinations that do not exist
+
+    Returns:
+        list: Cells - dicts of axis name -> value name
+    """
+    names = [axis for axis, _ in axes]
+    cells = []
+    for values in itertools.product(*(list(table) for _, table in axes)):
+        cell = dict(zip(names, values))
+        if supported is None or supported(cell):
+            cells.append(cell)
+    return cells
+
+
+def build_scenarios(axes, runner, key, account, supported=None):
+    """
+    Turn the combinations of axes into SCENARIOS entries
+
+    Args:
+        axes: List of (axis name, dict of value name -> spec)
+        runner: runner(driver, reporter, cell) running one combination, returns bool
+        key: key(cell) -> scenario key
+        account: Account the scenarios log in with, or account(cell) -> account
+        supported: Optional predicate(cell) dropping combinations that do not exist
+
+    Returns:
+        list: (scenario key, account, test function) tuples in matrix order
+    """
+    scenarios = []
+    for cell in expand(axes, supported):
+        scenario_key = key(cell)
+        scenarios.append((scenario_key, account(cell) if callable(account) else account,
+                          _scenario_function(runner, cell, scenario_key)))
+    return scenarios
+
+
+def _scenario_function(runner, cell, scenario_key):
+    def scenario(driver, reporter):
+        return runner(driver, reporter, cell)
+    scenario.__name__ = "test_" + scenario_key.replace(".", "_")
+    scenario.__qualname__ = scenario.__name__
+    scenario.__doc__ = f"Matrix scenario {scenario_key}: {cell}"
+    scenario.cell = cell
+    return scenario
+
+
+def parse_shard(spec):
+    """Parse "I/N" (1-based shard I of N) into (index, count)"""
+    index, _, count = spec.partition("/")
+    if not (index.isdigit() and count.isdigit()) or not 1 <= int(index) <= int(count):
+        raise ValueError(f"Invalid shard '{spec}', expected I/N with 1 <= I <= N")
+    return int(index), int(count)
+
+
+def shard(groups, index, count):
+    """
+    Pick shard index of count from groups of scenarios
+
+    Groups are kept whole (scenarios that depend on each other must run in the
+    same shard) and are dealt to the shard with the fewest scenarios, so shard
+    sizes differ by at most the largest group. Dealing in matrix order would put
+    every Alipay scenario in the same shard whenever the shard count divides the
+    number of payment methods, so groups are dealt in the order of a CRC32 of
+    their ids instead. The split depends only on the ids, so every machine
+    computes the same partition.
+
+    Args:
+        groups: List of lists of scenario ids, in a stable order
+        index: 1-based shard number
+        count: Number of shards
+
+    Returns:
+        list: Scenario ids of the selected shard, in their original order
+    """
+    sizes = [0] * count
+    selected = set()
+    for group in sorted(groups, key=lambda group: (zlib.crc32(" ".join(group).encode('utf-8')), group)):
+        target = sizes.index(min(sizes))
+        sizes[target] += len(group)
+        if target == index - 1:
+            selected.update(group)
+    return [scenario_id for group in groups for scenario_id in group if scenario_id in selected]
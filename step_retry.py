@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+"""
+Step-Level Retry With Checkpoints
+步骤级重试 - 失败时从最近的检查点继续, 而不是重跑整个流程
+
+A scenario is written as a list of stages. Each stage is a function
+stage(driver, reporter, state) that fails by returning False, failing an
+assert or raising; the state dict carries values between stages (window
+handles, payment page URL, ...).
+
+Stages may declare an idempotent checkpoint that is reached once they pass:
+
+    stages = [
+        Stage("Open Order Form", open_order_form),
+        Stage("Submit Order", submit_order, checkpoint="order created"),
+        Stage("Open Alipay Page", open_alipay_page, checkpoint="on payment page",
+              restore=return_to_alipay_page),
+        Stage("Pay With Alipay", pay_with_alipay),
+    ]
+    success = run_stages(driver, reporter, stages, {"cell": cell})
+
+When a stage fails, run_stages waits, calls the restore function of the last
+checkpoint reached (to bring the browser back to that state) and continues
+with the stage after it, so a failed Alipay login does not create a second
+order. Without a checkpoint the scenario starts over from the first stage.
+"""
+
+import functools
+import time
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_DELAY = 2
+
+
+class Stage:
+    """One step of a scenario, optionally ending at a checkpoint"""
+
+    def __init__(self, name, func, checkpoint=None, restore=None):
+        """
+        Args:
+            name: Step name used in the report
+            func: func(driver, reporter, state); False, AssertionError or any exception is a failure
+            checkpoint: Name of the state reached when this stage passes (retries resume after it)
+            restore: restore(driver, reporter, state) bringing the browser back to the checkpoint
+        """
+        self.name = name
+        self.func = func
+        self.checkpoint = checkpoint
+        self.restore = restore
+
+    def __repr__(self):
+        return f"Stage({self.name!r}, checkpoint={self.checkpoint!r})"
+
+
+def _attempt(func, *args, **kwargs):
+    """Run func, returning (result, error text or None); False and failed asserts are failures"""
+    try:
+        result = func(*args, **kwargs)
+    except AssertionError as e:
+        return None, f"assertion failed: {str(e) or 'AssertionError'}"
+    except Exception as e:
+        return None, f"{type(e).__name__}: {str(e).strip().splitlines()[0] if str(e).strip() else ''}"
+    if result is False:
+        return result, "returned False"
+    return result, None
+
+
+def run_stages(driver, reporter, stages, state=None, name="Scenario",
+               max_attempts=DEFAULT_MAX_ATTEMPTS, delay=DEFAULT_DELAY):
+    """
+    Run stages in order, retrying failures from the last checkpoint reached
+
+    Args:
+        driver: Selenium WebDriver instance
+        reporter: TestReporter (or QueueReporter) for logging
+        stages: List of Stage
+        state: Dict shared by the stages (default: empty)
+        name: Scenario title used for the final FAIL step
+        max_attempts: Attempts for the whole scenario, counting the first one
+        delay: Seconds to wait before resuming
+
+    Returns:
+        bool: True if every stage passed within max_attempts
+    """
+    state = state if state is not None else {}
+    resume_index = 0
+    restore = None
+    checkpoint = None
+    attempt = 1
+    index = 0
+    while index < len(stages):
+        stage = stages[index]
+        _, error = _attempt(stage.func, driver, reporter, state)
+        if error is None:
+            if stage.checkpoint:
+                resume_index, restore, checkpoint = index + 1, stage.restore, stage.checkpoint
+                reporter.add_step("Checkpoint", "INFO", f"Reached '{stage.checkpoint}'", attempt=attempt)
+            index += 1
+            continue
+
+        while True:
+            if attempt >= max_attempts:
+                reporter.add_step(f"{name} Error", "FAIL", f"{stage.name} failed: {error}", attempt=attempt)
+                return False
+            attempt += 1
+            resume_text = f"checkpoint '{checkpoint}'" if checkpoint else "the start"
+            reporter.add_step(f"Retry {stage.name}", "INFO",
+                              f"{stage.name} failed ({error}) - resuming from {resume_text} "
+                              f"in {delay}s (attempt {attempt}/{max_attempts})", attempt=attempt)
+            time.sleep(delay)
+            if restore is None:
+                break
+            _, error = _attempt(restore, driver, reporter, state)
+            if error is None:
+                break
+            error = f"could not restore checkpoint '{checkpoint}': {error}"
+        index = resume_index
+    return True
+
+
+def retry_test(func=None, max_attempts=DEFAULT_MAX_ATTEMPTS, delay=DEFAULT_DELAY):
+    """
+    Decorator to retry a whole scenario function func(driver, reporter, ...) on failure
+
+    A result of False, a failed assert and any other exception all count as
+    failures; every retry is reported as a "Retry <function>" INFO step like the
+    retries of run_stages. The last attempt's result is returned (or its exception
+    raised). Only use it for scenarios that are safe to start over (no order is
+    created); for flows with expensive steps prefer run_stages, which resumes
+    from a checkpoint.
+
+    Args:
+        func: The function to decorate (when used without parentheses)
+        max_attempts: Maximum number of attempts (default: 3)
+        delay: Delay between retries in seconds (default: 2)
+    """
+    def decorator(f):
+        @functools.wraps(f)
+        def wrapper(driver, reporter, *args, **kwargs):
+            for attempt in range(1, max_attempts + 1):
+                if attempt == max_attempts:
+                    return f(driver, reporter, *args, **kwargs)
+                result, error = _attempt(f, driver, reporter, *args, **kwargs)
+                if error is None:
+                    return result
+                reporter.add_step(f"Retry {f.__name__}", "INFO",
+                                  f"{f.__name__} failed ({error}) - starting over in {delay}s "
+                                  f"(attempt {attempt + 1}/{max_attempts})", attempt=attempt + 1)
+                time.sleep(delay)
+        return wrapper
+
+    if func is None:
+        # Called with arguments: @retry_test(max_attempts=5)
+        return decorator
+    # Called without arguments: @retry_test
+    return decorator(func)
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+"""
+Multi-Tab Scenario Executor
+多标签页并发执行 - 同一浏览器内并发运行多个场景
+
+Most purchase scenarios spend their time idle (WeChat QR checks sleep 10 s,
+Alipay redirects sleep 30 s). TabExecutor lets several independent scenarios
+share one authenticated browser: each scenario runs in its own thread and gets
+a TabDriver bound to its own tab.
+
+A TabDriver is a full WebDriver on the same session. Every command it sends
+takes the executor lock and, only if another tab was focused last, switches
+the browser to this scenario's window first. Sleeps and the gaps between
+WebDriverWait polls hold no lock, so other tabs act while one is idle.
+
+Window handles are bookkept per scenario:
+    - a popup (such as the Alipay tab opened by a pay click) belongs to the
+      scenario whose click or script ran last before it appeared; new handles
+      are claimed under the executor lock right after each such command, so
+      two scenarios clicking Pay at the same time never see each other's popup
+    - driver.window_handles only lists the scenario's own windows
+    - close_tab() closes every window the scenario owns
+"""
+
+import threading
+
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.switch_to import SwitchTo
+from selenium.webdriver.remote.webdriver import WebDriver
+
+# Commands that do not act on a window, so they never need a focus switch
+_UNFOCUSED_COMMANDS = {
+    getattr(Command, name)
+    for name in ("W3C_GET_WINDOW_HANDLES", "GET_WINDOW_HANDLES", "NEW_WINDOW", "SWITCH_TO_WINDOW", "QUIT")
+    if hasattr(Command, name)
+}
+
+# Commands that can open a popup; new windows are claimed by the tab right after them
+_POPUP_COMMANDS = {
+    getattr(Command, name)
+    for name in ("CLICK_ELEMENT", "SEND_KEYS_TO_ELEMENT", "W3C_EXECUTE_SCRIPT", "W3C_EXECUTE_SCRIPT_ASYNC",
+                 "EXECUTE_SCRIPT", "EXECUTE_ASYNC_SCRIPT", "SUBMIT_ELEMENT")
+    if hasattr(Command, name)
+}
+
+
+class TabDriver(WebDriver):
+    """WebDriver view of a shared browser session restricted to one scenario's windows"""
+
+    def __init__(self, executor, handle):
+        # Share the parent session (command executor, session id, capabilities)
+        # instead of starting a new browser
+        self.__dict__.update(executor.driver.__dict__)
+        self._switch_to = SwitchTo(self)
+        self._tabs = executor
+        self.handle = handle
+
+    def execute(self, driver_command, params=None):
+        with self._tabs.lock:
+            if driver_command not in _UNFOCUSED_COMMANDS:
+                self._tabs.focus(self.handle)
+            response = super().execute(driver_command, params)
+
+            if driver_command == Command.SWITCH_TO_WINDOW:
+                # Scenario moved to another window, e.g. the Alipay popup
+                self.handle = params["handle"]
+                self._tabs.owners[self.handle] = self
+                self._tabs.focused = self.handle
+            elif driver_command == Command.CLOSE:
+                self._tabs.owners.pop(self.handle, None)
+                self._tabs.focused = None
+            elif driver_command in _POPUP_COMMANDS:
+                self._tabs.last_actor = self
+                self._tabs.claim_new_windows()
+            return response
+
+    @property
+    def window_handles(self):
+        """Handles owned by this scenario, in browser order"""
+        with self._tabs.lock:
+            handles = self._tabs.claim_new_windows()
+            return [handle for handle in handles if self._tabs.owners.get(handle) is self]
+
+    @property
+    def owned_handles(self):
+        with self._tabs.lock:
+            return [handle for handle, owner in self._tabs.owners.items() if owner is self]
+
+    def quit(self):
+        """Scenarios must not end the shared session - close this scenario's windows instead"""
+        self._tabs.close_tab(self)
+
+
+class TabExecutor:
+    """Hands out TabDrivers for one real browser and serialises focus between them"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.lock = threading.RLock()
+        # The original window stays open so the session survives closing every tab
+        self.home_handle = driver.current_window_handle
+        self.focused = self.home_handle
+        self.owners = {}
+        self.seen = {self.home_handle}   # Handles already attributed (or left unowned, like the home window)
+        self.last_actor = None           # Tab whose click or script ran last
+
+    def focus(self, handle):
+        """Switch the browser to handle if it is not focused already (lock must be held)"""
+        if handle is not None and self.focused != handle:
+            self.driver.switch_to.window(handle)
+            self.focused = handle
+
+    def claim_new_windows(self):
+        """
+        Give windows that appeared since the last call to the tab that acted last (lock must be held)
+
+        A popup opened with a delay (after an XHR) is still attributed correctly as long as
+        no other tab clicked in between; a window appearing before any tab acted stays unowned.
+
+        Returns:
+            list: All window handles of the browser, in browser order
+        """
+        handles = self.driver.window_handles
+        for handle in handles:
+            if handle not in self.seen and handle not in self.owners and self.last_actor is not None:
+                self.owners[handle] = self.last_actor
+        self.seen.update(handles)
+        return handles
+
+    def open_tab(self):
+        """Open a new tab and return a TabDriver bound to it"""
+        with self.lock:
+            self.driver.switch_to.new_window('tab')
+            handle = self.driver.current_window_handle
+            self.focused = handle
+            tab = TabDriver(self, handle)
+            self.owners[handle] = tab
+            return tab
+
+    def close_tab(self, tab):
+        """Close every window owned by tab"""
+        with self.lock:
+            for handle in tab.owned_handles:
+                try:
+                    self.focus(handle)
+                    self.driver.close()
+                except Exception as e:
+                    print(f"Could not close window {handle}: {e}")
+                finally:
+                    self.owners.pop(handle, None)
+                    self.focused = None
+            self.focus(self.home_handle)
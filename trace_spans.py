@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+
+"""
+Trace Spans
+链路追踪 - 场景、步骤、等待与 WebDriver 命令导出为 Chrome trace-event 文件
+
+With --trace (run_all_tests.py, parallel_runner.py) a run is exported as one
+Chrome trace-event JSON file, reports/<report>.trace.json, which opens in
+chrome://tracing and https://ui.perfetto.dev. Every worker is a process and
+every tab a thread, so contention between workers, idle gaps and the critical
+path of the run are visible at a glance. Spans nest by time:
+
+    scenario   scenario_start / scenario_end of the event file  worker, status
+    step       the step's start_ns / end_ns (see report_stream.StepClock)
+                                                                 attempt, status, message, category
+    wait       WebDriverWait.until / until_not                  condition, selector, timeout, timed_out
+    sleep      time.sleep                                       seconds
+    command    WebDriver.execute                                command, selector, url
+
+Scenario and step spans come from the report's event file, whose "run" event
+maps the main process's perf_counter_ns clock to epoch time. Waits, sleeps
+and commands are recorded in the worker processes while a scenario runs and
+appended per scenario to reports/<report>_trace/<process>.jsonl, whose first
+line does the same for the worker's clock, so steps timed by a worker line up
+exactly with its commands. Typed text (sendKeys) and script arguments are
+never recorded.
+
+    python trace_spans.py reports/website_purchase_test_20240115_143025.jsonl   # rebuild the trace
+"""
+
+import argparse
+import functools
+import json
+import os
+import threading
+import time
+
+# Characters of a script or step message kept as a span attribute
+MAX_ATTRIBUTE_LENGTH = 200
+
+_state = threading.local()
+_enable_lock = threading.Lock()
+_write_lock = threading.Lock()
+_path = None
+
+
+def trace_dir(events_path):
+    """Span directory of a report's event file"""
+    return os.path.splitext(events_path)[0] + "_trace"
+
+
+def _span(category, name, start_ns, args):
+    spans = getattr(_state, "spans", None)
+    if spans is not None:
+        spans.append({"cat": category, "name": name, "start_ns": start_ns, "end_ns": time.perf_counter_ns(),
+                      "args": args})
+
+
+def _command_args(driver_command, params):
+    args = {"command": driver_command}
+    if params:
+        if "using" in params and "value" in params:
+            args["selector"] = f"{params['using']}={params['value']}"
+        if "url" in params:
+            args["url"] = params["url"]
+        if "script" in params:
+            args["script"] = str(params["script"]).strip()[:MAX_ATTRIBUTE_LENGTH]
+    return args
+
+
+def _traced_execute(execute):
+    @functools.wraps(execute)
+    def wrapper(self, driver_command, params=None):
+        if getattr(_state, "spans", None) is None:
+            return execute(self, driver_command, params)
+        start_ns = time.perf_counter_ns()
+        try:
+            return execute(self, driver_command, params)
+        finally:
+            _span("command", driver_command, start_ns, _command_args(driver_command, params))
+
+    return wrapper
+
+
+def _condition_args(method):
+    """Name and locator of an expected_conditions predicate, e.g. element_to_be_clickable((By.ID, "pay"))"""
+    args = {"condition": getattr(method, "__qualname__", type(method).__name__).split(".<locals>")[0]}
+    for cell in getattr(method, "__closure__", None) or ():
+        try:
+            value = cell.cell_contents
+        except ValueError:
+            continue
+        if isinstance(value, tuple) and len(value) == 2 and all(isinstance(part, str) for part in value):
+            args["selector"] = f"{value[0]}={value[1]}"
+            break
+    return args
+
+
+def _traced_wait(name, until):
+    @functools.wraps(until)
+    def wrapper(self, method, message=""):
+        if getattr(_state, "spans", None) is None:
+            return until(self, method, message)
+        args = _condition_args(method)
+        args["timeout"] = getattr(self, "_timeout", None)
+        start_ns = time.perf_counter_ns()
+        try:
+            return until(self, method, message)
+        except Exception as e:
+            args["timed_out"] = type(e).__name__
+            raise
+        finally:
+            _span("wait", f"{name} {args['condition']}", start_ns, args)
+
+    return wrapper
+
+
+def _traced_sleep(sleep):
+    @functools.wraps(sleep)
+    def wrapper(seconds):
+        if getattr(_state, "spans", None) is None:
+            return sleep(seconds)
+        start_ns = time.perf_counter_ns()
+        try:
+            return sleep(seconds)
+        finally:
+            _span("sleep", f"sleep {seconds}s", start_ns, {"seconds": seconds})
+
+    return wrapper
+
+
+def enable(directory, process):
+    """
+    Record the spans of every scenario run in this process to <directory>/<process>.jsonl
+
+    Wraps WebDriver.execute, WebDriverWait.until / until_not and time.sleep once per process.
+    """
+    global _path
+    with _enable_lock:
+        if _path is not None:
+            return
+        os.makedirs(directory, exist_ok=True)
+        _path = os.path.join(directory, f"{process}.jsonl")
+        with open(_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({"type": "clock", "process": str(process), "pid": os.getpid(),
+                                "offset_ns": time.time_ns() - time.perf_counter_ns()}) + "\n")
+        time.sleep = _traced_sleep(time.sleep)
+        try:
+            from selenium.webdriver.remote.webdriver import WebDriver
+            from selenium.webdriver.support.ui import WebDriverWait
+        except ImportError:
+            return  # Only sleeps can be traced without Selenium
+        WebDriver.execute = _traced_execute(WebDriver.execute)
+        WebDriverWait.until = _traced_wait("until", WebDriverWait.until)
+        WebDriverWait.until_not = _traced_wait("until_not", WebDriverWait.until_not)
+
+
+def is_enabled():
+    return _path is not None
+
+
+def begin(key, worker=None):
+    """Record the calling thread's spans as scenario key run by worker (no-op unless enabled)"""
+    _state.spans = [] if _path else None
+    _state.key = key
+    _state.worker = worker
+
+
+def end():
+    """
+    Stop recording the calling thread's scenario and append its spans to the process's span file
+
+    Returns:
+        int: Number of spans written (0 when not tracing)
+    """
+    spans = getattr(_state, "spans", None)
+    _state.spans = None
+    if not spans:
+        return 0
+    record = {"type": "spans", "scenario": _state.key, "worker": None if _state.worker is None else str(_state.worker),
+              "spans": spans}
+    try:
+        with _write_lock, open(_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"Could not write trace spans of {_state.key}: {e}")
+        return 0
+    return len(spans)
+
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+
+def _ids(worker):
+    """Trace pid / tid of a worker id: "2.3" is tab 3 of worker 2, None the main process"""
+    if worker is None:
+        return 0, 0
+    process, _, tab = str(worker).partition(".")
+    try:
+        return int(process), int(tab or 0)
+    except ValueError:
+        return 0, 0
+
+
+def _read_spans(directory):
+    from report_stream import read_events
+
+    offsets = {}   # process -> offset_ns of its perf_counter_ns clock to epoch
+    scenarios = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".jsonl"):
+            continue
+        process = None
+        for event in read_events(os.path.join(directory, name)):
+            if event["type"] == "clock":
+                process = event["process"]
+                offsets[process] = event["offset_ns"]
+            elif event["type"] == "spans":
+                scenarios.append((process, event))
+    return offsets, scenarios
+
+
+def build_trace(events_path, directory=None):
+    """
+    Chrome trace-event document of a run
+
+    Args:
+        events_path: Report event file (.jsonl)
+        directory: Span directory of the workers (default: trace_dir(events_path)); may be missing
+
+    Returns:
+        dict: {"traceEvents": [...], "displayTimeUnit": "ms", "otherData": {...}}
+    """
+    from report_stream import read_events
+
+    directory = directory or trace_dir(events_path)
+    offsets, recorded = _read_spans(directory) if os.path.isdir(directory) else ({}, [])
+    main_offset = None  # Clock of the process that wrote the event file
+    events = []
+    workers = {}        # scenario key -> worker id
+    started = {}        # scenario key -> start epoch µs
+    step_end = {}       # scenario key -> end of its last step, in epoch µs
+    title = "ShenLong Test Run"
+
+    def epoch_us(worker, ns, fallback_at):
+        offset = offsets.get(str(worker).split(".")[0]) if worker is not None else main_offset
+        if offset is not None and ns is not None:
+            return (ns + offset) / 1000.0
+        return fallback_at * 1e6 if fallback_at is not None else None
+
+    def complete(name, category, worker, start_us, end_us, args):
+        pid, tid = _ids(worker)
+        events.append({"name": name, "cat": category, "ph": "X", "pid": pid, "tid": tid, "ts": start_us,
+                       "dur": max(end_us - start_us, 0.0), "args": args})
+
+    for event in read_events(events_path):
+        if event["type"] == "run":
+            title = event["title"]
+            main_offset = event.get("clock_offset_ns")
+        elif event["type"] == "scenario_start":
+            key = event["scenario"]
+            workers[key] = event.get("worker")
+            started[key] = epoch_us(workers[key], event.get("start_ns"), event.get("at"))
+        elif event["type"] == "scenario_end":
+            key = event["scenario"]
+            worker = event.get("worker", workers.get(key))
+            end_us = event["at"] * 1e6 if event.get("at") is not None else None
+            start_us = started.get(key)
+            if start_us is not None and event.get("duration") is not None:
+                end_us = start_us + event["duration"] * 1e6
+            if start_us is None:
+                start_us = end_us
+            if end_us is not None and key in step_end:
+                end_us = max(end_us, step_end[key])   # Durations are rounded to the millisecond
+            if start_us is not None:
+                complete(key, "scenario", worker, start_us, end_us,
+                         {"status": event["status"], "worker": worker, "reason": event.get("reason") or None})
+        elif event["type"] == "step":
+            key = event.get("scenario")
+            worker = event.get("worker")
+            if event.get("start_ns") is not None and event.get("end_ns") is not None:
+                start_us = epoch_us(worker, event["start_ns"], None)
+                end_us = epoch_us(worker, event["end_ns"], None)
+            else:
+                start_us = end_us = None
+            if start_us is None:
+                end_us = event["at"] * 1e6
+                start_us = end_us
+            step_end[key] = max(step_end.get(key, end_us), end_us)
+            complete(event["step_name"], "step", worker if worker is not None else workers.get(key), start_us, end_us,
+                     {"scenario": key, "worker": worker, "status": event["status"], "attempt": event.get("attempt"),
+                      "category": event.get("category"), "message": str(event["message"])[:MAX_ATTRIBUTE_LENGTH]})
+
+    for process, record in recorded:
+        offset = offsets[process]
+        for span in record["spans"]:
+            args = dict(span["args"], scenario=record["scenario"], worker=record["worker"])
+            complete(span["name"], span["cat"], record["worker"], (span["start_ns"] + offset) / 1000.0,
+                     (span["end_ns"] + offset) / 1000.0, args)
+
+    origin = min((event["ts"] for event in events), default=0.0)
+    for event in events:
+        event["ts"] = round(event["ts"] - origin, 3)
+        event["dur"] = round(event["dur"], 3)
+    # Longer spans first at equal start, so parents open before their children
+    events.sort(key=lambda event: (event["pid"], event["tid"], event["ts"], -event["dur"]))
+
+    names = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+              "args": {"name": f"worker {pid}" if pid else "main"}}
+             for pid in sorted({event["pid"] for event in events})]
+    for pid, tid in sorted({(event["pid"], event["tid"]) for event in events}):
+        names.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                      "args": {"name": f"tab {tid}" if tid else "browser"}})
+    return {"traceEvents": names + events, "displayTimeUnit": "ms",
+            "otherData": {"title": title, "events": os.path.basename(events_path), "origin_us": origin}}
+
+
+def write_trace(events_path, path=None, directory=None):
+    """
+    Write build_trace() as JSON (default: <report>.trace.json next to the event file)
+
+    Returns:
+        str: Path of the trace file
+    """
+    path = path or os.path.splitext(events_path)[0] + ".trace.json"
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(build_trace(events_path, directory), f, ensure_ascii=False)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export ShenLong test runs as Chrome trace-event files")
+    parser.add_argument("events", nargs="+", help="Report event files (.jsonl)")
+    args = parser.parse_args()
+    for events_path in args.events:
+        print(f"Trace: {write_trace(events_path)} (open in chrome://tracing or https://ui.perfetto.dev)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
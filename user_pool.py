@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+"""
+Admin Test User Pool
+后台测试用户池 - 每个 worker 独占一个测试用户
+
+Admin scenarios create VPN accounts and orders on a user and then act on the
+first row of that user's history table, so two browsers must never work on the
+same user at once. A lease is a lock file under reports/.user_leases created
+with O_EXCL, which makes it exclusive across processes and across concurrent
+runner invocations on the same machine.
+
+While a lease is held, leased_user_id() returns the leased user for the
+current process; test classes resolve their user detail URL from it.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+LEASE_DIR = os.path.join("reports", ".user_leases")
+
+# Leases older than this are assumed to belong to a crashed run (on POSIX a lease
+# whose process no longer exists is reclaimed at once)
+LEASE_TTL = 3 * 60 * 60
+
+# User currently leased by this process (None when no lease is held)
+_active_user_id = None
+
+
+def _lease_path(user_id):
+    return os.path.join(LEASE_DIR, f"user_{user_id}.lock")
+
+
+def _lease_is_stale(path):
+    """True if the lease is older than LEASE_TTL or its owning process has exited"""
+    if time.time() - os.path.getmtime(path) > LEASE_TTL:
+        return True
+    if os.name != "posix":
+        return False  # os.kill(pid, 0) would terminate the process on Windows
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            pid = int(f.read().split()[0].split("=")[1])
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True  # Owner was killed, e.g. a worker terminated after a timeout
+    except (OSError, ValueError, IndexError):
+        pass
+    return False
+
+
+def _try_acquire(user_id):
+    """Create the lease file for user_id, returning True if this process now owns it"""
+    path = _lease_path(user_id)
+    try:
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        try:
+            if _lease_is_stale(path):
+                print(f"Removing stale lease for user {user_id}")
+                os.remove(path)
+                return _try_acquire(user_id)
+        except OSError:
+            pass
+        return False
+    with os.fdopen(fd, 'w') as f:
+        f.write(f"pid={os.getpid()} leased_at={time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+    return True
+
+
+@contextmanager
+def lease_user(user_ids, timeout=600, poll_interval=2):
+    """
+    Lease one user from user_ids for the duration of the with-block
+
+    Args:
+        user_ids: Candidate admin test user IDs, tried in order
+        timeout: Seconds to wait for a free user before giving up
+        poll_interval: Seconds between attempts while all users are leased
+
+    Yields:
+        int: The leased user ID
+    """
+    global _active_user_id
+    if not os.path.exists(LEASE_DIR):
+        os.makedirs(LEASE_DIR, exist_ok=True)
+
+    deadline = time.time() + timeout
+    user_id = None
+    while user_id is None:
+        user_id = next((candidate for candidate in user_ids if _try_acquire(candidate)), None)
+        if user_id is None:
+            if time.time() > deadline:
+                raise TimeoutError(f"No free admin test user in pool {list(user_ids)} after {timeout}s")
+            time.sleep(poll_interval)
+
+    print(f"Leased admin test user {user_id} (pid {os.getpid()})")
+    previous_user_id, _active_user_id = _active_user_id, user_id
+    try:
+        yield user_id
+    finally:
+        _active_user_id = previous_user_id
+        try:
+            os.remove(_lease_path(user_id))
+        except OSError:
+            pass
+        print(f"Released admin test user {user_id}")
+
+
+def leased_user_id(default=None):
+    """Return the user leased by this process, or default when none is held"""
+    return _active_user_id if _active_user_id is not None else default